@@ -49,6 +49,7 @@ from .dbapi import (
 from .optionfiles import read_option_files
 
 _CONNECTION_POOLS = {}
+_CONNECTION_ROUTERS = {}
 
 def _get_pooled_connection(**kwargs):
     """Return a pooled MySQL connection"""
@@ -125,6 +126,32 @@ def _get_failover_connection(**kwargs):
     raise InterfaceError("Could not failover: no MySQL server available")
 
 
+def _get_routed_connection(**kwargs):
+    """Return a connection splitting reads and writes over MySQL servers
+
+    A router, holding a pool for the primary and each replica, is created
+    or a previously created one is used. Routers are identified by the
+    pool_name argument, or by a name generated from the connection
+    arguments.
+
+    Returns RoutedMySQLConnection instance.
+    """
+    from .pooling import generate_pool_name, CONNECTION_POOL_LOCK
+    from .routing import MySQLConnectionRouter
+
+    try:
+        router_name = kwargs['pool_name']
+    except KeyError:
+        router_name = generate_pool_name(**kwargs)
+
+    with CONNECTION_POOL_LOCK:
+        if router_name not in _CONNECTION_ROUTERS:
+            _CONNECTION_ROUTERS[router_name] = MySQLConnectionRouter(
+                **kwargs)
+
+    return _CONNECTION_ROUTERS[router_name].get_connection()
+
+
 def connect(*args, **kwargs):
     """Create or get a MySQL connection object
 
@@ -135,7 +162,13 @@ def connect(*args, **kwargs):
     or pool_size, a pool is created or a previously one is used to return
     a PooledMySQLConnection.
 
-    Returns MySQLConnection or PooledMySQLConnection.
+    When the replicas argument is given, a RoutedMySQLConnection is
+    returned which sends writes to the MySQL server configured by the
+    other arguments and reads to the replicas. See
+    mysql.connector.routing.MySQLConnectionRouter.
+
+    Returns MySQLConnection, PooledMySQLConnection or
+    RoutedMySQLConnection.
     """
     # Option files
     if 'option_files' in kwargs:
@@ -144,6 +177,9 @@ def connect(*args, **kwargs):
 
     if all(['fabric' in kwargs, 'failover' in kwargs]):
         raise InterfaceError("fabric and failover arguments can not be used")
+    if 'replicas' in kwargs and ('fabric' in kwargs or 'failover' in kwargs):
+        raise InterfaceError("replicas argument can not be used with fabric "
+                             "or failover arguments")
 
     if 'fabric' in kwargs:
         if 'pool_name' in kwargs:
@@ -156,6 +192,10 @@ def connect(*args, **kwargs):
     if 'failover' in kwargs:
         return _get_failover_connection(**kwargs)
 
+    # Read/write splitting
+    if 'replicas' in kwargs:
+        return _get_routed_connection(**kwargs)
+
     # Pooled connections
     try:
         from .constants import CNX_POOL_ARGS
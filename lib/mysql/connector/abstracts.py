@@ -24,10 +24,11 @@
 """Module gathering all abstract base classes"""
 
 from abc import ABCMeta, abstractmethod, abstractproperty
+import os
 import re
 import time
 
-from .catch23 import make_abc, BYTE_TYPES
+from .catch23 import make_abc, BYTE_TYPES, isstr
 from .conversion import MySQLConverterBase
 from .constants import ClientFlag, CharacterSet, DEFAULT_CONFIGURATION
 from .optionfiles import MySQLOptionsParser
@@ -77,6 +78,18 @@ class MySQLConnectionAbstract(object):
         self.converter = None
         self._converter_class = None
         self._compress = False
+        self._compress_level = None
+        self._allow_local_infile_in_path = None
+        self._compress_min_size = None
+        self._compression_algorithms = None
+        self._compression_algorithm = None
+        self._zstd_compression_level = None
+        self._recv_buffer_size = None
+        self._prepared_cache_size = 0
+        self._max_batch_size = 0
+        self._max_allowed_packet = None
+        # Cached values of session variables; None when not cached
+        self._session_cache = None
 
         self._consume_results = False
 
@@ -217,12 +230,85 @@ class MySQLConnectionAbstract(object):
         except KeyError:
             pass  # Missing compress argument is OK
 
+        # Compression algorithms, in order of preference
+        try:
+            algorithms = config['compression_algorithms']
+            del config['compression_algorithms']
+        except KeyError:
+            pass  # Missing compression_algorithms argument is OK
+        else:
+            if isstr(algorithms):
+                algorithms = algorithms.split(',')
+            algorithms = [name.strip().lower() for name in algorithms or ()]
+            for name in algorithms:
+                if name not in ('zlib', 'zstd', 'uncompressed'):
+                    raise errors.InterfaceError(
+                        "Unknown compression algorithm '{0}'".format(name))
+            self._compression_algorithms = algorithms or None
+            if algorithms and algorithms[0] != 'uncompressed':
+                self._compress = True
+                self.set_client_flags([ClientFlag.COMPRESS])
+
+        try:
+            if config['zstd_compression_level'] is not None:
+                self._zstd_compression_level = int(
+                    config['zstd_compression_level'])
+                if not 1 <= self._zstd_compression_level <= 22:
+                    raise ValueError
+            del config['zstd_compression_level']
+        except KeyError:
+            pass  # Missing zstd_compression_level argument is OK
+        except (TypeError, ValueError):
+            raise errors.InterfaceError(
+                "zstd compression level should be an integer between 1 and 22")
+
+        # Tuning of the compressed protocol
+        try:
+            if config['compress_level'] is not None:
+                self._compress_level = int(config['compress_level'])
+                if not -1 <= self._compress_level <= 9:
+                    raise ValueError
+            del config['compress_level']
+        except KeyError:
+            pass  # Missing compress_level argument is OK
+        except (TypeError, ValueError):
+            raise errors.InterfaceError(
+                "Compression level should be an integer between -1 and 9")
+
+        try:
+            if config['compress_min_size'] is not None:
+                self._compress_min_size = int(config['compress_min_size'])
+                if self._compress_min_size < 0:
+                    raise ValueError
+            del config['compress_min_size']
+        except KeyError:
+            pass  # Missing compress_min_size argument is OK
+        except (TypeError, ValueError):
+            raise errors.InterfaceError(
+                "Compression minimum size should be 0 or larger")
+
         try:
             if not config['allow_local_infile']:
                 self.set_client_flags([-ClientFlag.LOCAL_FILES])
         except KeyError:
             pass  # Missing allow_local_infile argument is OK
 
+        # Directories from which LOAD DATA LOCAL INFILE may read files
+        try:
+            paths = config['allow_local_infile_in_path']
+            del config['allow_local_infile_in_path']
+        except KeyError:
+            pass  # Missing allow_local_infile_in_path argument is OK
+        else:
+            if isstr(paths):
+                paths = [paths]
+            if paths:
+                self._allow_local_infile_in_path = [
+                    os.path.realpath(path) for path in paths]
+                self.set_client_flags([ClientFlag.LOCAL_FILES])
+            else:
+                self._allow_local_infile_in_path = None
+
         try:
             if not config['consume_results']:
                 self._consume_results = False
@@ -301,6 +387,42 @@ class MySQLConnectionAbstract(object):
             raise errors.InterfaceError(
                 "TCP/IP port number should be an integer")
 
+        # Read-ahead buffer used when receiving packets
+        try:
+            self._recv_buffer_size = int(config['recv_buffer_size'] or 0)
+            del config['recv_buffer_size']
+        except KeyError:
+            pass  # Missing recv_buffer_size argument is OK
+        except (TypeError, ValueError):
+            raise errors.InterfaceError(
+                "Receive buffer size should be an integer")
+
+        # Number of prepared statements cached by the connection
+        try:
+            self._prepared_cache_size = int(config['prepared_cache_size'] or 0)
+            del config['prepared_cache_size']
+        except KeyError:
+            pass  # Missing prepared_cache_size argument is OK
+        except (TypeError, ValueError):
+            raise errors.InterfaceError(
+                "Prepared statement cache size should be an integer")
+        if self._prepared_cache_size < 0:
+            raise errors.InterfaceError(
+                "Prepared statement cache size should be 0 or larger")
+
+        # Maximum size of statements sent by executemany() batching
+        try:
+            self._max_batch_size = int(config['max_batch_size'] or 0)
+            del config['max_batch_size']
+        except KeyError:
+            pass  # Missing max_batch_size argument is OK
+        except (TypeError, ValueError):
+            raise errors.InterfaceError(
+                "Maximum batch size should be an integer")
+        if self._max_batch_size < 0:
+            raise errors.InterfaceError(
+                "Maximum batch size should be 0 or larger")
+
         # Other configuration
         set_ssl_flag = False
         for key, value in config.items():
@@ -442,18 +564,19 @@ class MySQLConnectionAbstract(object):
     @property
     def time_zone(self):
         """Get the current time zone"""
-        return self.info_query("SELECT @@session.time_zone")[0]
+        return self._info_cached('time_zone', "SELECT @@session.time_zone")
 
     @time_zone.setter
     def time_zone(self, value):
         """Set the time zone"""
         self.cmd_query("SET @@session.time_zone = '{0}'".format(value))
         self._time_zone = value
+        self._cache_session_value('time_zone', value)
 
     @property
     def sql_mode(self):
         """Get the SQL mode"""
-        return self.info_query("SELECT @@session.sql_mode")[0]
+        return self._info_cached('sql_mode', "SELECT @@session.sql_mode")
 
     @sql_mode.setter
     def sql_mode(self, value):
@@ -472,11 +595,81 @@ class MySQLConnectionAbstract(object):
         self.cmd_query("SET @@session.sql_mode = '{0}'".format(value))
         self._sql_mode = value
 
+    def _info_cached(self, name, query):
+        """Get the value of a session variable
+
+        Connections caching session variables, which have _session_cache
+        set to a dictionary, only query the MySQL server when the value is
+        not cached yet.
+        """
+        if self._session_cache is not None and name in self._session_cache:
+            return self._session_cache[name]
+        value = self.info_query(query)[0]
+        self._cache_session_value(name, value)
+        return value
+
+    def _cache_session_value(self, name, value):
+        """Cache the value of a session variable
+
+        Nothing is cached by connections not caching session variables.
+        """
+        if self._session_cache is not None:
+            self._session_cache[name] = value
+
+    def _handle_session_state(self, state):
+        """Handle the session state changes found in MySQL OK packets
+
+        Changes of the current database, time zone, SQL mode and
+        autocommit tracked by the MySQL server update the values kept by
+        the connection, and the cached values of the session.
+        """
+        if 'schema' in state:
+            self._cache_session_value('database', state['schema'])
+            if state['schema'] is not None:
+                self._database = state['schema']
+        variables = state.get('system_variables', {})
+        if 'time_zone' in variables:
+            self._time_zone = variables['time_zone']
+            self._cache_session_value('time_zone', variables['time_zone'])
+        if 'sql_mode' in variables:
+            self._sql_mode = variables['sql_mode']
+            self._cache_session_value('sql_mode', variables['sql_mode'])
+        if 'autocommit' in variables:
+            self._autocommit = variables['autocommit'] == 'ON'
+            self._cache_session_value('autocommit', int(self._autocommit))
+
     @abstractmethod
     def info_query(self, query):
         """Send a query which only returns 1 row"""
         pass
 
+    @property
+    def max_allowed_packet(self):
+        """Get the max_allowed_packet of the current session
+
+        The value is queried once after the connection was established
+        and cached until the connection is opened again.
+
+        Returns an integer.
+        """
+        if self._max_allowed_packet is None:
+            self._max_allowed_packet = int(
+                self.info_query("SELECT @@session.max_allowed_packet")[0])
+        return self._max_allowed_packet
+
+    @property
+    def max_batch_size(self):
+        """Get the maximum size of statements built by executemany()
+
+        When the max_batch_size option was not set, the limit follows the
+        server's max_allowed_packet, leaving room for the command byte.
+
+        Returns an integer.
+        """
+        if self._max_batch_size:
+            return self._max_batch_size
+        return self.max_allowed_packet - 1
+
     def set_login(self, username=None, password=None):
         """Set login information for MySQL
 
@@ -505,7 +698,7 @@ class MySQLConnectionAbstract(object):
     @property
     def autocommit(self):
         """Get whether autocommit is on or off"""
-        value = self.info_query("SELECT @@session.autocommit")[0]
+        value = self._info_cached('autocommit', "SELECT @@session.autocommit")
         return True if value == 1 else False
 
     @autocommit.setter
@@ -514,6 +707,7 @@ class MySQLConnectionAbstract(object):
         switch = 'ON' if value else 'OFF'
         self.cmd_query("SET @@session.autocommit = {0}".format(switch))
         self._autocommit = value
+        self._cache_session_value('autocommit', 1 if value else 0)
 
     @property
     def get_warnings(self):
@@ -638,6 +832,31 @@ class MySQLConnectionAbstract(object):
 
            set_charset('latin1','latin1_general_ci')
 
+        """
+        (charset_name, collation_name) = self._lookup_charset_collation(
+            charset, collation)
+
+        self._execute_query("SET NAMES '{0}' COLLATE '{1}'".format(
+            charset_name, collation_name))
+
+        try:
+            # Required for C Extension
+            self.set_character_set_name(charset_name)  # pylint: disable=E1101
+        except AttributeError:
+            # Not required for pure Python connection
+            pass
+
+        if self.converter:
+            self.converter.set_charset(charset_name)
+
+    def _lookup_charset_collation(self, charset=None, collation=None):
+        """Look up the character set and collation to use
+
+        This method sets the character set ID of the connection and returns
+        a tuple with the names of the character set and the collation.
+        See set_charset_collation() for the arguments.
+
+        Returns a tuple.
         """
         if charset:
             if isinstance(charset, int):
@@ -653,18 +872,7 @@ class MySQLConnectionAbstract(object):
             (self._charset_id, charset_name, collation_name) = \
                     CharacterSet.get_charset_info(collation=collation)
 
-        self._execute_query("SET NAMES '{0}' COLLATE '{1}'".format(
-            charset_name, collation_name))
-
-        try:
-            # Required for C Extension
-            self.set_character_set_name(charset_name)  # pylint: disable=E1101
-        except AttributeError:
-            # Not required for pure Python connection
-            pass
-
-        if self.converter:
-            self.converter.set_charset(charset_name)
+        return (charset_name, collation_name)
 
     @property
     def collation(self):
@@ -695,6 +903,7 @@ class MySQLConnectionAbstract(object):
         established. Some setting like autocommit, character set, and SQL mode
         are set using this method.
         """
+        self._max_allowed_packet = None
         self.set_charset_collation(self._charset_id)
         self.autocommit = self._autocommit
         if self._time_zone:
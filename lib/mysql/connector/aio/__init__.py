@@ -0,0 +1,94 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2016, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""MySQL Connector/Python using asyncio
+
+This package requires Python 3.6 or later. The connection reuses the
+packet handling of mysql.connector.protocol and the authentication
+plugins, reading and writing through asyncio streams.
+
+Example:
+  cnx = await mysql.connector.aio.connect(user='scott', database='test')
+  cur = cnx.cursor()
+  await cur.execute("SELECT 1")
+  print(await cur.fetchall())
+  await cnx.close()
+"""
+
+from ..constants import CNX_POOL_ARGS
+from ..errors import PoolError
+from ..optionfiles import read_option_files
+from ..pooling import generate_pool_name
+from .connection import MySQLConnection
+from .cursor import (
+    MySQLCursor, MySQLCursorBuffered, MySQLCursorRaw, MySQLCursorBufferedRaw,
+    MySQLCursorDict, MySQLCursorBufferedDict)
+from .pooling import MySQLConnectionPool, PooledMySQLConnection
+
+_CONNECTION_POOLS = {}
+
+
+async def _get_pooled_connection(**kwargs):
+    """Return a pooled MySQL connection"""
+    try:
+        pool_name = kwargs['pool_name']
+    except KeyError:
+        pool_name = generate_pool_name(**kwargs)
+
+    if pool_name not in _CONNECTION_POOLS:
+        _CONNECTION_POOLS[pool_name] = MySQLConnectionPool(**kwargs)
+    elif ('pool_size' in kwargs and
+          kwargs['pool_size'] != _CONNECTION_POOLS[pool_name].pool_size):
+        raise PoolError("Size can not be changed for active pools.")
+
+    return await _CONNECTION_POOLS[pool_name].get_connection()
+
+
+async def connect(*args, **kwargs):
+    """Open a MySQL connection using asyncio
+
+    When any connection pooling arguments are given, for example pool_name
+    or pool_size, a pool is created or a previously one is used to return
+    a PooledMySQLConnection.
+
+    Returns MySQLConnection or PooledMySQLConnection.
+    """
+    if 'option_files' in kwargs:
+        new_config = read_option_files(**kwargs)
+        return await connect(**new_config)
+
+    if any([key in kwargs for key in CNX_POOL_ARGS]):
+        return await _get_pooled_connection(**kwargs)
+
+    kwargs.pop('use_pure', None)
+    cnx = MySQLConnection(*args, **kwargs)
+    await cnx.connect()
+    return cnx
+
+
+__all__ = [
+    'connect', 'MySQLConnection', 'MySQLConnectionPool',
+    'PooledMySQLConnection', 'MySQLCursor', 'MySQLCursorBuffered',
+    'MySQLCursorRaw', 'MySQLCursorBufferedRaw', 'MySQLCursorDict',
+    'MySQLCursorBufferedDict',
+]
@@ -0,0 +1,828 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2016, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Implementing communication with MySQL servers using asyncio.
+"""
+
+import asyncio
+from collections import deque
+import os
+
+from .. import errors
+from ..abstracts import MySQLConnectionAbstract
+from ..authentication import get_auth_plugin
+from ..constants import ClientFlag, ServerCmd, ServerFlag, flag_is_set
+from ..conversion import MySQLConverter
+from ..protocol import MySQLProtocol
+from ..utils import int4store
+from .cursor import (
+    MySQLCursor, MySQLCursorBuffered, MySQLCursorRaw, MySQLCursorBufferedRaw,
+    MySQLCursorDict, MySQLCursorBufferedDict)
+from .network import MySQLSocket
+
+
+class _PacketQueue(object):
+    """Packets already read, handed to MySQLProtocol like a socket"""
+
+    def __init__(self, packets):
+        self._packets = deque(packets)
+
+    def recv(self):
+        """Return the next packet"""
+        return self._packets.popleft()
+
+
+def _session_property(name):
+    """Property which needs a query and is not available synchronously
+
+    The value is read and changed using the get_<name>() and set_<name>()
+    coroutines of the connection.
+    """
+    def fail(self, value=None):
+        """Raise, pointing to the coroutines"""
+        raise errors.NotSupportedError(
+            "Use 'await cnx.get_{0}()' or 'await cnx.set_{0}(value)' "
+            "with mysql.connector.aio".format(name))
+    return property(fail, fail)
+
+
+class MySQLConnection(MySQLConnectionAbstract):
+    """Connection to a MySQL Server using asyncio
+
+    The connection is configured like mysql.connector.MySQLConnection, but
+    is opened by awaiting connect(). Commands are coroutines, so many
+    connections can be used concurrently by one thread.
+
+    Example:
+      cnx = MySQLConnection(user='scott', database='test')
+      await cnx.connect()
+      cur = cnx.cursor()
+      await cur.execute("SELECT 1")
+      rows = await cur.fetchall()
+      await cnx.close()
+    """
+    def __init__(self, *args, **kwargs):
+        self._protocol = None
+        self._socket = None
+        self._handshake = None
+        super(MySQLConnection, self).__init__(*args, **kwargs)
+
+        self._converter_class = MySQLConverter
+        self._client_flags = ClientFlag.get_default()
+
+        if len(kwargs) > 0:
+            self.config(**kwargs)
+
+    autocommit = _session_property('autocommit')
+    database = _session_property('database')
+    time_zone = _session_property('time_zone')
+    sql_mode = _session_property('sql_mode')
+
+    @property
+    def max_allowed_packet(self):
+        """Get the max_allowed_packet of the current session
+
+        The value is available after get_max_allowed_packet() was awaited.
+
+        Returns an integer.
+        """
+        if self._max_allowed_packet is None:
+            raise errors.InterfaceError(
+                "Use 'await cnx.get_max_allowed_packet()' first")
+        return self._max_allowed_packet
+
+    async def _do_handshake(self):
+        """Get the handshake from the MySQL server"""
+        packet = await self._socket.recv()
+        if packet[4] == 255:
+            raise errors.get_exception(packet)
+
+        self._handshake = None
+        try:
+            handshake = self._protocol.parse_handshake(packet)
+        except Exception as err:
+            raise errors.InterfaceError(
+                'Failed parsing handshake; {0}'.format(err))
+
+        self._server_version = self._check_server_version(
+            handshake['server_version_original'])
+
+        if handshake['capabilities'] & ClientFlag.PLUGIN_AUTH:
+            self.set_client_flags([ClientFlag.PLUGIN_AUTH])
+
+        self._handshake = handshake
+
+    async def _do_auth(self, username=None, password=None, database=None,
+                       client_flags=0, charset=33, ssl_options=None):
+        """Authenticate with the MySQL server
+
+        Raises NotSupportedError when we get the old, insecure password
+        reply back. Raises any error coming from MySQL.
+        """
+        self._ssl_active = False
+        if client_flags & ClientFlag.SSL and ssl_options:
+            packet = self._protocol.make_auth_ssl(charset=charset,
+                                                  client_flags=client_flags)
+            await self._socket.send(packet)
+            await self._socket.switch_to_ssl(**ssl_options)
+            self._ssl_active = True
+
+        packet = self._protocol.make_auth(
+            handshake=self._handshake,
+            username=username, password=password, database=database,
+            charset=charset, client_flags=client_flags,
+            ssl_enabled=self._ssl_active,
+            auth_plugin=self._auth_plugin)
+        await self._socket.send(packet)
+        await self._auth_switch_request(username, password)
+
+        if not (client_flags & ClientFlag.CONNECT_WITH_DB) and database:
+            await self.cmd_init_db(database)
+
+        return True
+
+    async def _auth_switch_request(self, username=None, password=None):
+        """Handle second part of authentication
+
+        Raises NotSupportedError when we get the old, insecure password
+        reply back. Raises any error coming from MySQL.
+        """
+        packet = await self._socket.recv()
+        if packet[4] == 254 and len(packet) == 5:
+            raise errors.NotSupportedError(
+                "Authentication with old (insecure) passwords "
+                "is not supported. For more information, lookup "
+                "Password Hashing in the latest MySQL manual")
+        elif packet[4] == 254:
+            # AuthSwitchRequest
+            (new_auth_plugin,
+             auth_data) = self._protocol.parse_auth_switch_request(packet)
+            auth = get_auth_plugin(new_auth_plugin)(
+                auth_data, password=password, ssl_enabled=self._ssl_active)
+            await self._socket.send(auth.auth_response())
+            packet = await self._socket.recv()
+            if packet[4] != 1:
+                return self._handle_ok(packet)
+        elif packet[4] == 255:
+            raise errors.get_exception(packet)
+
+    def _get_connection(self):
+        """Get the socket based on configuration
+
+        Returns a MySQLSocket instance.
+        """
+        if self.unix_socket and os.name != 'nt':
+            conn = MySQLSocket(unix_socket=self.unix_socket)
+        else:
+            conn = MySQLSocket(host=self.server_host, port=self.server_port,
+                               force_ipv6=self._force_ipv6)
+        conn.set_connection_timeout(self._connection_timeout)
+        return conn
+
+    async def _open_connection(self):
+        """Open the connection to the MySQL server
+
+        Raises on errors.
+        """
+        if self._compress:
+            raise errors.NotSupportedError(
+                "Compression is not supported by mysql.connector.aio")
+        self._protocol = MySQLProtocol()
+        self._socket = self._get_connection()
+        await self._socket.open_connection()
+        try:
+            await self._do_handshake()
+            await self._do_auth(self._user, self._password,
+                                self._database, self._client_flags,
+                                self._charset_id, self._ssl)
+        except:
+            self._socket.shutdown()
+            self._socket = None
+            raise
+        self.set_converter_class(self._converter_class)
+
+    async def _post_connection(self):
+        """Executes commands after connection has been established"""
+        self._max_allowed_packet = None
+        await self.set_charset_collation(self._charset_id)
+        await self.set_autocommit(self._autocommit)
+        if self._time_zone:
+            await self.set_time_zone(self._time_zone)
+        if self._sql_mode:
+            await self.set_sql_mode(self._sql_mode)
+
+    async def connect(self, **kwargs):
+        """Connect to the MySQL server
+
+        If no arguments are given, the already configured or default
+        values are used.
+        """
+        if len(kwargs) > 0:
+            self.config(**kwargs)
+
+        await self.disconnect()
+        await self._open_connection()
+        await self._post_connection()
+
+    def shutdown(self):
+        """Shut down connection to MySQL Server"""
+        if not self._socket:
+            return
+        self._socket.shutdown()
+        self._socket = None
+
+    async def close(self):
+        """Disconnect from the MySQL server"""
+        if not self._socket:
+            return
+
+        try:
+            await self.cmd_quit()
+            await self._socket.close_connection()
+        except (AttributeError, errors.Error):
+            pass  # Getting an exception would mean we are disconnected.
+        self._socket = None
+    disconnect = close
+
+    async def _send_cmd(self, command, argument=None, packet_number=0,
+                        packet=None, expect_response=True):
+        """Send a command to the MySQL server
+
+        Returns a MySQL packet or None.
+        """
+        await self.handle_unread_result()
+
+        if self._socket is None:
+            raise errors.OperationalError("MySQL Connection not available.")
+        await self._socket.send(
+            self._protocol.make_command(command, packet or argument),
+            packet_number)
+
+        if not expect_response:
+            return None
+        return await self._socket.recv()
+
+    def _handle_server_status(self, flags):
+        """Handle the server flags found in MySQL packets"""
+        self._have_next_result = flag_is_set(ServerFlag.MORE_RESULTS_EXISTS,
+                                             flags)
+        self._in_transaction = flag_is_set(ServerFlag.STATUS_IN_TRANS, flags)
+
+    @property
+    def in_transaction(self):
+        """MySQL session has started a transaction"""
+        return self._in_transaction
+
+    def _handle_ok(self, packet):
+        """Handle a MySQL OK packet
+
+        Returns a dict()
+        """
+        if packet[4] == 0:
+            ok_pkt = self._protocol.parse_ok(packet)
+            self._handle_server_status(ok_pkt['status_flag'])
+            if 'session_state' in ok_pkt:
+                self._handle_session_state(ok_pkt['session_state'])
+            return ok_pkt
+        elif packet[4] == 255:
+            raise errors.get_exception(packet)
+        raise errors.InterfaceError('Expected OK packet')
+
+    def _handle_eof(self, packet):
+        """Handle a MySQL EOF packet
+
+        Returns a dict()
+        """
+        if packet[4] == 254:
+            eof = self._protocol.parse_eof(packet)
+            self._handle_server_status(eof['status_flag'])
+            return eof
+        elif packet[4] == 255:
+            raise errors.get_exception(packet)
+        raise errors.InterfaceError('Expected EOF packet')
+
+    async def _handle_result(self, packet):
+        """Handle a MySQL Result
+
+        OK and EOF packets are handled and returned. For a result set, a
+        dictionary with the columns and the EOF packet is returned.
+
+        Returns a dict()
+        """
+        if not packet or len(packet) < 4:
+            raise errors.InterfaceError('Empty response')
+        elif packet[4] == 0:
+            return self._handle_ok(packet)
+        elif packet[4] == 251:
+            # Refuse LOAD DATA LOCAL INFILE
+            await self._socket.send(b'')
+            self._handle_ok(await self._socket.recv())
+            raise errors.NotSupportedError(
+                "LOAD DATA LOCAL INFILE is not supported by "
+                "mysql.connector.aio")
+        elif packet[4] == 254:
+            return self._handle_eof(packet)
+        elif packet[4] == 255:
+            raise errors.get_exception(packet)
+
+        # We have a text result set
+        column_count = self._protocol.parse_column_count(packet)
+        if not column_count or not isinstance(column_count, int):
+            raise errors.InterfaceError('Illegal result set.')
+
+        columns = [None,] * column_count
+        for i in range(0, column_count):
+            columns[i] = self._protocol.parse_column(
+                await self._socket.recv(), self.python_charset)
+
+        eof = self._handle_eof(await self._socket.recv())
+        self.unread_result = True
+        return {'columns': columns, 'eof': eof}
+
+    async def _recv_rows(self, count=None, binary=False):
+        """Read the packets of at most count rows
+
+        Reading stops after the packet ending the result set. Rows
+        spanning several packets are read completely.
+
+        Returns a _PacketQueue.
+        """
+        packets = []
+        rows = 0
+        split = False
+        while rows != count:
+            packet = await self._socket.recv()
+            packets.append(packet)
+            if packet.startswith(b'\xff\xff\xff'):
+                split = True
+                continue
+            rows += 1
+            if not split and (packet[4] == 255 or (
+                    packet[4] == 254 and (binary or packet[0] < 7))):
+                break
+            split = False
+        return _PacketQueue(packets)
+
+    async def get_row(self, binary=False, columns=None):
+        """Get the next row returned by the MySQL server
+
+        Returns a tuple.
+        """
+        (rows, eof) = await self.get_rows(count=1, binary=binary,
+                                          columns=columns)
+        if len(rows):
+            return (rows[0], eof)
+        return (None, eof)
+
+    async def get_rows(self, count=None, binary=False, columns=None):
+        """Get all rows returned by the MySQL server
+
+        The packets are read asynchronously and parsed by MySQLProtocol.
+
+        Returns a tuple()
+        """
+        if not self.unread_result:
+            raise errors.InternalError("No result set available.")
+
+        try:
+            packets = await self._recv_rows(count, binary)
+            if binary:
+                rows = self._protocol.read_binary_result(
+                    packets, columns, count)
+            else:
+                rows = self._protocol.read_text_result(
+                    packets, self._server_version, count=count)
+        except errors.Error as err:
+            self.unread_result = False
+            raise err
+
+        if rows[-1] is not None:
+            row = rows[-1]  # OK or EOF
+            self._handle_server_status(row['status_flag'] if 'status_flag' in
+                                       row else row['server_status'])
+            self.unread_result = False
+
+        return rows
+
+    async def consume_results(self):
+        """Consume results"""
+        if self.unread_result:
+            await self.get_rows()
+
+    async def handle_unread_result(self):
+        """Check whether there is an unread result"""
+        if self.can_consume_results:
+            await self.consume_results()
+        elif self.unread_result:
+            raise errors.InternalError("Unread result found")
+
+    async def cmd_init_db(self, database):
+        """Change the current database
+
+        Returns a dict()
+        """
+        return self._handle_ok(await self._send_cmd(
+            ServerCmd.INIT_DB, database.encode('utf-8')))
+
+    async def cmd_query(self, query, raw=False, buffered=False,
+                        raw_as_string=False):
+        """Send a query to the MySQL server
+
+        Returns a dict()
+        """
+        if not isinstance(query, bytes):
+            query = query.encode('utf-8')
+        result = await self._handle_result(
+            await self._send_cmd(ServerCmd.QUERY, query))
+
+        if self._have_next_result:
+            raise errors.InterfaceError(
+                'Use cmd_query_iter for statements with multiple queries.')
+
+        return result
+
+    async def cmd_query_iter(self, statements):
+        """Send one or more statements to the MySQL server
+
+        Returns an asynchronous generator yielding the result of each
+        statement.
+        """
+        if not isinstance(statements, (bytes, bytearray)):
+            statements = statements.encode('utf-8')
+
+        yield await self._handle_result(
+            await self._send_cmd(ServerCmd.QUERY, statements))
+
+        while self._have_next_result:
+            await self.handle_unread_result()
+            yield await self._handle_result(await self._socket.recv())
+
+    async def cmd_refresh(self, options):
+        """Send the Refresh command to the MySQL server
+
+        Returns a dict()
+        """
+        return self._handle_ok(
+            await self._send_cmd(ServerCmd.REFRESH, int4store(options)))
+
+    async def cmd_quit(self):
+        """Close the current connection with the server
+
+        Returns a str()
+        """
+        await self.handle_unread_result()
+
+        packet = self._protocol.make_command(ServerCmd.QUIT)
+        await self._socket.send(packet, 0)
+        return packet
+
+    async def cmd_statistics(self):
+        """Send the statistics command to the MySQL Server
+
+        Returns a dict()
+        """
+        await self.handle_unread_result()
+
+        packet = self._protocol.make_command(ServerCmd.STATISTICS)
+        await self._socket.send(packet, 0)
+        return self._protocol.parse_statistics(await self._socket.recv())
+
+    async def cmd_process_kill(self, mysql_pid):
+        """Kill a MySQL process
+
+        Returns a dict()
+        """
+        return self._handle_ok(await self._send_cmd(
+            ServerCmd.PROCESS_KILL, int4store(mysql_pid)))
+
+    async def cmd_ping(self):
+        """Send the PING command
+
+        Returns a dict()
+        """
+        return self._handle_ok(await self._send_cmd(ServerCmd.PING))
+
+    async def cmd_change_user(self, username='', password='', database='',
+                              charset=33):
+        """Change the current logged in user
+
+        Returns a dict()
+        """
+        await self.handle_unread_result()
+
+        packet = self._protocol.make_change_user(
+            handshake=self._handshake,
+            username=username, password=password, database=database,
+            charset=charset, client_flags=self._client_flags,
+            ssl_enabled=self._ssl_active,
+            auth_plugin=self._auth_plugin)
+        await self._socket.send(packet, 0)
+
+        ok_packet = await self._auth_switch_request(username, password)
+
+        if not (self._client_flags & ClientFlag.CONNECT_WITH_DB) \
+                and database:
+            await self.cmd_init_db(database)
+
+        self._charset_id = charset
+        await self._post_connection()
+
+        return ok_packet
+
+    async def cmd_reset_connection(self):
+        """Resets the session state without re-authenticating
+
+        Works only for MySQL server 5.7.3 or later.
+
+        Returns a dict()
+        """
+        if self._server_version < (5, 7, 3):
+            raise errors.NotSupportedError("MySQL version 5.7.2 and "
+                                           "earlier does not support "
+                                           "COM_RESET_CONNECTION.")
+        self._handle_ok(await self._send_cmd(ServerCmd.RESET_CONNECTION))
+        await self._post_connection()
+
+    async def is_connected(self):
+        """Reports whether the connection to MySQL Server is available
+
+        Returns True or False.
+        """
+        try:
+            await self.cmd_ping()
+        except:
+            return False  # This method does not raise
+        return True
+
+    async def ping(self, reconnect=False, attempts=1, delay=0):
+        """Check availability of the MySQL server
+
+        Raises InterfaceError on errors.
+        """
+        try:
+            await self.cmd_ping()
+        except:
+            if reconnect:
+                await self.reconnect(attempts=attempts, delay=delay)
+            else:
+                raise errors.InterfaceError("Connection to MySQL is"
+                                            " not available.")
+
+    async def reconnect(self, attempts=1, delay=0):
+        """Attempt to reconnect to the MySQL server
+
+        Raises InterfaceError on errors.
+        """
+        counter = 0
+        while counter != attempts:
+            counter = counter + 1
+            try:
+                await self.disconnect()
+                await self.connect()
+                if await self.is_connected():
+                    break
+            except Exception as err:  # pylint: disable=W0703
+                if counter == attempts:
+                    msg = "Can not reconnect to MySQL after {0} "\
+                          "attempt(s): {1}".format(attempts, str(err))
+                    raise errors.InterfaceError(msg)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def reset_session(self, user_variables=None,
+                            session_variables=None):
+        """Clears the current active session
+
+        The session is reset using COM_RESET_CONNECTION or, for MySQL
+        servers before 5.7.3, by re-authenticating. The user_variables and
+        session_variables dictionaries are set afterwards.
+
+        Raises OperationalError if not connected.
+        """
+        if not await self.is_connected():
+            raise errors.OperationalError("MySQL Connection not available.")
+
+        try:
+            await self.cmd_reset_connection()
+        except errors.NotSupportedError:
+            await self.cmd_change_user(self._user, self._password,
+                                       self._database, self._charset_id)
+
+        if user_variables or session_variables:
+            cur = self.cursor()
+            if user_variables:
+                for key, value in user_variables.items():
+                    await cur.execute("SET @`{0}` = %s".format(key), (value,))
+            if session_variables:
+                for key, value in session_variables.items():
+                    await cur.execute("SET SESSION `{0}` = %s".format(key),
+                                      (value,))
+            await cur.close()
+
+    @property
+    def connection_id(self):
+        """MySQL connection ID"""
+        try:
+            return self._handshake['server_threadid']
+        except (KeyError, TypeError):
+            return None
+
+    def cursor(self, buffered=None, raw=None, prepared=None, cursor_class=None,
+               dictionary=None, named_tuple=None):
+        """Instantiates and returns a cursor
+
+        By default, aio.MySQLCursor is returned. Buffered, raw and
+        dictionary cursors are available; prepared and named tuple cursors
+        are not.
+
+        Raises ProgrammingError when cursor_class is not a subclass of
+        aio.MySQLCursor. Raises ValueError when cursor is not available.
+
+        Returns a cursor-object
+        """
+        if self._socket is None:
+            raise errors.OperationalError("MySQL Connection not available.")
+        if cursor_class is not None:
+            if not issubclass(cursor_class, MySQLCursor):
+                raise errors.ProgrammingError(
+                    "Cursor class needs be to subclass of aio.MySQLCursor")
+            return (cursor_class)(self)
+
+        buffered = buffered if buffered is not None else self._buffered
+        raw = raw if raw is not None else self._raw
+
+        cursor_type = 0
+        if buffered is True:
+            cursor_type |= 1
+        if raw is True:
+            cursor_type |= 2
+        if dictionary is True:
+            cursor_type |= 4
+        if named_tuple is True:
+            cursor_type |= 8
+        if prepared is True:
+            cursor_type |= 16
+
+        types = {
+            0: MySQLCursor,
+            1: MySQLCursorBuffered,
+            2: MySQLCursorRaw,
+            3: MySQLCursorBufferedRaw,
+            4: MySQLCursorDict,
+            5: MySQLCursorBufferedDict,
+        }
+        try:
+            return (types[cursor_type])(self)
+        except KeyError:
+            args = ('buffered', 'raw', 'dictionary', 'named_tuple', 'prepared')
+            raise ValueError('Cursor not available with given criteria: ' +
+                             ', '.join([args[i] for i in range(5)
+                                        if cursor_type & (1 << i) != 0]))
+
+    async def _execute_query(self, query):
+        """Execute a query after checking for unread results"""
+        await self.handle_unread_result()
+        await self.cmd_query(query)
+
+    async def info_query(self, query):
+        """Send a query which only returns 1 row"""
+        cursor = self.cursor(buffered=True)
+        await cursor.execute(query)
+        return await cursor.fetchone()
+
+    async def commit(self):
+        """Commit current transaction"""
+        await self._execute_query("COMMIT")
+
+    async def rollback(self):
+        """Rollback current transaction"""
+        if self.unread_result:
+            await self.get_rows()
+
+        await self._execute_query("ROLLBACK")
+
+    async def start_transaction(self, consistent_snapshot=False,
+                                isolation_level=None, readonly=None):
+        """Start a transaction
+
+        See mysql.connector.MySQLConnection.start_transaction().
+        """
+        if self.in_transaction:
+            raise errors.ProgrammingError("Transaction already in progress")
+
+        if isolation_level:
+            level = isolation_level.strip().replace('-', ' ').upper()
+            levels = ['READ UNCOMMITTED', 'READ COMMITTED', 'REPEATABLE READ',
+                      'SERIALIZABLE']
+
+            if level not in levels:
+                raise ValueError(
+                    'Unknown isolation level "{0}"'.format(isolation_level))
+
+            await self._execute_query(
+                "SET TRANSACTION ISOLATION LEVEL {0}".format(level))
+
+        if readonly is not None:
+            if self._server_version < (5, 6, 5):
+                raise ValueError(
+                    "MySQL server version {0} does not support "
+                    "this feature".format(self._server_version))
+
+            access_mode = 'READ ONLY' if readonly else 'READ WRITE'
+            await self._execute_query(
+                "SET TRANSACTION {0}".format(access_mode))
+
+        query = "START TRANSACTION"
+        if consistent_snapshot:
+            query += " WITH CONSISTENT SNAPSHOT"
+        await self.cmd_query(query)
+
+    async def set_charset_collation(self, charset=None, collation=None):
+        """Sets the character set and collation for the current connection
+
+        See mysql.connector.MySQLConnection.set_charset_collation().
+        """
+        (charset_name, collation_name) = self._lookup_charset_collation(
+            charset, collation)
+
+        await self._execute_query("SET NAMES '{0}' COLLATE '{1}'".format(
+            charset_name, collation_name))
+
+        if self.converter:
+            self.converter.set_charset(charset_name)
+
+    async def get_autocommit(self):
+        """Get whether autocommit is on or off"""
+        value = (await self.info_query("SELECT @@session.autocommit"))[0]
+        return True if value == 1 else False
+
+    async def set_autocommit(self, value):
+        """Toggle autocommit"""
+        switch = 'ON' if value else 'OFF'
+        await self.cmd_query("SET @@session.autocommit = {0}".format(switch))
+        self._autocommit = value
+
+    async def get_database(self):
+        """Get the current database"""
+        return (await self.info_query("SELECT DATABASE()"))[0]
+
+    async def set_database(self, value):
+        """Set the current database"""
+        await self.cmd_query("USE %s" % value)
+
+    async def get_time_zone(self):
+        """Get the current time zone"""
+        return (await self.info_query("SELECT @@session.time_zone"))[0]
+
+    async def set_time_zone(self, value):
+        """Set the time zone"""
+        await self.cmd_query("SET @@session.time_zone = '{0}'".format(value))
+        self._time_zone = value
+
+    async def get_sql_mode(self):
+        """Get the SQL mode"""
+        return (await self.info_query("SELECT @@session.sql_mode"))[0]
+
+    async def set_sql_mode(self, value):
+        """Set the SQL mode
+
+        The value argument can be either a string with comma separate mode
+        names, or a sequence of mode names.
+        """
+        if isinstance(value, (list, tuple)):
+            value = ','.join(value)
+        await self.cmd_query("SET @@session.sql_mode = '{0}'".format(value))
+        self._sql_mode = value
+
+    async def get_max_allowed_packet(self):
+        """Get the max_allowed_packet of the current session
+
+        The value is queried once after the connection was established
+        and cached until the connection is opened again.
+
+        Returns an integer.
+        """
+        if self._max_allowed_packet is None:
+            self._max_allowed_packet = int((await self.info_query(
+                "SELECT @@session.max_allowed_packet"))[0])
+        return self._max_allowed_packet
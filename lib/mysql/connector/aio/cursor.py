@@ -0,0 +1,496 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2016, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Cursor classes for the asyncio connection
+"""
+
+import weakref
+
+from .. import columnar, cursor, errors
+from ..cursor import RE_SQL_SPLIT_STMTS, _split_batch_insert
+
+
+class MySQLCursor(cursor.MySQLCursor):
+    """Default cursor for interacting with MySQL using asyncio
+
+    The cursor works like mysql.connector.cursor.MySQLCursor, but the
+    methods communicating with the MySQL server are coroutines. Rows are
+    iterated using 'async for'.
+
+    Example:
+      await cur.execute("SELECT id, name FROM employees")
+      async for (emp_id, name) in cur:
+          print(emp_id, name)
+    """
+
+    __iter__ = None
+    next = __next__ = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """Return the next row of the result set"""
+        try:
+            row = await self.fetchone()
+        except errors.InterfaceError:
+            raise StopAsyncIteration
+        if not row:
+            raise StopAsyncIteration
+        return row
+
+    def _set_connection(self, connection):
+        """Set the connection"""
+        try:
+            self._connection = weakref.proxy(connection)
+            self._connection.handle_unread_result  # pylint: disable=W0104
+        except (AttributeError, TypeError):
+            raise errors.InterfaceError(errno=2048)
+
+    async def close(self):
+        """Close the cursor
+
+        Returns True when successful, otherwise False.
+        """
+        if self._connection is None:
+            return False
+
+        await self._connection.handle_unread_result()
+        self._reset_result()
+        self._connection = None
+
+        return True
+
+    async def _handle_noresultset(self, res):
+        """Handles result of execute() when there is no result set"""
+        try:
+            self._rowcount = res['affected_rows']
+            self._last_insert_id = res['insert_id']
+            self._warning_count = res['warning_count']
+        except (KeyError, TypeError) as err:
+            raise errors.ProgrammingError(
+                "Failed handling non-resultset; {0}".format(err))
+
+        await self._handle_warnings()
+        if self._connection.raise_on_warnings is True and self._warnings:
+            raise errors.get_mysql_exception(
+                self._warnings[0][1], self._warnings[0][2])
+
+    async def _handle_resultset(self):
+        """Handles result set"""
+        pass
+
+    async def _handle_result(self, result):
+        """Handle the result after a command was send
+
+        Raises InterfaceError when result is not a dict() or result is
+        invalid.
+        """
+        if not isinstance(result, dict):
+            raise errors.InterfaceError('Result was not a dict()')
+
+        if 'columns' in result:
+            # Weak test, must be column/eof information
+            self._description = result['columns']
+            self._row_decoder = None
+            self._connection.unread_result = True
+            await self._handle_resultset()
+        elif 'affected_rows' in result:
+            # Weak test, must be an OK-packet
+            self._connection.unread_result = False
+            await self._handle_noresultset(result)
+        else:
+            raise errors.InterfaceError('Invalid result')
+
+    async def _execute_iter(self, query_iter):
+        """Asynchronous generator returning the cursor for each statement"""
+        executed_list = RE_SQL_SPLIT_STMTS.split(self._executed)
+
+        i = 0
+        async for result in query_iter:
+            self._reset_result()
+            await self._handle_result(result)
+            try:
+                self._executed = executed_list[i].strip()
+                i += 1
+            except IndexError:
+                self._executed = executed_list[0]
+
+            yield self
+
+    async def execute(self, operation, params=None, multi=False):
+        """Executes the given operation
+
+        Executes the given operation substituting any markers with
+        the given parameters.
+
+        When multi is True, an asynchronous generator is returned which
+        gives the cursor for the result of each statement:
+          async for cur in await cursor.execute(stmts, multi=True):
+              ...
+
+        Returns an asynchronous generator when multi is True, otherwise None.
+        """
+        if not operation:
+            return None
+
+        if not self._connection:
+            raise errors.ProgrammingError("Cursor is not connected")
+
+        await self._connection.handle_unread_result()
+
+        self._reset_result()
+        stmt = self._build_statement(operation, params)
+
+        self._executed = stmt
+        if multi:
+            self._executed_list = []
+            return self._execute_iter(self._connection.cmd_query_iter(stmt))
+
+        try:
+            await self._handle_result(await self._connection.cmd_query(stmt))
+        except errors.InterfaceError:
+            if self._connection._have_next_result:  # pylint: disable=W0212
+                raise errors.InterfaceError(
+                    "Use multi=True when executing multiple statements")
+            raise
+        return None
+
+    async def executemany(self, operation, seq_params):
+        """Execute the given operation multiple times
+
+        INSERT and REPLACE statements are optimized by batching the data,
+        that is using the MySQL multiple rows syntax.
+
+        Results are discarded.
+        """
+        if not operation or not seq_params:
+            return None
+        await self._connection.handle_unread_result()
+
+        try:
+            _ = iter(seq_params)
+        except TypeError:
+            raise errors.ProgrammingError(
+                "Parameters for query must be an Iterable.")
+
+        # Optimize INSERT and REPLACE statements by batching them
+        if _split_batch_insert(operation) is not None:
+            await self._connection.get_max_allowed_packet()
+            rowcnt = 0
+            for stmt in self._batch_insert(operation, seq_params):
+                await self.execute(stmt)
+                rowcnt += self._rowcount
+            self._rowcount = rowcnt
+            return None
+
+        rowcnt = 0
+        try:
+            for params in seq_params:
+                await self.execute(operation, params)
+                if self.with_rows and self._have_unread_result():
+                    await self.fetchall()
+                rowcnt += self._rowcount
+        except (ValueError, TypeError) as err:
+            raise errors.InterfaceError(
+                "Failed executing the operation; {0}".format(err))
+        self._rowcount = rowcnt
+
+    async def callproc(self, procname, args=()):
+        """Calls a stored procedure
+
+        Not available with mysql.connector.aio, use execute() with CALL.
+        """
+        raise errors.NotSupportedError(
+            "callproc() is not supported by mysql.connector.aio")
+
+    async def load_data(self, table, rows, columns=None, format='tsv'):
+        """Load rows into a table using LOAD DATA LOCAL INFILE
+
+        Not available with mysql.connector.aio.
+        """
+        # pylint: disable=W0622
+        raise errors.NotSupportedError(
+            "LOAD DATA LOCAL INFILE is not supported by mysql.connector.aio")
+
+    async def _fetch_warnings(self):
+        """Fetch warnings doing a SHOW WARNINGS
+
+        Returns a result set or None when there were no warnings.
+        """
+        res = []
+        try:
+            cur = self._connection.cursor(raw=False)
+            await cur.execute("SHOW WARNINGS")
+            res = await cur.fetchall()
+            await cur.close()
+        except Exception as err:
+            raise errors.InterfaceError(
+                "Failed getting warnings; %s" % err)
+
+        if len(res):
+            return res
+
+        return None
+
+    async def _handle_warnings(self):
+        """Handle possible warnings after all results are consumed"""
+        if self._connection.get_warnings is True and self._warning_count:
+            self._warnings = await self._fetch_warnings()
+
+    async def _handle_eof(self, eof):
+        """Handle EOF packet"""
+        self._connection.unread_result = False
+        self._nextrow = (None, None)
+        self._warning_count = eof['warning_count']
+        await self._handle_warnings()
+        if self._connection.raise_on_warnings is True and self._warnings:
+            raise errors.get_mysql_exception(
+                self._warnings[0][1], self._warnings[0][2])
+
+    async def _fetch_row(self):
+        """Returns the next row in the result set
+
+        Returns a tuple or None.
+        """
+        if not self._have_unread_result():
+            return None
+        row = None
+
+        if self._nextrow == (None, None):
+            (row, eof) = await self._connection.get_row(
+                binary=self._binary, columns=self.description)
+        else:
+            (row, eof) = self._nextrow
+
+        if row:
+            self._nextrow = await self._connection.get_row(
+                binary=self._binary, columns=self.description)
+            eof = self._nextrow[1]
+            if eof is not None:
+                await self._handle_eof(eof)
+            if self._rowcount == -1:
+                self._rowcount = 1
+            else:
+                self._rowcount += 1
+        if eof:
+            await self._handle_eof(eof)
+
+        return row
+
+    async def fetchone(self):
+        """Returns next row of a query result set
+
+        Returns a tuple or None.
+        """
+        row = await self._fetch_row()
+        if row:
+            return self._get_row_decoder()(row)
+        return None
+
+    async def fetchmany(self, size=None):
+        """Returns the next set of rows of a query result
+
+        Returns a list of tuples.
+        """
+        res = []
+        cnt = (size or self.arraysize)
+        while cnt > 0 and self._have_unread_result():
+            cnt -= 1
+            row = await self.fetchone()
+            if row:
+                res.append(row)
+        return res
+
+    async def fetchall(self):
+        """Returns all rows of a query result set
+
+        Returns a list of tuples.
+        """
+        if not self._have_unread_result():
+            raise errors.InterfaceError("No result set to fetch from.")
+        (rows, eof) = await self._connection.get_rows()
+        if self._nextrow[0]:
+            rows.insert(0, self._nextrow[0])
+
+        decode = self._get_row_decoder()
+        rows = [decode(row) for row in rows]
+
+        await self._handle_eof(eof)
+        rowcount = len(rows)
+        if rowcount >= 0 and self._rowcount == -1:
+            self._rowcount = 0
+        self._rowcount += rowcount
+        return rows
+
+    async def _fetch_row_batches(self, size):
+        """Returns the remaining rows of the result set in batches
+
+        Rows are read from the connection at most size at a time and are
+        returned as received, without converting them.
+
+        Returns an asynchronous iterator over lists of rows.
+        """
+        if not self._have_unread_result():
+            raise errors.InterfaceError("No result set to fetch from.")
+
+        rows = []
+        if self._nextrow[0]:
+            rows.append(self._nextrow[0])
+            self._nextrow = (None, None)
+        eof = None
+        while eof is None:
+            (batch, eof) = await self._connection.get_rows(
+                count=size, binary=self._binary, columns=self.description)
+            rows.extend(batch)
+            if self._rowcount == -1:
+                self._rowcount = 0
+            self._rowcount += len(rows)
+            if eof is not None:
+                await self._handle_eof(eof)
+            yield rows
+            rows = []
+
+    async def fetch_columns(self):
+        """Returns the remaining rows of the result set as columns
+
+        Returns a list with a list of values for each column.
+        """
+        decoders = None if self._raw else self._column_decoders()
+        collector = columnar.ColumnCollector(self.description, decoders)
+        async for rows in self._fetch_row_batches(columnar.BATCH_SIZE):
+            collector.add_rows(rows)
+        return collector.columns()
+
+    async def fetchall_numpy(self):
+        """Returns the remaining rows of the result set as NumPy arrays
+
+        Raises errors.InterfaceError when NumPy is not available.
+
+        Returns a list with an array for each column.
+        """
+        collector = columnar.NumPyColumnCollector(self.description,
+                                                  self._column_decoders())
+        async for rows in self._fetch_row_batches(columnar.BATCH_SIZE):
+            collector.add_rows(rows)
+        return collector.columns()
+
+
+class MySQLCursorBuffered(MySQLCursor):
+    """Cursor which fetches rows within execute()"""
+
+    def __init__(self, connection=None):
+        MySQLCursor.__init__(self, connection)
+        self._rows = None
+        self._next_row = 0
+
+    async def _handle_resultset(self):
+        (self._rows, eof) = await self._connection.get_rows()
+        self._rowcount = len(self._rows)
+        await self._handle_eof(eof)
+        self._next_row = 0
+        self._connection.unread_result = False
+
+    def reset(self, free=True):
+        self._rows = None
+
+    async def _fetch_row(self):
+        try:
+            row = self._rows[self._next_row]
+        except (IndexError, TypeError):
+            return None
+        self._next_row += 1
+        return row
+
+    async def fetchall(self):
+        if self._rows is None:
+            raise errors.InterfaceError("No result set to fetch from.")
+        decode = self._get_row_decoder()
+        res = [decode(row) for row in self._rows[self._next_row:]]
+        self._next_row = len(self._rows)
+        return res
+
+    async def fetchmany(self, size=None):
+        res = []
+        cnt = (size or self.arraysize)
+        while cnt > 0:
+            cnt -= 1
+            row = await self.fetchone()
+            if row:
+                res.append(row)
+
+        return res
+
+    async def _fetch_row_batches(self, size):
+        """Returns the remaining buffered rows in batches
+
+        Returns an asynchronous iterator over lists of rows.
+        """
+        if self._rows is None:
+            raise errors.InterfaceError("No result set to fetch from.")
+        start = self._next_row
+        self._next_row = len(self._rows)
+        for offset in range(start, self._next_row, size):
+            yield self._rows[offset:offset + size]
+
+    @property
+    def with_rows(self):
+        return self._rows is not None
+
+
+class MySQLCursorRaw(MySQLCursor):
+    """Cursor returning rows as received from the MySQL server"""
+
+    _raw = True
+
+    def _get_row_decoder(self):
+        """Returns a function leaving rows unconverted"""
+        return tuple
+
+
+class MySQLCursorBufferedRaw(MySQLCursorRaw, MySQLCursorBuffered):
+    """Buffered cursor returning rows as received from the MySQL server"""
+    pass
+
+
+class MySQLCursorDict(MySQLCursor):
+    """Cursor fetching rows as dictionaries
+
+    Each row is a dictionary mapping the column names to the values.
+    """
+
+    def _get_row_decoder(self):
+        """Returns a function converting rows to dictionaries"""
+        decode = super(MySQLCursorDict, self)._get_row_decoder()
+        column_names = self.column_names
+
+        def to_dict(row):
+            """Convert a row and map it to the column names"""
+            return dict(zip(column_names, decode(row)))
+        return to_dict
+
+
+class MySQLCursorBufferedDict(MySQLCursorDict, MySQLCursorBuffered):
+    """Buffered cursor fetching rows as dictionaries"""
+    pass
+
@@ -0,0 +1,174 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2016, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Module implementing MySQL packet I/O over asyncio streams
+"""
+
+import asyncio
+import socket
+import ssl
+import struct
+
+from .. import errors
+from ..network import _packet_views, _strioerror
+
+
+class MySQLSocket(object):
+    """MySQL socket class using asyncio streams
+
+    Opens a TCP/IP connection, or a connection through the UNIX socket when
+    unix_socket is given, to the MySQL server. Packets are written to and
+    read from the stream without blocking the event loop.
+    """
+
+    def __init__(self, host='127.0.0.1', port=3306, unix_socket=None,
+                 force_ipv6=False):
+        self.server_host = host
+        self.server_port = port
+        self.unix_socket = unix_socket
+        self.force_ipv6 = force_ipv6
+        self._connection_timeout = None
+        self._packet_number = -1
+        self._reader = None
+        self._writer = None
+
+    @property
+    def next_packet_number(self):
+        """Increments the packet number"""
+        self._packet_number = self._packet_number + 1
+        if self._packet_number > 255:
+            self._packet_number = 0
+        return self._packet_number
+
+    def get_address(self):
+        """Return the address of the MySQL server"""
+        if self.unix_socket:
+            return self.unix_socket
+        return "{0}:{1}".format(self.server_host, self.server_port)
+
+    def set_connection_timeout(self, timeout):
+        """Set the connection timeout"""
+        self._connection_timeout = timeout
+
+    async def open_connection(self):
+        """Open the connection to the MySQL server"""
+        if self.unix_socket:
+            errno = 2002
+            conn = asyncio.open_unix_connection(self.unix_socket)
+        else:
+            errno = 2003
+            conn = asyncio.open_connection(
+                self.server_host, self.server_port,
+                family=socket.AF_INET6 if self.force_ipv6 else 0)
+        try:
+            (self._reader, self._writer) = await asyncio.wait_for(
+                conn, self._connection_timeout)
+        except asyncio.TimeoutError:
+            raise errors.InterfaceError(
+                errno=errno, values=(self.get_address(), 'timed out'))
+        except IOError as err:
+            raise errors.InterfaceError(
+                errno=errno, values=(self.get_address(), _strioerror(err)))
+
+    def shutdown(self):
+        """Shut down the connection without waiting for pending writes"""
+        if self._writer is not None:
+            self._writer.transport.abort()
+            self._writer = None
+
+    async def close_connection(self):
+        """Close the connection"""
+        if self._writer is None:
+            return
+        writer = self._writer
+        self._writer = None
+        try:
+            writer.close()
+            if hasattr(writer, 'wait_closed'):
+                # StreamWriter.wait_closed() is new in Python 3.7
+                await writer.wait_closed()
+        except IOError:
+            pass
+
+    async def send(self, buf, packet_number=None):
+        """Send packets to the MySQL server"""
+        if packet_number is None:
+            self.next_packet_number  # pylint: disable=W0104
+        else:
+            self._packet_number = packet_number
+        try:
+            self._writer.writelines(_packet_views(buf, self._packet_number))
+            await self._writer.drain()
+        except IOError as err:
+            raise errors.OperationalError(
+                errno=2055, values=(self.get_address(), _strioerror(err)))
+        except AttributeError:
+            raise errors.OperationalError(errno=2006)
+
+    async def recv(self):
+        """Receive a packet from the MySQL server"""
+        try:
+            header = await self._reader.readexactly(4)
+            self._packet_number = header[3]
+            payload_len = struct.unpack('<I', header[0:3] + b'\x00')[0]
+            packet = bytearray(header)
+            packet += await self._reader.readexactly(payload_len)
+            return packet
+        except asyncio.IncompleteReadError:
+            raise errors.InterfaceError(errno=2013)
+        except IOError as err:
+            raise errors.OperationalError(
+                errno=2055, values=(self.get_address(), _strioerror(err)))
+        except AttributeError:
+            raise errors.OperationalError(errno=2006)
+
+    # pylint: disable=C0103
+    async def switch_to_ssl(self, ca, cert, key, verify_cert=False,
+                            cipher=None):
+        """Switch the connection to use SSL
+
+        Requires Python 3.11 or later, which can upgrade asyncio streams.
+        """
+        if self._writer is None:
+            raise errors.InterfaceError(errno=2048)
+        if not hasattr(self._writer, 'start_tls'):
+            raise errors.NotSupportedError(
+                "SSL with mysql.connector.aio requires Python 3.11 or later")
+
+        try:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            context.check_hostname = False
+            if verify_cert:
+                context.verify_mode = ssl.CERT_REQUIRED
+                context.load_verify_locations(ca)
+            else:
+                context.verify_mode = ssl.CERT_NONE
+            if cert:
+                context.load_cert_chain(cert, key)
+            if cipher:
+                context.set_ciphers(cipher)
+            await self._writer.start_tls(context)
+        except (ssl.SSLError, IOError) as err:
+            raise errors.InterfaceError(
+                errno=2055, values=(self.get_address(), _strioerror(err)))
+    # pylint: enable=C0103
@@ -0,0 +1,344 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2016, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Implementing pooling of asyncio connections to MySQL servers.
+"""
+
+import asyncio
+from collections import deque
+from uuid import uuid4
+
+from .. import errors
+from ..pooling import (
+    CNX_POOL_MAXSIZE, CNX_POOL_MAXNAMESIZE, CNX_POOL_NAMEREGEX,
+    generate_pool_name)
+from .connection import MySQLConnection
+
+
+class PooledMySQLConnection(object):
+    """Class holding an asyncio MySQL Connection in a pool
+
+    It works like aio.MySQLConnection except for close() and config().
+    Awaiting close() adds the connection back to the pool rather than
+    disconnecting from the MySQL server.
+    """
+    def __init__(self, pool, cnx):
+        """Initialize
+
+        The pool argument must be an instance of aio.MySQLConnectionPool.
+        cnx is an instance of aio.MySQLConnection.
+        """
+        if not isinstance(pool, MySQLConnectionPool):
+            raise AttributeError(
+                "pool should be a MySQLConnectionPool")
+        if not isinstance(cnx, MySQLConnection):
+            raise AttributeError(
+                "cnx should be a MySQLConnection")
+        self._cnx_pool = pool
+        self._cnx = cnx
+
+    def __getattr__(self, attr):
+        """Calls attributes of the MySQLConnection instance"""
+        return getattr(self._cnx, attr)
+
+    async def close(self):
+        """Do not close, but add connection back to pool
+
+        When the pool is configured to reset the session, the session
+        state is cleared before the connection is added back.
+        """
+        cnx = self._cnx
+        self._cnx = None
+        try:
+            if self._cnx_pool.reset_session:
+                await cnx.reset_session()
+        except errors.Error:
+            # Reconnected when it is handed out again
+            cnx.shutdown()
+        self._cnx_pool.add_connection(cnx)
+
+    def config(self, **kwargs):
+        """Configuration is done through the pool"""
+        raise errors.PoolError(
+            "Configuration for pooled connections should "
+            "be done through the pool itself."
+        )
+
+    @property
+    def pool_name(self):
+        """Return the name of the connection pool"""
+        return self._cnx_pool.pool_name
+
+
+class MySQLConnectionPool(object):
+    """Class defining a pool of asyncio MySQL connections
+
+    Connections are opened when they are first needed, up to pool_size.
+    When all of them are in use, get_connection() waits until one is
+    added back, in the order the requests were made. By default it waits
+    without limit; pool_timeout sets the number of seconds to wait.
+    """
+    def __init__(self, pool_size=5, pool_name=None, pool_reset_session=True,
+                 pool_timeout=None, **kwargs):
+        """Initialize
+
+        The keyword arguments, kwargs, are configuration arguments for
+        aio.MySQLConnection instances.
+        """
+        self._pool_size = None
+        self._pool_name = None
+        self._pool_timeout = None
+        self._reset_session = pool_reset_session
+        self._set_pool_size(pool_size)
+        self._set_pool_name(pool_name or generate_pool_name(**kwargs))
+        self._set_pool_timeout(pool_timeout)
+        self._cnx_config = {}
+        self._cnx_idle = deque()
+        self._cnx_waiters = deque()
+        self._cnx_count = 0
+        self._config_version = uuid4()
+
+        if kwargs:
+            self.set_config(**kwargs)
+
+    @property
+    def pool_name(self):
+        """Return the name of the connection pool"""
+        return self._pool_name
+
+    @property
+    def pool_size(self):
+        """Return number of connections managed by the pool"""
+        return self._pool_size
+
+    @property
+    def reset_session(self):
+        """Return whether to reset session"""
+        return self._reset_session
+
+    @property
+    def pool_timeout(self):
+        """Return number of seconds get_connection() waits by default"""
+        return self._pool_timeout
+
+    def set_config(self, **kwargs):
+        """Set the connection configuration for MySQLConnection instances
+
+        Raises PoolError when a connection argument is not valid, missing
+        or not supported by MySQLConnection.
+        """
+        if not kwargs:
+            return
+
+        try:
+            test_cnx = MySQLConnection()
+            test_cnx.config(**kwargs)
+            self._cnx_config = kwargs
+            self._config_version = uuid4()
+        except AttributeError as err:
+            raise errors.PoolError(
+                "Connection configuration not valid: {0}".format(err))
+
+    def _set_pool_size(self, pool_size):
+        """Set the size of the pool
+
+        Raises an AttributeError when the pool_size is not valid.
+        """
+        if pool_size <= 0 or pool_size > CNX_POOL_MAXSIZE:
+            raise AttributeError(
+                "Pool size should be higher than 0 and "
+                "lower or equal to {0}".format(CNX_POOL_MAXSIZE))
+        self._pool_size = pool_size
+
+    def _set_pool_timeout(self, pool_timeout):
+        """Set the time get_connection() waits by default
+
+        None means waiting without limit. Raises an AttributeError when
+        pool_timeout is not a number or is negative.
+        """
+        if pool_timeout is not None:
+            try:
+                pool_timeout = float(pool_timeout)
+            except (TypeError, ValueError):
+                raise AttributeError("Pool timeout should be a number")
+            if pool_timeout < 0:
+                raise AttributeError("Pool timeout should be 0 or higher")
+        self._pool_timeout = pool_timeout
+
+    def _set_pool_name(self, pool_name):
+        """Set the name of the pool
+
+        Raises an AttributeError when pool_name contains illegal characters
+        or is too long.
+        """
+        if CNX_POOL_NAMEREGEX.search(pool_name):
+            raise AttributeError(
+                "Pool name '{0}' contains illegal characters".format(pool_name))
+        if len(pool_name) > CNX_POOL_MAXNAMESIZE:
+            raise AttributeError(
+                "Pool name '{0}' is too long".format(pool_name))
+        self._pool_name = pool_name
+
+    def add_connection(self, cnx):
+        """Add a connection back to the pool
+
+        The connection is handed to the longest waiting get_connection()
+        call, if any.
+
+        Raises PoolError when cnx is not a MySQLConnection.
+        """
+        if not isinstance(cnx, MySQLConnection):
+            raise errors.PoolError(
+                "Connection instance not subclass of MySQLConnection.")
+
+        while self._cnx_waiters:
+            waiter = self._cnx_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(cnx)
+                return
+        self._cnx_idle.append(cnx)
+
+    def _discard_waiter(self, waiter):
+        """Stop waiting for a connection
+
+        A connection already handed to the waiter is added back.
+        """
+        if waiter.done() and not waiter.cancelled() \
+                and waiter.exception() is None:
+            self.add_connection(waiter.result())
+        elif waiter in self._cnx_waiters:
+            self._cnx_waiters.remove(waiter)
+
+    def _release_connection(self):
+        """Stop counting a connection towards pool_size
+
+        The freed place is used to open a connection for the longest
+        waiting get_connection() call, if any.
+        """
+        self._cnx_count -= 1
+        while self._cnx_waiters:
+            waiter = self._cnx_waiters.popleft()
+            if not waiter.done():
+                asyncio.ensure_future(self._open_connection_for(waiter))
+                return
+
+    async def _open_connection(self):
+        """Open a new connection counting towards pool_size"""
+        self._cnx_count += 1
+        try:
+            cnx = MySQLConnection(**self._cnx_config)
+            await cnx.connect()
+        except:
+            self._release_connection()
+            raise
+        # pylint: disable=W0201,W0212
+        cnx._pool_config_version = self._config_version
+        # pylint: enable=W0201,W0212
+        return cnx
+
+    async def _open_connection_for(self, waiter):
+        """Open a new connection and hand it to a waiting call
+
+        Errors opening the connection are raised in the waiting call.
+        """
+        try:
+            cnx = await self._open_connection()
+        except Exception as err:  # pylint: disable=W0703
+            if not waiter.done():
+                waiter.set_exception(err)
+            return
+        if waiter.done():
+            self.add_connection(cnx)
+        else:
+            waiter.set_result(cnx)
+
+    async def get_connection(self, timeout=None):
+        """Get a connection from the pool
+
+        Idle connections are used first, then new connections are opened
+        until the pool holds pool_size connections. Otherwise, this waits
+        up to timeout seconds, or pool_timeout when timeout is None, for a
+        connection to be added back. Connections which were closed, or
+        were configured with an older configuration, are reconnected.
+
+        Raises PoolError on errors.
+
+        Returns a PooledMySQLConnection instance.
+        """
+        if not self._cnx_config:
+            raise errors.PoolError(
+                "Connection configuration not available")
+        if timeout is None:
+            timeout = self._pool_timeout
+
+        if self._cnx_idle:
+            cnx = self._cnx_idle.popleft()
+        elif self._cnx_count < self._pool_size:
+            return PooledMySQLConnection(self, await self._open_connection())
+        elif timeout is not None and timeout <= 0:
+            raise errors.PoolError(
+                "Failed getting connection; pool exhausted")
+        else:
+            waiter = asyncio.get_event_loop().create_future()
+            self._cnx_waiters.append(waiter)
+            try:
+                cnx = await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                self._discard_waiter(waiter)
+                raise errors.PoolError(
+                    "Failed getting connection; pool exhausted")
+            except asyncio.CancelledError:
+                self._discard_waiter(waiter)
+                raise
+
+        # pylint: disable=W0201,W0212
+        if cnx._socket is None \
+                or self._config_version != cnx._pool_config_version:
+            cnx.config(**self._cnx_config)
+            try:
+                await cnx.reconnect()
+            except errors.InterfaceError:
+                # Failed to reconnect, give connection back to pool
+                self.add_connection(cnx)
+                raise
+            cnx._pool_config_version = self._config_version
+        # pylint: enable=W0201,W0212
+
+        return PooledMySQLConnection(self, cnx)
+
+    async def _remove_connections(self):
+        """Close all idle connections
+
+        Returns the number of connections closed.
+        """
+        cnt = 0
+        while self._cnx_idle:
+            cnx = self._cnx_idle.popleft()
+            self._release_connection()
+            try:
+                await cnx.disconnect()
+                cnt += 1
+            except errors.Error:
+                # Any other error when closing means connection is closed
+                pass
+        return cnt
@@ -88,8 +88,28 @@ if PY2:
         if isinstance(buf, (bytearray, bytes)):
             return struct.unpack_from(fmt, buffer(buf))
         return struct.unpack_from(fmt, buf)
+    def struct_unpack_from(fmt, buf, offset=0):
+        """Wrapper around struct.unpack_from handling bytes and strings"""
+        if isinstance(buf, (bytearray, bytes)):
+            return struct.unpack_from(fmt, buffer(buf), offset)
+        return struct.unpack_from(fmt, buf, offset)
 else:
     struct_unpack = struct.unpack  # pylint: disable=C0103
+    struct_unpack_from = struct.unpack_from  # pylint: disable=C0103
+
+
+if PY2:
+    exec("""def reraise(exc_info):
+    \"\"\"Raise an exception again keeping its traceback\"\"\"
+    raise exc_info[0], exc_info[1], exc_info[2]
+""")  # pylint: disable=W0122
+else:
+    def reraise(exc_info):
+        """Raise an exception again keeping its traceback
+
+        The exc_info is a tuple as returned by sys.exc_info().
+        """
+        raise exc_info[1].with_traceback(exc_info[2])
 
 
 def make_abc(base_class):
@@ -0,0 +1,203 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2016, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Fetching result sets as columns
+
+Result sets can be fetched as a sequence of values for each column instead
+of a sequence of rows. Rows are read from the server and converted in batches
+so a complete result set is never held both as rows and as columns.
+
+Columns can also be returned as NumPy arrays. NumPy is not required by
+Connector/Python and is only used when it is installed.
+"""
+
+try:
+    import numpy  # pylint: disable=F0401
+except ImportError:
+    HAVE_NUMPY = False
+else:
+    HAVE_NUMPY = True
+
+from .constants import FieldFlag, FieldType
+from . import errors
+
+# Maximum number of rows read and converted at once
+BATCH_SIZE = 10000
+
+_INTEGER_TYPES = (FieldType.TINY, FieldType.SHORT, FieldType.INT24,
+                  FieldType.LONG, FieldType.LONGLONG, FieldType.YEAR)
+_FLOAT_TYPES = (FieldType.FLOAT, FieldType.DOUBLE)
+_DATETIME_TYPES = (FieldType.DATETIME, FieldType.TIMESTAMP)
+_DATE_TYPES = (FieldType.DATE, FieldType.NEWDATE)
+
+
+def numpy_dtype(field):
+    """Returns the NumPy data type for the column described by field
+
+    Columns holding values NumPy has no native type for, for example strings,
+    decimals and sets, are stored in arrays of Python objects.
+
+    Returns a string.
+    """
+    field_type = field[1]
+    if field_type in _INTEGER_TYPES:
+        if (field_type == FieldType.LONGLONG
+                and field[7] & FieldFlag.UNSIGNED):
+            return 'uint64'
+        return 'int64'
+    elif field_type in _FLOAT_TYPES:
+        return 'float64'
+    elif field_type in _DATETIME_TYPES:
+        return 'datetime64[us]'
+    elif field_type in _DATE_TYPES:
+        return 'datetime64[D]'
+    elif field_type == FieldType.TIME:
+        return 'timedelta64[us]'
+    return 'object'
+
+
+def column_decoders(converter, description):
+    """Returns functions converting the columns of a text result set
+
+    The column_decoder() method of the converter is used when available,
+    otherwise values are converted one by one using to_python().
+
+    Returns a list with a callable for each column.
+    """
+    decoders = []
+    for field in description:
+        try:
+            decoders.append(converter.column_decoder(field))
+        except AttributeError:
+            # Converter classes not based on MySQLConverter
+            def decode(values, field=field):
+                """Convert values using to_python()"""
+                return [converter.to_python(field, value)
+                        for value in values]
+            decoders.append(decode)
+    return decoders
+
+
+class ColumnCollector(object):
+    """Collects rows of a result set as columns
+
+    Rows are added in batches using add_rows(). Each batch is split into
+    columns, which are converted using decoders when given. When decoders
+    is None, values are used as they are.
+    """
+
+    def __init__(self, description, decoders=None):
+        self._description = description
+        self._decoders = decoders
+        self._columns = [[] for _ in description]
+
+    def _add_column(self, index, values):
+        """Add values to the column with the given index"""
+        if self._decoders:
+            values = self._decoders[index](values)
+        self._columns[index].extend(values)
+
+    def add_rows(self, rows):
+        """Add a batch of rows"""
+        if not rows:
+            return
+        for index, values in enumerate(zip(*rows)):
+            self._add_column(index, values)
+
+    def columns(self):
+        """Returns the collected columns
+
+        Returns a list with a list of values for each column.
+        """
+        return self._columns
+
+
+class NumPyColumnCollector(ColumnCollector):
+    """Collects rows of a result set as NumPy arrays
+
+    Each column is stored as a numpy.ma.MaskedArray using the data type
+    returned by numpy_dtype(); NULL values are masked. Date and time values
+    are parsed by NumPy directly when they are given as strings.
+
+    Raises errors.InterfaceError when NumPy is not available.
+    """
+
+    def __init__(self, description, decoders=None):
+        if not HAVE_NUMPY:
+            raise errors.InterfaceError(
+                "NumPy is required for fetching NumPy arrays")
+        super(NumPyColumnCollector, self).__init__(description, decoders)
+        self._dtypes = [numpy_dtype(field) for field in description]
+
+    def _parse_column(self, index, values):
+        """Parse date and time strings of a column using NumPy
+
+        Returns a numpy.ndarray or None when the values can not be parsed,
+        for example when they contain zero dates.
+        """
+        dtype = self._dtypes[index]
+        if not dtype.startswith('datetime64'):
+            return None
+        try:
+            return numpy.array([b'NaT' if value is None else bytes(value)
+                                for value in values], dtype='S').astype(dtype)
+        except (ValueError, TypeError):
+            return None
+
+    def _add_column(self, index, values):
+        """Add values to the column with the given index"""
+        data = None
+        if self._decoders:
+            data = self._parse_column(index, values)
+            if data is None:
+                values = self._decoders[index](values)
+
+        mask = numpy.array([value is None for value in values], dtype=bool)
+        if data is None:
+            dtype = self._dtypes[index]
+            if dtype == 'object':
+                data = numpy.empty(len(values), dtype=object)
+                data[:] = values
+            else:
+                if dtype in ('int64', 'uint64', 'float64'):
+                    # NULL in numeric columns is stored as 0 and masked
+                    values = [0 if value is None else value
+                              for value in values]
+                data = numpy.array(values, dtype=dtype)
+        self._columns[index].append(numpy.ma.MaskedArray(data, mask=mask))
+
+    def columns(self):
+        """Returns the collected columns
+
+        Returns a list with a numpy.ma.MaskedArray for each column.
+        """
+        arrays = []
+        for dtype, chunks in zip(self._dtypes, self._columns):
+            if not chunks:
+                arrays.append(numpy.ma.MaskedArray(
+                    numpy.empty(0, dtype=dtype), mask=numpy.empty(0, bool)))
+            elif len(chunks) == 1:
+                arrays.append(chunks[0])
+            else:
+                arrays.append(numpy.ma.concatenate(chunks))
+        return arrays
@@ -26,13 +26,14 @@
 
 from io import IOBase
 import os
+import sys
 import time
 
 from .authentication import get_auth_plugin
-from .catch23 import PY2, isstr
+from .catch23 import PY2, isstr, reraise
 from .constants import (
     ClientFlag, ServerCmd, ServerFlag,
-    flag_is_set, ShutdownType, NET_BUFFER_LENGTH
+    flag_is_set, ShutdownType, MAX_PACKET_LENGTH
 )
 
 from . import errors
@@ -42,11 +43,84 @@ from .cursor import (
     MySQLCursorBuffered, MySQLCursorBufferedRaw, MySQLCursorPrepared,
     MySQLCursorDict, MySQLCursorBufferedDict, MySQLCursorNamedTuple,
     MySQLCursorBufferedNamedTuple)
-from .network import MySQLUnixSocket, MySQLTCPSocket
+from .network import MySQLUnixSocket, MySQLTCPSocket, HAVE_ZSTD
 from .protocol import MySQLProtocol
 from .utils import int4store
 from .abstracts import MySQLConnectionAbstract
 
+# Commands which do not change the session state
+_STATELESS_COMMANDS = (ServerCmd.PING, ServerCmd.STATISTICS,
+                       ServerCmd.STMT_FETCH)
+# Commands of which the MySQL server reports session state changes when
+# tracking them
+_TRACKED_COMMANDS = (ServerCmd.QUERY, ServerCmd.INIT_DB,
+                     ServerCmd.STMT_EXECUTE)
+# Session variables making the MySQL server report changes of the values
+# cached by the connection, whatever their global values are
+_SESSION_TRACK_VARIABLES = (
+    "SESSION session_track_schema = ON",
+    "SESSION session_track_system_variables = 'time_zone,autocommit,"
+    "character_set_client,character_set_results,character_set_connection'",
+)
+
+
+class PreparedStatementCache(object):
+    """Cache of the prepared statements of a session
+
+    Prepared statements are cached using their SQL statement as key. When
+    more than size statements are cached, the least recently used ones are
+    removed. A prepared statement is used by one cursor at a time: get()
+    takes it out of the cache and release() puts it back.
+
+    Statements released to a cache they were not taken from, for example
+    after reconnecting, are ignored since the session they belong to is
+    gone.
+    """
+
+    def __init__(self, size=0):
+        self.size = size
+        self._cached = {}
+        self._lru = []  # Keys, least recently used first
+        self._in_use = {}
+
+    def __len__(self):
+        return len(self._cached)
+
+    def get(self, key):
+        """Take the prepared statement for key out of the cache
+
+        Returns a dict or None when the statement is not cached.
+        """
+        try:
+            prepared = self._cached.pop(key)
+        except KeyError:
+            return None
+        self._lru.remove(key)
+        self._in_use[id(prepared)] = (key, prepared)
+        return prepared
+
+    def add(self, key, prepared):
+        """Add a prepared statement which is in use"""
+        self._in_use[id(prepared)] = (key, prepared)
+
+    def release(self, prepared):
+        """Put a prepared statement back into the cache
+
+        Returns a list of prepared statements which should be closed.
+        """
+        try:
+            key = self._in_use.pop(id(prepared))[0]
+        except KeyError:
+            return []
+        if not self.size or key in self._cached:
+            return [prepared]
+        self._cached[key] = prepared
+        self._lru.append(key)
+        evicted = []
+        while len(self._lru) > self.size:
+            evicted.append(self._cached.pop(self._lru.pop(0)))
+        return evicted
+
 
 class MySQLConnection(MySQLConnectionAbstract):
     """Connection to a MySQL Server"""
@@ -84,8 +158,14 @@ class MySQLConnection(MySQLConnectionAbstract):
         self._have_next_result = False
         self._raw = False
         self._in_transaction = False
+        self._session_changed = True
+        self._session_tracking = False
+        self._session_cache = {}
+        self._session_cache_tracked = False
 
         self._prepared_statements = None
+        self._local_infile_handler = None
+        self._local_infile_streams = {}
 
         self._ssl_active = False
         self._auth_plugin = None
@@ -113,8 +193,38 @@ class MySQLConnection(MySQLConnectionAbstract):
         if handshake['capabilities'] & ClientFlag.PLUGIN_AUTH:
             self.set_client_flags([ClientFlag.PLUGIN_AUTH])
 
+        if self._compress:
+            self._negotiate_compression(handshake['capabilities'])
+
         self._handshake = handshake
 
+    def _negotiate_compression(self, capabilities):
+        """Choose the algorithm used by the compressed protocol
+
+        The first of the compression_algorithms supported by both the MySQL
+        server and the client is used. zstd requires MySQL 8.0.18 or later
+        and the zstandard module. When none of them can be used, zlib is
+        used like with the compress option.
+        """
+        algorithm = 'zlib'
+        for name in self._compression_algorithms or ['zlib']:
+            if name == 'zstd' and not (
+                    HAVE_ZSTD and
+                    capabilities & ClientFlag.ZSTD_COMPRESSION_ALGORITHM):
+                continue
+            if name == 'zlib' and not capabilities & ClientFlag.COMPRESS:
+                continue
+            algorithm = name
+            break
+
+        self.set_client_flags([-ClientFlag.COMPRESS,
+                               -ClientFlag.ZSTD_COMPRESSION_ALGORITHM])
+        if algorithm == 'zlib':
+            self.set_client_flags([ClientFlag.COMPRESS])
+        elif algorithm == 'zstd':
+            self.set_client_flags([ClientFlag.ZSTD_COMPRESSION_ALGORITHM])
+        self._compression_algorithm = algorithm
+
     def _do_auth(self, username=None, password=None, database=None,
                  client_flags=0, charset=33, ssl_options=None):
         """Authenticate with the MySQL server
@@ -139,7 +249,8 @@ class MySQLConnection(MySQLConnectionAbstract):
             username=username, password=password, database=database,
             charset=charset, client_flags=client_flags,
             ssl_enabled=self._ssl_active,
-            auth_plugin=self._auth_plugin)
+            auth_plugin=self._auth_plugin,
+            zstd_level=self._zstd_compression_level or 3)
         self._socket.send(packet)
         self._auth_switch_request(username, password)
 
@@ -194,6 +305,8 @@ class MySQLConnection(MySQLConnectionAbstract):
                                   force_ipv6=self._force_ipv6)
         # pylint: enable=R0204
         conn.set_connection_timeout(self._connection_timeout)
+        conn.set_recv_buffer_size(self._recv_buffer_size)
+        conn.set_compression(self._compress_level, self._compress_min_size)
         return conn
 
     def _open_connection(self):
@@ -206,15 +319,40 @@ class MySQLConnection(MySQLConnectionAbstract):
         self._protocol = MySQLProtocol()
         self._socket = self._get_connection()
         self._socket.open_connection()
+        self._session_changed = True
+        self._session_tracking = False
+        self._session_cache.clear()
+        self._session_cache_tracked = False
         self._do_handshake()
         self._do_auth(self._user, self._password,
                       self._database, self._client_flags, self._charset_id,
                       self._ssl)
         self.set_converter_class(self._converter_class)
-        if self._client_flags & ClientFlag.COMPRESS:
+        self._prepared_statements = PreparedStatementCache(
+            self._prepared_cache_size)
+        if self._client_flags & ClientFlag.ZSTD_COMPRESSION_ALGORITHM:
+            self._socket.set_compression_algorithm(
+                'zstd', self._zstd_compression_level)
+        if self._client_flags & (ClientFlag.COMPRESS |
+                                 ClientFlag.ZSTD_COMPRESSION_ALGORITHM):
             self._socket.recv = self._socket.recv_compressed
             self._socket.send = self._socket.send_compressed
 
+    def _post_connection(self):
+        """Executes commands after connection has been established
+
+        Besides the settings done for all connections, this makes the
+        MySQL server report changes of the current database, time zone
+        and autocommit when it tracks session state, so their cached
+        values are kept up to date without relying on the defaults of
+        the session_track_schema and session_track_system_variables
+        variables.
+        """
+        super(MySQLConnection, self)._post_connection()
+        if self._have_session_tracking():
+            self.cmd_query("SET " + ", ".join(_SESSION_TRACK_VARIABLES))
+            self._session_cache_tracked = True
+
     def shutdown(self):
         """Shut down connection to MySQL Server.
         """
@@ -231,6 +369,7 @@ class MySQLConnection(MySQLConnectionAbstract):
         if not self._socket:
             return
 
+        self._prepared_statements = None
         try:
             self.cmd_quit()
             self._socket.close_connection()
@@ -257,6 +396,15 @@ class MySQLConnection(MySQLConnectionAbstract):
         """
         self.handle_unread_result()
 
+        if command not in _STATELESS_COMMANDS:
+            if not (self._session_tracking and command in _TRACKED_COMMANDS):
+                self._session_changed = True
+            if self._session_cache_tracked:
+                # Other cached values are updated from OK packets
+                self._session_cache.pop('sql_mode', None)
+            else:
+                self._session_cache.clear()
+
         try:
             self._socket.send(
                 self._protocol.make_command(command, packet or argument),
@@ -268,6 +416,15 @@ class MySQLConnection(MySQLConnectionAbstract):
             return None
         return self._socket.recv()
 
+    def _local_infile_packet_size(self):
+        """Get the size of packets sending LOCAL INFILE data
+
+        Packets are as big as the server's max_allowed_packet allows when it
+        is known, otherwise 1 MB.
+        """
+        size = (self._max_allowed_packet or 1048576) - 16
+        return min(size, MAX_PACKET_LENGTH - 1)
+
     def _send_data(self, data_file, send_empty_packet=False):
         """Send data to the MySQL server
 
@@ -278,16 +435,60 @@ class MySQLConnection(MySQLConnectionAbstract):
 
         Returns a MySQL packet.
         """
-        self.handle_unread_result()
-
         if not hasattr(data_file, 'read'):
             raise ValueError("expecting a file-like object")
 
-        try:
-            buf = data_file.read(NET_BUFFER_LENGTH - 16)
+        size = self._local_infile_packet_size()
+
+        def read_chunks():
+            """Read the file in chunks of the packet size"""
+            buf = data_file.read(size)
             while buf:
-                self._socket.send(buf)
-                buf = data_file.read(NET_BUFFER_LENGTH - 16)
+                yield buf
+                buf = data_file.read(size)
+
+        return self._send_chunks(read_chunks(), send_empty_packet)
+
+    def _send_chunks(self, chunks, send_empty_packet=False):
+        """Send data given as chunks of bytes to the MySQL server
+
+        Chunks are gathered so that the data is sent in packets of the
+        size returned by _local_infile_packet_size(). When getting the
+        chunks fails, the data gathered so far is dropped and the error is
+        raised once the MySQL server has replied. Data sent before that is
+        still loaded by the MySQL server.
+
+        Returns a MySQL packet.
+        """
+        self.handle_unread_result()
+
+        size = self._local_infile_packet_size()
+        pending = bytearray(b'')
+        chunks = iter(chunks)
+        failure = None
+        try:
+            while True:
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                except Exception:  # pylint: disable=W0703
+                    # Stop sending, but keep the protocol in sync
+                    failure = sys.exc_info()
+                    pending = None
+                    break
+                if not pending and len(chunk) == size:
+                    self._socket.send(chunk)
+                    continue
+                pending += chunk
+                if len(pending) >= size:
+                    offset = 0
+                    while len(pending) - offset >= size:
+                        self._socket.send(pending[offset:offset + size])
+                        offset += size
+                    del pending[0:offset]
+            if pending:
+                self._socket.send(pending)
         except AttributeError:
             raise errors.OperationalError("MySQL Connection not available.")
 
@@ -298,18 +499,39 @@ class MySQLConnection(MySQLConnectionAbstract):
                 raise errors.OperationalError(
                     "MySQL Connection not available.")
 
-        return self._socket.recv()
+        packet = self._socket.recv()
+        if failure is not None:
+            reraise(failure)
+        return packet
+
+    def _have_session_tracking(self):
+        """Return whether the MySQL server reports session state changes
+
+        The MySQL server must be 5.7.4 or later and both server and client
+        must use the CLIENT_SESSION_TRACK capability. Which changes are
+        reported is set by _post_connection().
+        """
+        return bool(self._handshake
+                    and self._client_flags & ClientFlag.SESSION_TRACK
+                    and self._handshake['capabilities']
+                    & ClientFlag.SESSION_TRACK
+                    and self._server_version >= (5, 7, 4))
 
     def _handle_server_status(self, flags):
         """Handle the server flags found in MySQL packets
 
         This method handles the server flags send by MySQL OK and EOF
         packets. It, for example, checks whether there exists more result
-        sets or whether there is an ongoing transaction.
+        sets or whether there is an ongoing transaction. A transaction or
+        a change reported by session state tracking marks the session as
+        changed.
         """
         self._have_next_result = flag_is_set(ServerFlag.MORE_RESULTS_EXISTS,
                                              flags)
         self._in_transaction = flag_is_set(ServerFlag.STATUS_IN_TRANS, flags)
+        if self._in_transaction or flag_is_set(
+                ServerFlag.SESSION_STATE_CHANGED, flags):
+            self._session_changed = True
 
     @property
     def in_transaction(self):
@@ -328,6 +550,8 @@ class MySQLConnection(MySQLConnectionAbstract):
         if packet[4] == 0:
             ok_pkt = self._protocol.parse_ok(packet)
             self._handle_server_status(ok_pkt['status_flag'])
+            if 'session_state' in ok_pkt:
+                self._handle_session_state(ok_pkt['session_state'])
             return ok_pkt
         elif packet[4] == 255:
             raise errors.get_exception(packet)
@@ -350,22 +574,73 @@ class MySQLConnection(MySQLConnectionAbstract):
             raise errors.get_exception(packet)
         raise errors.InterfaceError('Expected EOF packet')
 
+    def set_local_infile_handler(self, handler=None):
+        """Set the handler for LOAD DATA LOCAL INFILE requests
+
+        The handler is called with the file name requested by the MySQL
+        server. It returns either a file-like object opened in binary mode,
+        which is closed once read, or an iterable of bytes. Raising IOError
+        refuses the request. The file names are checked against the
+        allow_local_infile_in_path option before calling the handler.
+
+        Setting handler to None restores the default, which opens the file.
+        """
+        self._local_infile_handler = handler
+
+    def _local_infile_allowed(self, filename):
+        """Check whether LOAD DATA LOCAL INFILE may read filename"""
+        if self._allow_local_infile_in_path is None:
+            return True
+        path = os.path.realpath(filename)
+        for allowed in self._allow_local_infile_in_path:
+            if path == allowed or path.startswith(os.path.join(allowed, '')):
+                return True
+        return False
+
+    def _refuse_load_data_infile(self, message):
+        """Cancel a LOAD DATA INFILE LOCAL request"""
+        # Send an empty packet to cancel the operation
+        try:
+            self._socket.send(b'')
+            self._socket.recv()
+        except AttributeError:
+            raise errors.OperationalError(
+                "MySQL Connection not available.")
+        raise errors.InterfaceError(message)
+
     def _handle_load_data_infile(self, filename):
-        """Handle a LOAD DATA INFILE LOCAL request"""
+        """Handle a LOAD DATA INFILE LOCAL request
+
+        Rows streamed by MySQLCursor.load_data() are registered under a
+        generated file name. Other files are checked against the allowed
+        paths and read using the local infile handler.
+        """
+        data = self._local_infile_streams.get(filename)
+        if data is not None:
+            return self._handle_ok(self._send_chunks(data,
+                                                     send_empty_packet=True))
+
+        if not self._local_infile_allowed(filename):
+            self._refuse_load_data_infile(
+                "File '{0}' is not in a path allowed by "
+                "allow_local_infile_in_path".format(filename))
         try:
-            data_file = open(filename, 'rb')
+            if self._local_infile_handler:
+                data = self._local_infile_handler(filename)
+            else:
+                data = open(filename, 'rb')
         except IOError:
-            # Send a empty packet to cancel the operation
-            try:
-                self._socket.send(b'')
-            except AttributeError:
-                raise errors.OperationalError(
-                    "MySQL Connection not available.")
-            raise errors.InterfaceError(
+            self._refuse_load_data_infile(
                 "File '{0}' could not be read".format(filename))
 
-        return self._handle_ok(self._send_data(data_file,
-                                               send_empty_packet=True))
+        if not hasattr(data, 'read'):
+            return self._handle_ok(self._send_chunks(data,
+                                                     send_empty_packet=True))
+        try:
+            return self._handle_ok(self._send_data(data,
+                                                   send_empty_packet=True))
+        finally:
+            data.close()
 
     def _handle_result(self, packet):
         """Handle a MySQL Result
@@ -656,6 +931,10 @@ class MySQLConnection(MySQLConnectionAbstract):
         self._socket.send(packet, 0, 0)
 
         ok_packet = self._auth_switch_request(username, password)
+        self._prepared_statements = PreparedStatementCache(
+            self._prepared_cache_size)
+        self._session_cache.clear()
+        self._session_cache_tracked = False
 
         try:
             if not (self._client_flags & ClientFlag.CONNECT_WITH_DB) \
@@ -672,7 +951,7 @@ class MySQLConnection(MySQLConnectionAbstract):
     @property
     def database(self):
         """Get the current database"""
-        return self.info_query("SELECT DATABASE()")[0]
+        return self._info_cached('database', "SELECT DATABASE()")
 
     @database.setter
     def database(self, value):  # pylint: disable=W0221
@@ -694,7 +973,8 @@ class MySQLConnection(MySQLConnectionAbstract):
             return False  # This method does not raise
         return True
 
-    def reset_session(self, user_variables=None, session_variables=None):
+    def reset_session(self, user_variables=None, session_variables=None,
+                      lazy=False):
         """Clears the current active session
 
         This method resets the session state, if the MySQL server is 5.7.3
@@ -705,27 +985,55 @@ class MySQLConnection(MySQLConnectionAbstract):
         be set after clearing the session. This is possible for both user
         defined variables and session variables.
         This method takes two arguments user_variables and session_variables
-        which are dictionaries.
+        which are dictionaries. The variables are set using a single SET
+        statement.
+
+        When lazy is True, the session is only reset when it might have
+        changed since it was last reset, or when results were not read
+        completely. Without session state tracking,
+        any command other than COM_PING, COM_STATISTICS or COM_STMT_FETCH
+        counts as a change. When the connection uses the
+        ClientFlag.SESSION_TRACK capability, resetting enables the
+        session_track_state_change variable and queries only count as a
+        change when the MySQL server reports one.
 
         Raises OperationalError if not connected, InternalError if there are
         unread results and InterfaceError on errors.
         """
+        if lazy and not (self._session_changed or self.unread_result
+                         or self._have_next_result):
+            return
+
+        self.handle_unread_result()
         if not self.is_connected():
             raise errors.OperationalError("MySQL Connection not available.")
 
+        self._session_tracking = False
         try:
             self.cmd_reset_connection()
         except errors.NotSupportedError:
             self.cmd_change_user(self._user, self._password,
                                  self._database, self._charset_id)
 
-        cur = self.cursor()
+        tracking = self._have_session_tracking()
+        variables = []
+        params = []
         if user_variables:
             for key, value in user_variables.items():
-                cur.execute("SET @`{0}` = %s".format(key), (value,))
+                variables.append("@`{0}` = %s".format(key))
+                params.append(value)
         if session_variables:
             for key, value in session_variables.items():
-                cur.execute("SET SESSION `{0}` = %s".format(key), (value,))
+                variables.append("SESSION `{0}` = %s".format(key))
+                params.append(value)
+        if tracking:
+            variables.append("SESSION session_track_state_change = ON")
+        if variables:
+            self.cursor().execute("SET " + ", ".join(variables),
+                                  params or None)
+
+        self._session_tracking = tracking
+        self._session_changed = False
 
     def reconnect(self, attempts=1, delay=0):
         """Attempt to reconnect to the MySQL server
@@ -962,8 +1270,52 @@ class MySQLConnection(MySQLConnectionAbstract):
 
         return result
 
-    def cmd_stmt_execute(self, statement_id, data=(), parameters=(), flags=0):
-        """Execute a prepared MySQL statement"""
+    def get_prepared_statement(self, statement):
+        """Returns a prepared statement for the given SQL statement
+
+        The prepared statement is taken from the cache of the connection
+        when available, otherwise the statement is prepared using
+        cmd_stmt_prepare(). Statements are cached using their SQL text
+        without leading and trailing whitespace. The prepared statement
+        should be given back using release_prepared_statement().
+
+        Returns a dict()
+        """
+        key = statement.strip()
+        prepared = None
+        if self._prepared_statements is not None:
+            prepared = self._prepared_statements.get(key)
+        if prepared is None:
+            prepared = self.cmd_stmt_prepare(statement)
+            if self._prepared_statements is not None:
+                self._prepared_statements.add(key, prepared)
+        return prepared
+
+    def release_prepared_statement(self, prepared):
+        """Give back a prepared statement got from get_prepared_statement()
+
+        The prepared statement is put back into the cache of the
+        connection. Prepared statements which do not fit in the cache are
+        deallocated using cmd_stmt_close().
+        """
+        if self._prepared_statements is None:
+            return
+        for stmt in self._prepared_statements.release(prepared):
+            try:
+                self.cmd_stmt_close(stmt['statement_id'])
+            except errors.Error:
+                # We tried to deallocate, but it's OK when we fail.
+                pass
+
+    def cmd_stmt_execute(self, statement_id, data=(), parameters=(), flags=0,
+                         bound_types=None):
+        """Execute a prepared MySQL statement
+
+        The bound_types argument is a list of the parameter types sent with
+        the previous execution of the statement. When the types did not
+        change, they are not sent again. See
+        MySQLProtocol.make_stmt_execute().
+        """
         parameters = list(parameters)
         long_data_used = {}
 
@@ -981,11 +1333,66 @@ class MySQLConnection(MySQLConnectionAbstract):
 
         execute_packet = self._protocol.make_stmt_execute(
             statement_id, data, tuple(parameters), flags,
-            long_data_used, self.charset)
+            long_data_used, self.charset, bound_types)
         packet = self._send_cmd(ServerCmd.STMT_EXECUTE, packet=execute_packet)
         result = self._handle_binary_result(packet)
         return result
 
+    def cmd_stmt_execute_many(self, statement_id, seq_data, parameters=(),
+                              flags=0, bound_types=None):
+        """Execute a prepared MySQL statement for each set of data
+
+        All execute commands are sent to the MySQL server before reading
+        the responses, so the statement is executed many times using a
+        single round trip. The MySQL server executes all commands, even
+        when some of them fail. The statement should not return a result
+        set and data can not be sent as long data.
+
+        Since responses are only read after sending all commands, the
+        number of sets of data should be kept reasonably small.
+
+        Returns a list with, for each set of data, a dict() with the OK
+        packet information or the errors.Error for the failed execution.
+        """
+        parameters = tuple(parameters)
+        try:
+            packets = [
+                self._protocol.make_stmt_execute(
+                    statement_id, data, parameters, flags, None,
+                    self.charset, bound_types)
+                for data in seq_data]
+        except:
+            # Types were not sent to the MySQL server
+            if bound_types is not None:
+                del bound_types[:]
+            raise
+
+        for packet in packets:
+            self._send_cmd(ServerCmd.STMT_EXECUTE, packet=packet,
+                           expect_response=False)
+
+        results = []
+        for _ in packets:
+            packet = self._socket.recv()
+            if packet[4] == 255:
+                results.append(errors.get_exception(packet))
+            else:
+                results.append(self._handle_ok(packet))
+        return results
+
+    def cmd_stmt_fetch(self, statement_id, rows=1):
+        """Fetch rows from the cursor of a prepared MySQL statement
+
+        This method sends the FETCH command to MySQL asking for the given
+        number of rows of the cursor opened when executing the statement.
+        The rows are read afterwards using get_rows(), until the EOF
+        packet. When the status of the EOF packet has
+        SERVER_STATUS_LAST_ROW_SENT set, the cursor has no more rows.
+        """
+        packet = self._protocol.make_stmt_fetch(statement_id, rows)
+        self._send_cmd(ServerCmd.STMT_FETCH, packet, expect_response=False)
+        self.unread_result = True
+
     def cmd_stmt_close(self, statement_id):
         """Deallocate a prepared MySQL statement
 
@@ -1054,6 +1461,10 @@ class MySQLConnection(MySQLConnectionAbstract):
                                            "earlier does not support "
                                            "COM_RESET_CONNECTION.")
         self._handle_ok(self._send_cmd(ServerCmd.RESET_CONNECTION))
+        self._prepared_statements = PreparedStatementCache(
+            self._prepared_cache_size)
+        self._session_cache.clear()
+        self._session_cache_tracked = False
         self._post_connection()
 
     def handle_unread_result(self):
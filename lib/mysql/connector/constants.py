@@ -64,10 +64,21 @@ DEFAULT_CONFIGURATION = {
     'force_ipv6': False,
     'auth_plugin': None,
     'allow_local_infile': True,
+    'allow_local_infile_in_path': None,
     'consume_results': False,
+    'recv_buffer_size': None,
+    'prepared_cache_size': 0,
+    'max_batch_size': 0,
+    'compress_level': None,
+    'compress_min_size': None,
+    'compression_algorithms': None,
+    'zstd_compression_level': None,
 }
 
-CNX_POOL_ARGS = ('pool_name', 'pool_size', 'pool_reset_session')
+CNX_POOL_ARGS = ('pool_name', 'pool_size', 'pool_reset_session',
+                 'pool_timeout', 'pool_min_size', 'pool_max_size',
+                 'pool_idle_timeout', 'pool_max_lifetime', 'pool_validation',
+                 'pool_validation_interval')
 CNX_FABRIC_ARGS = ['fabric_host', 'fabric_username', 'fabric_password',
                    'fabric_port', 'fabric_connect_attempts',
                    'fabric_connect_delay', 'fabric_report_errors',
@@ -398,8 +409,10 @@ class ClientFlag(_Flags):
     CONNECT_ARGS = 1 << 20
     PLUGIN_AUTH_LENENC_CLIENT_DATA = 1 << 21
     CAN_HANDLE_EXPIRED_PASSWORDS = 1 << 22
-    SESION_TRACK = 1 << 23
+    SESSION_TRACK = 1 << 23
+    SESION_TRACK = SESSION_TRACK  # Misspelled name kept for compatibility
     DEPRECATE_EOF = 1 << 24
+    ZSTD_COMPRESSION_ALGORITHM = 1 << 26
     SSL_VERIFY_SERVER_CERT = 1 << 30
     REMEMBER_OPTIONS = 1 << 31
 
@@ -428,8 +441,10 @@ class ClientFlag(_Flags):
         'PLUGIN_AUTH_LENENC_CLIENT_DATA': (1 << 21,
                                            'Enable authentication response packet to be larger than 255 bytes'),
         'CAN_HANDLE_EXPIRED_PASSWORDS': (1 << 22, "Don't close the connection for a connection with expired password"),
-        'SESION_TRACK': (1 << 23, 'Capable of handling server state change information'),
+        'SESSION_TRACK': (1 << 23, 'Capable of handling server state change information'),
         'DEPRECATE_EOF': (1 << 24, 'Client no longer needs EOF packet'),
+        'ZSTD_COMPRESSION_ALGORITHM': (1 << 26,
+                                       'Can use zstd protocol compression'),
         'SSL_VERIFY_SERVER_CERT': (1 << 30, ''),
         'REMEMBER_OPTIONS': (1 << 31, ''),
     }
@@ -444,6 +459,7 @@ class ClientFlag(_Flags):
         MULTI_STATEMENTS,
         MULTI_RESULTS,
         LOCAL_FILES,
+        SESSION_TRACK,
     ]
 
     @classmethod
@@ -472,6 +488,7 @@ class ServerFlag(_Flags):
     STATUS_LAST_ROW_SENT = 1 << 7
     STATUS_DB_DROPPED = 1 << 8
     STATUS_NO_BACKSLASH_ESCAPES = 1 << 9
+    SESSION_STATE_CHANGED = 1 << 14
 
     desc = {
         'SERVER_STATUS_IN_TRANS': (1 << 0,
@@ -487,6 +504,53 @@ class ServerFlag(_Flags):
         'SERVER_STATUS_LAST_ROW_SENT': (1 << 7, ''),
         'SERVER_STATUS_DB_DROPPED': (1 << 8, 'A database was dropped'),
         'SERVER_STATUS_NO_BACKSLASH_ESCAPES': (1 << 9, ''),
+        'SERVER_SESSION_STATE_CHANGED': (1 << 14,
+                                         'Session state has changed'),
+    }
+
+
+class CursorType(_Constants):
+    """MySQL Cursor types
+
+    Cursor types used when executing a prepared statement with the
+    COM_STMT_EXECUTE server command.
+    """
+    _prefix = 'CURSOR_TYPE_'
+    NO_CURSOR = 0
+    READ_ONLY = 1 << 0
+    FOR_UPDATE = 1 << 1
+    SCROLLABLE = 1 << 2
+
+    desc = {
+        'CURSOR_TYPE_NO_CURSOR': (0, 'No cursor is opened'),
+        'CURSOR_TYPE_READ_ONLY': (1 << 0, 'Read-only cursor'),
+        'CURSOR_TYPE_FOR_UPDATE': (1 << 1, 'Cursor for update'),
+        'CURSOR_TYPE_SCROLLABLE': (1 << 2, 'Scrollable cursor'),
+    }
+
+
+class SessionStateType(_Constants):
+    """MySQL session state change types
+
+    Types of the session state changes found in OK packets when the
+    CLIENT_SESSION_TRACK capability is used.
+    """
+    _prefix = 'SESSION_TRACK_'
+    SYSTEM_VARIABLES = 0
+    SCHEMA = 1
+    STATE_CHANGE = 2
+    GTIDS = 3
+    TRANSACTION_CHARACTERISTICS = 4
+    TRANSACTION_STATE = 5
+
+    desc = {
+        'SESSION_TRACK_SYSTEM_VARIABLES': (0, 'System variable changed'),
+        'SESSION_TRACK_SCHEMA': (1, 'Current schema changed'),
+        'SESSION_TRACK_STATE_CHANGE': (2, 'Session state changed'),
+        'SESSION_TRACK_GTIDS': (3, 'GTIDs of the transaction'),
+        'SESSION_TRACK_TRANSACTION_CHARACTERISTICS': (
+            4, 'Transaction characteristics'),
+        'SESSION_TRACK_TRANSACTION_STATE': (5, 'Transaction state'),
     }
 
 
@@ -33,6 +33,11 @@ from .catch23 import PY2, NUMERIC_TYPES, struct_unpack
 from .custom_types import HexLiteral
 
 
+def _func(method):
+    """Returns the function implementing the given method"""
+    return getattr(method, '__func__', method)
+
+
 class MySQLConverterBase(object):
     """Base class for conversion classes
 
@@ -419,6 +424,149 @@ class MySQLConverter(MySQLConverterBase):
 
         return tuple(result)
 
+    def row_decoder(self, fields):
+        """Returns a function converting rows of a text result set
+
+        The converter of each column is looked up once using the field
+        type information in the fields argument, instead of for every value
+        of every row as row_to_python() does. Result sets containing only
+        integer, decimal or plain string columns are converted using a
+        simpler loop.
+
+        The returned function takes a row as argument and returns a tuple.
+        """
+        if (_func(type(self).row_to_python) is not
+                _func(MySQLConverter.row_to_python)):
+            # Conversion of rows was changed by a subclass
+            def decode_overridden(row):
+                """Convert a row using row_to_python()"""
+                return self.row_to_python(row, fields)
+            return decode_overridden
+
+        converters = []
+        kinds = set()
+        for field in fields:
+            func = self._field_converter(field)
+            converters.append((func, field))
+            kinds.add(self._converter_kind(func, field))
+        converters = tuple(converters)
+        charset = self.charset
+
+        if kinds == set(['int']):
+            def decode_int(row):
+                """Convert a row containing only integers"""
+                return tuple([None if value is None else int(value)
+                              for value in row])
+            return decode_int
+        elif kinds == set(['decimal']):
+            def decode_decimal(row):
+                """Convert a row containing only decimals"""
+                return tuple([None if value is None
+                              else Decimal(value.decode(charset))
+                              for value in row])
+            return decode_decimal
+        elif kinds == set(['str']):
+            def decode_str(row):
+                """Convert a row containing only strings"""
+                return tuple([None if value is None
+                              else value.decode(charset)
+                              for value in row])
+            return decode_str
+
+        def decode(row):
+            """Convert a row using the converter of each column"""
+            return tuple([None if value is None else func(value, field)
+                          for value, (func, field) in zip(row, converters)])
+        return decode
+
+    def column_decoder(self, field):
+        """Returns a function converting values of a text result set column
+
+        This is the column oriented counterpart of row_decoder(): the
+        converter is looked up once for the column described by field.
+
+        The returned function takes a sequence of values and returns a list.
+        """
+        if (_func(type(self).row_to_python) is not
+                _func(MySQLConverter.row_to_python)):
+            # Conversion of rows was changed by a subclass
+            def decode_overridden(values):
+                """Convert values using row_to_python()"""
+                return [self.row_to_python((value,), (field,))[0]
+                        for value in values]
+            return decode_overridden
+
+        func = self._field_converter(field)
+        kind = self._converter_kind(func, field)
+        charset = self.charset
+
+        if kind == 'int':
+            def decode_int(values):
+                """Convert integer values"""
+                return [None if value is None else int(value)
+                        for value in values]
+            return decode_int
+        elif kind == 'decimal':
+            def decode_decimal(values):
+                """Convert decimal values"""
+                return [None if value is None
+                        else Decimal(value.decode(charset))
+                        for value in values]
+            return decode_decimal
+        elif kind == 'str':
+            def decode_str(values):
+                """Convert string values"""
+                return [None if value is None else value.decode(charset)
+                        for value in values]
+            return decode_str
+
+        def decode(values):
+            """Convert values using the converter of the column"""
+            return [None if value is None else func(value, field)
+                    for value in values]
+        return decode
+
+    def _field_converter(self, field):
+        """Returns the method converting values of the given column"""
+        if not self._cache_field_types:
+            self._cache_field_types = {}
+            for name, info in FieldType.desc.items():
+                try:
+                    self._cache_field_types[info[0]] = getattr(
+                        self, '_{0}_to_python'.format(name))
+                except AttributeError:
+                    # We ignore field types which has no method
+                    pass
+
+        try:
+            return self._cache_field_types[field[1]]
+        except KeyError:
+            return self._unknown_to_python
+
+    def _converter_kind(self, func, field):
+        """Returns which fast path can be used for converting a column
+
+        Returns 'int', 'decimal', 'str' or None when the column has to be
+        converted calling func.
+        """
+        func = _func(func)
+        if func is _func(MySQLConverter._INT_to_python) and not PY2:
+            return 'int'
+        elif func is _func(MySQLConverter._DECIMAL_to_python):
+            return 'decimal'
+        elif (func is _func(MySQLConverter._STRING_to_python)
+              and not field[7] & (FieldFlag.SET | FieldFlag.BINARY)
+              and self.charset != 'binary' and self.use_unicode):
+            return 'str'
+        return None
+
+    def _unknown_to_python(self, value, desc=None):
+        """Returns values of types without converter as str if possible"""
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return value
+
     def _FLOAT_to_python(self, value, desc=None):  # pylint: disable=C0103
         """
         Returns value as float type.
@@ -25,13 +25,27 @@
 """
 
 from collections import namedtuple
+from io import IOBase
 import re
 import weakref
 
-from . import errors
+from . import columnar, errors
 from .abstracts import MySQLCursorAbstract
 from .catch23 import PY2
-
+from .constants import CursorType, ServerFlag
+
+RE_SQL_TOKEN = re.compile(
+    r'''
+    (?P<space>\s+)
+    |(?P<comment>/\*.*?\*/|--(?:\s[^\n]*|$)|\#[^\n]*)
+    |(?P<quoted>'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`(?:[^`]|``)*`)
+    |(?P<param>%(?:\([^)]*\))?s)
+    |(?P<punct>[(),;])
+    |(?P<word>[^\s(),;'"`%/\#-]+|.)
+    ''',
+    re.X | re.S)
+# Not used by the cursors anymore, which parse statements using
+# RE_SQL_TOKEN; kept for backward compatibility
 SQL_COMMENT = r"\/\*.*?\*\/"
 RE_SQL_COMMENT = re.compile(
     r'''({0})|(["'`][^"'`]*?({0})[^"'`]*?["'`])'''.format(SQL_COMMENT),
@@ -60,6 +74,13 @@ RE_SQL_FIND_PARAM = re.compile(
 
 ERR_NO_RESULT_TO_FETCH = "No result set to fetch from"
 
+LOAD_DATA_FORMATS = {
+    'tsv': (b'', b'\t', "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                      "LINES TERMINATED BY '\\n'"),
+    'csv': (b'"', b',', "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                        "ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'"),
+}
+
 
 class _ParamSubstitutor(object):
     """
@@ -114,6 +135,134 @@ def _bytestr_format_dict(bytestr, value_dict):
                                    if PY2 else bytestr)
 
 
+def _first_keyword(operation):
+    """Return the first keyword of a statement in upper case
+
+    Leading comments are skipped. Returns None when the statement does
+    not start with a keyword.
+
+    >>> _first_keyword("/* c */ call p1()")
+    'CALL'
+    """
+    if isinstance(operation, (bytes, bytearray)):
+        operation = operation.decode('utf-8', 'replace')
+    for match in RE_SQL_TOKEN.finditer(operation):
+        if match.lastgroup == 'word':
+            return match.group().upper()
+        if match.lastgroup not in ('space', 'comment'):
+            break
+    return None
+
+
+def _split_batch_insert(operation):
+    """Split an INSERT or REPLACE statement for multi-row batching
+
+    The statement is tokenized so that comments, quoted strings and
+    quoted identifiers are skipped reliably. Statements using IGNORE,
+    ON DUPLICATE KEY UPDATE or a row alias are supported as long as
+    parameters are only used within the VALUES rows.
+
+    Returns a tuple (prefix, rows, suffix) of strings, rows being the
+    VALUES list which is repeated for each set of parameters, or None
+    when the statement can not be batched.
+
+    >>> _split_batch_insert("REPLACE INTO t1 VALUES (%s, %s)")
+    ('REPLACE INTO t1 VALUES ', '(%s, %s)', '')
+    """
+    tokens = [(match.lastgroup, match.group(), match.start(), match.end())
+              for match in RE_SQL_TOKEN.finditer(operation)
+              if match.lastgroup not in ('space', 'comment')]
+
+    def keyword(index):
+        """Return the upper case word at index or None"""
+        if index < len(tokens) and tokens[index][0] == 'word':
+            return tokens[index][1].upper()
+        return None
+
+    def punct(index):
+        """Return the punctuation at index or None"""
+        if index < len(tokens) and tokens[index][0] == 'punct':
+            return tokens[index][1]
+        return None
+
+    if keyword(0) not in ('INSERT', 'REPLACE'):
+        return None
+    pos = 1
+    while keyword(pos) in ('LOW_PRIORITY', 'DELAYED', 'HIGH_PRIORITY',
+                           'IGNORE', 'INTO'):
+        pos += 1
+
+    # Table name, partitions and columns up to VALUES
+    depth = 0
+    while pos < len(tokens):
+        if tokens[pos][0] == 'param':
+            return None
+        if punct(pos) == '(':
+            depth += 1
+        elif punct(pos) == ')':
+            depth -= 1
+        elif depth == 0 and keyword(pos) in ('VALUES', 'VALUE'):
+            break
+        elif depth == 0 and keyword(pos) in ('SELECT', 'SET', 'TABLE',
+                                             'WITH', 'ON'):
+            return None
+        pos += 1
+    pos += 1
+    if punct(pos) != '(':
+        return None
+
+    # Rows enclosed in parentheses, separated by commas
+    start = tokens[pos][2]
+    end = None
+    while pos < len(tokens):
+        if punct(pos) == '(':
+            depth += 1
+        elif punct(pos) == ')':
+            depth -= 1
+            if depth == 0:
+                end = tokens[pos][3]
+                if punct(pos + 1) != ',' or punct(pos + 2) != '(':
+                    pos += 1
+                    break
+                pos += 1
+        pos += 1
+    if end is None or depth != 0:
+        return None
+
+    rest = tokens[pos:]
+    if rest and keyword(pos) not in ('ON', 'AS') and not (
+            punct(pos) == ';' and len(rest) == 1):
+        return None
+    if any(token[0] == 'param' for token in rest):
+        return None
+    return operation[:start], operation[start:end], operation[end:]
+
+
+def _batch_insert_chunks(prefix, values, suffix, max_size):
+    """Join rows into multi-row INSERT statements of limited size
+
+    The VALUES rows, given by the iterable values, are placed between
+    prefix and suffix. A statement is yielded as soon as adding the next
+    row would make it larger than max_size bytes. A single row which is
+    larger than max_size is sent on its own and left for the server to
+    reject.
+
+    >>> list(_batch_insert_chunks(b'V ', [b'(1)', b'(2)', b'(3)'], b'', 10))
+    [b'V (1),(2)', b'V (3)']
+    """
+    rows = []
+    size = empty = len(prefix) + len(suffix)
+    for row in values:
+        if rows and size + len(row) + 1 > max_size:
+            yield prefix + b','.join(rows) + suffix
+            rows = []
+            size = empty
+        rows.append(row)
+        size += len(row) + 1
+    if rows:
+        yield prefix + b','.join(rows) + suffix
+
+
 class CursorBase(MySQLCursorAbstract):
     """
     Base for defining MySQLCursor. This class is a skeleton and defines
@@ -197,8 +346,12 @@ class CursorBase(MySQLCursorAbstract):
         stmt = "INSERT INTO employees (name, phone) VALUES ('%s','%s')"
         cursor.executemany(stmt, data)
 
-        INSERT statements are optimized by batching the data, that is
-        using the MySQL multiple rows syntax.
+        INSERT and REPLACE statements are optimized by batching the data,
+        that is using the MySQL multiple rows syntax. The rows are sent in as many
+        statements as needed to stay within the max_batch_size connection
+        option, by default the server's max_allowed_packet, and rowcount
+        is the total over all of them. Any iterable, including generators,
+        can be used as seq_params.
 
         Results are discarded. If they are needed, consider looping over
         data using the execute() method.
@@ -317,6 +470,7 @@ class MySQLCursor(CursorBase):
         self._executed = None
         self._executed_list = []
         self._binary = False
+        self._row_decoder = None
 
         if connection is not None:
             self._set_connection(connection)
@@ -344,6 +498,7 @@ class MySQLCursor(CursorBase):
         self._warnings = None
         self._warning_count = 0
         self._description = None
+        self._row_decoder = None
         self._executed = None
         self._executed_list = []
         self.reset()
@@ -465,6 +620,7 @@ class MySQLCursor(CursorBase):
         if 'columns' in result:
             # Weak test, must be column/eof information
             self._description = result['columns']
+            self._row_decoder = None
             self._connection.unread_result = True
             self._handle_resultset()
         elif 'affected_rows' in result:
@@ -497,6 +653,31 @@ class MySQLCursor(CursorBase):
 
             yield self
 
+    def _build_statement(self, operation, params=None):
+        """Encode the operation and substitute the parameters
+
+        Returns bytes.
+        """
+        try:
+            if not isinstance(operation, (bytes, bytearray)):
+                stmt = operation.encode(self._connection.python_charset)
+            else:
+                stmt = operation
+        except (UnicodeDecodeError, UnicodeEncodeError) as err:
+            raise errors.ProgrammingError(str(err))
+
+        if params is not None:
+            if isinstance(params, dict):
+                stmt = _bytestr_format_dict(
+                    stmt, self._process_params_dict(params))
+            elif isinstance(params, (list, tuple)):
+                psub = _ParamSubstitutor(self._process_params(params))
+                stmt = RE_PY_PARAM.sub(psub, stmt)
+                if psub.remaining != 0:
+                    raise errors.ProgrammingError(
+                        "Not all parameters were used in the SQL statement")
+        return stmt
+
     def execute(self, operation, params=None, multi=False):
         """Executes the given operation
 
@@ -524,26 +705,7 @@ class MySQLCursor(CursorBase):
         self._connection.handle_unread_result()
 
         self._reset_result()
-        stmt = ''
-
-        try:
-            if not isinstance(operation, (bytes, bytearray)):
-                stmt = operation.encode(self._connection.python_charset)
-            else:
-                stmt = operation
-        except (UnicodeDecodeError, UnicodeEncodeError) as err:
-            raise errors.ProgrammingError(str(err))
-
-        if params is not None:
-            if isinstance(params, dict):
-                stmt = _bytestr_format_dict(
-                    stmt, self._process_params_dict(params))
-            elif isinstance(params, (list, tuple)):
-                psub = _ParamSubstitutor(self._process_params(params))
-                stmt = RE_PY_PARAM.sub(psub, stmt)
-                if psub.remaining != 0:
-                    raise errors.ProgrammingError(
-                        "Not all parameters were used in the SQL statement")
+        stmt = self._build_statement(operation, params)
 
         self._executed = stmt
         if multi:
@@ -559,34 +721,107 @@ class MySQLCursor(CursorBase):
                 raise
             return None
 
-    def _batch_insert(self, operation, seq_params):
-        """Implements multi row insert"""
-        def remove_comments(match):
-            """Remove comments from INSERT statements.
-
-            This function is used while removing comments from INSERT
-            statements. If the matched string is a comment not enclosed
-            by quotes, it returns an empty string, else the string itself.
-            """
-            if match.group(1):
-                return ""
-            else:
-                return match.group(2)
+    def _load_data_rows(self, rows, enclose, separator):
+        """Generate rows in the LOAD DATA format"""
+        to_mysql = self._connection.converter.to_mysql
+        escape = self._connection.converter.escape
+        quote = self._connection.converter.quote
+        for row in rows:
+            fields = []
+            try:
+                for value in row:
+                    value = to_mysql(value)
+                    if value is None:
+                        fields.append(b'\\N')
+                    elif isinstance(value, (bytes, bytearray)):
+                        fields.append(enclose +
+                                      escape(value).replace(b'\t', b'\\t') +
+                                      enclose)
+                    else:
+                        fields.append(bytes(quote(value)))
+            except Exception as err:
+                raise errors.ProgrammingError(
+                    "Failed processing rows for LOAD DATA; {0}".format(err))
+            yield separator.join(fields) + b'\n'
+
+    def load_data(self, table, rows, columns=None, format='tsv'):
+        """Load rows into a table using LOAD DATA LOCAL INFILE
+
+        The rows, an iterable of sequences, are converted and escaped
+        like query parameters and streamed to the MySQL server while
+        the statement executes, without writing a file first. Values
+        which are None are loaded as NULL. The table and columns are
+        quoted as identifiers. The format is either 'tsv' or 'csv'.
+
+        When iterating the rows raises an error, no more data is sent
+        and the error is raised once the statement has finished. Rows
+        sent before the error are loaded anyway and, with autocommit,
+        committed; use a transaction to load all rows or none.
+
+        Example:
+          cursor.load_data('employees', rows, columns=('name', 'phone'))
+
+        Returns the number of rows loaded.
+        """
+        # pylint: disable=W0622
+        if not self._connection:
+            raise errors.ProgrammingError("Cursor is not connected")
+        try:
+            enclose, separator, clauses = LOAD_DATA_FORMATS[format]
+        except KeyError:
+            raise errors.ProgrammingError(
+                "Unsupported LOAD DATA format '{0}'".format(format))
 
-        tmp = re.sub(RE_SQL_ON_DUPLICATE, '',
-                     re.sub(RE_SQL_COMMENT, remove_comments, operation))
+        self._connection.handle_unread_result()
+        self._reset_result()
 
-        matches = re.search(RE_SQL_INSERT_VALUES, tmp)
-        if not matches:
-            raise errors.InterfaceError(
-                "Failed rewriting statement for multi-row INSERT. "
-                "Check SQL syntax."
-            )
-        fmt = matches.group(1).encode(self._connection.charset)
-        values = []
+        def quote_identifier(name):
+            """Quote an identifier using backticks"""
+            return '`{0}`'.format(name.replace('`', '``'))
+
+        filename = 'mysql-connector-python-rows-{0}'.format(id(rows))
+        stmt = "LOAD DATA LOCAL INFILE '{0}' INTO TABLE {1} " \
+               "CHARACTER SET {2} {3}".format(
+                   filename, '.'.join(
+                       [quote_identifier(part) for part in table.split('.')]),
+                   self._connection.charset, clauses)
+        if columns:
+            stmt += ' ({0})'.format(
+                ', '.join([quote_identifier(col) for col in columns]))
+
+        # Packets sent are as big as max_allowed_packet allows
+        self._connection.max_allowed_packet  # pylint: disable=W0104
+        streams = self._connection._local_infile_streams  # pylint: disable=W0212
+        streams[filename] = self._load_data_rows(rows, enclose, separator)
+        try:
+            self._executed = stmt.encode(self._connection.python_charset)
+            self._handle_result(self._connection.cmd_query(self._executed))
+        finally:
+            del streams[filename]
+        return self._rowcount
 
+    def _batch_insert(self, operation, seq_params):
+        """Implements multi row insert
+
+        Returns an iterator over the multi-row INSERT or REPLACE statements,
+        each of them no larger than the connection's max_batch_size, or None
+        when the statement can not be rewritten.
+        """
+        parts = _split_batch_insert(operation)
+        if parts is None:
+            return None
+        try:
+            prefix, fmt, suffix = [part.encode(self._connection.charset)
+                                   for part in parts]
+        except (UnicodeDecodeError, UnicodeEncodeError) as err:
+            raise errors.ProgrammingError(str(err))
+        return _batch_insert_chunks(
+            prefix, self._batch_insert_values(fmt, seq_params), suffix,
+            self._connection.max_batch_size)
+
+    def _batch_insert_values(self, fmt, seq_params):
+        """Generate the VALUES rows of a multi row insert"""
         try:
-            stmt = operation.encode(self._connection.charset)
             for params in seq_params:
                 tmp = fmt
                 if isinstance(params, dict):
@@ -598,15 +833,7 @@ class MySQLCursor(CursorBase):
                     if psub.remaining != 0:
                         raise errors.ProgrammingError(
                             "Not all parameters were used in the SQL statement")
-                    #for p in self._process_params(params):
-                    #    tmp = tmp.replace(b'%s',p,1)
-                values.append(tmp)
-            if fmt in stmt:
-                stmt = stmt.replace(fmt, b','.join(values), 1)
-                self._executed = stmt
-                return stmt
-            else:
-                return None
+                yield tmp
         except (UnicodeDecodeError, UnicodeEncodeError) as err:
             raise errors.ProgrammingError(str(err))
         except errors.Error:
@@ -631,8 +858,8 @@ class MySQLCursor(CursorBase):
         stmt = "INSERT INTO employees (name, phone) VALUES ('%s','%s)"
         cursor.executemany(stmt, data)
 
-        INSERT statements are optimized by batching the data, that is
-        using the MySQL multiple rows syntax.
+        INSERT and REPLACE statements are optimized by batching the data,
+        that is using the MySQL multiple rows syntax.
 
         Results are discarded. If they are needed, consider looping over
         data using the execute() method.
@@ -647,14 +874,15 @@ class MySQLCursor(CursorBase):
             raise errors.ProgrammingError(
                 "Parameters for query must be an Iterable.")
 
-        # Optimize INSERTs by batching them
-        if re.match(RE_SQL_INSERT_STMT, operation):
-            if not seq_params:
-                self._rowcount = 0
-                return
-            stmt = self._batch_insert(operation, seq_params)
-            if stmt is not None:
-                return self.execute(stmt)
+        # Optimize INSERT and REPLACE statements by batching them
+        stmts = self._batch_insert(operation, seq_params)
+        if stmts is not None:
+            rowcnt = 0
+            for stmt in stmts:
+                self.execute(stmt)
+                rowcnt += self._rowcount
+            self._rowcount = rowcnt
+            return None
 
         rowcnt = 0
         try:
@@ -813,6 +1041,27 @@ class MySQLCursor(CursorBase):
 
         return None
 
+    def _get_row_decoder(self):
+        """Returns a function converting rows of the current result set
+
+        The function is built once per result set by the converter of the
+        connection, using the column descriptions.
+
+        Returns a callable.
+        """
+        if self._row_decoder is None:
+            converter = self._connection.converter
+            description = self.description
+            try:
+                self._row_decoder = converter.row_decoder(description)
+            except AttributeError:
+                # Converter classes not based on MySQLConverter
+                def decode(row):
+                    """Convert a row using row_to_python()"""
+                    return converter.row_to_python(row, description)
+                self._row_decoder = decode
+        return self._row_decoder
+
     def _handle_warnings(self):
         """Handle possible warnings after all results are consumed"""
         if self._connection.get_warnings is True and self._warning_count:
@@ -866,8 +1115,7 @@ class MySQLCursor(CursorBase):
         row = self._fetch_row()
         if row:
             if hasattr(self._connection, 'converter'):
-                return self._connection.converter.row_to_python(
-                    row, self.description)
+                return self._get_row_decoder()(row)
             return row
         return None
 
@@ -889,8 +1137,8 @@ class MySQLCursor(CursorBase):
             rows.insert(0, self._nextrow[0])
 
         if hasattr(self._connection, 'converter'):
-            row_to_python = self._connection.converter.row_to_python
-            rows = [row_to_python(row, self.description) for row in rows]
+            decode = self._get_row_decoder()
+            rows = [decode(row) for row in rows]
 
         self._handle_eof(eof)
         rowcount = len(rows)
@@ -899,6 +1147,82 @@ class MySQLCursor(CursorBase):
         self._rowcount += rowcount
         return rows
 
+    def _fetch_row_batches(self, size):
+        """Returns the remaining rows of the result set in batches
+
+        Rows are read from the connection at most size at a time and are
+        returned as received, without converting them.
+
+        Returns an iterator over lists of rows.
+        """
+        if not self._have_unread_result():
+            raise errors.InterfaceError("No result set to fetch from.")
+
+        def read_batches():
+            """Read rows until the end of the result set"""
+            rows = []
+            if self._nextrow[0]:
+                rows.append(self._nextrow[0])
+                self._nextrow = (None, None)
+            eof = None
+            while eof is None:
+                (batch, eof) = self._connection.get_rows(
+                    count=size, binary=self._binary, columns=self.description)
+                rows.extend(batch)
+                if self._rowcount == -1:
+                    self._rowcount = 0
+                self._rowcount += len(rows)
+                if eof is not None:
+                    self._handle_eof(eof)
+                yield rows
+                rows = []
+        return read_batches()
+
+    def _column_decoders(self):
+        """Returns functions converting the columns of the result set
+
+        Returns None when rows are already converted while reading them,
+        which is the case for the binary protocol.
+        """
+        if self._binary or not hasattr(self._connection, 'converter'):
+            return None
+        return columnar.column_decoders(self._connection.converter,
+                                        self.description)
+
+    def fetch_columns(self):
+        """Returns the remaining rows of the result set as columns
+
+        Rows are read and converted in batches, one column at a time, so
+        the result set is not held both as rows and as columns.
+
+        Returns a list with a list of values for each column.
+        """
+        batches = self._fetch_row_batches(columnar.BATCH_SIZE)
+        decoders = None if self._raw else self._column_decoders()
+        collector = columnar.ColumnCollector(self.description, decoders)
+        for rows in batches:
+            collector.add_rows(rows)
+        return collector.columns()
+
+    def fetchall_numpy(self):
+        """Returns the remaining rows of the result set as NumPy arrays
+
+        Each column is returned as a numpy.ma.MaskedArray in which NULL
+        values are masked. Integer, floating point and temporal columns
+        use native NumPy data types, other columns contain Python objects.
+        Values are converted even when the cursor returns raw rows.
+
+        Raises errors.InterfaceError when NumPy is not available.
+
+        Returns a list with an array for each column.
+        """
+        batches = self._fetch_row_batches(columnar.BATCH_SIZE)
+        collector = columnar.NumPyColumnCollector(self.description,
+                                                  self._column_decoders())
+        for rows in batches:
+            collector.add_rows(rows)
+        return collector.columns()
+
     @property
     def column_names(self):
         """Returns column names
@@ -990,14 +1314,25 @@ class MySQLCursorBuffered(MySQLCursor):
             raise errors.InterfaceError("No result set to fetch from.")
         res = []
         if hasattr(self._connection, 'converter'):
-            for row in self._rows[self._next_row:]:
-                res.append(self._connection.converter.row_to_python(
-                    row, self.description))
+            decode = self._get_row_decoder()
+            res = [decode(row) for row in self._rows[self._next_row:]]
         else:
             res = self._rows[self._next_row:]
         self._next_row = len(self._rows)
         return res
 
+    def _fetch_row_batches(self, size):
+        """Returns the remaining buffered rows in batches
+
+        Returns an iterator over lists of rows.
+        """
+        if self._rows is None:
+            raise errors.InterfaceError("No result set to fetch from.")
+        start = self._next_row
+        self._next_row = len(self._rows)
+        return (self._rows[offset:offset + size]
+                for offset in range(start, self._next_row, size))
+
     def fetchmany(self, size=None):
         res = []
         cnt = (size or self.arraysize)
@@ -1068,6 +1403,9 @@ class MySQLCursorBufferedRaw(MySQLCursorBuffered):
 class MySQLCursorPrepared(MySQLCursor):
     """Cursor using MySQL Prepared Statements
     """
+
+    _cursor_type = CursorType.NO_CURSOR
+
     def __init__(self, connection=None):
         super(MySQLCursorPrepared, self).__init__(connection)
         self._rows = None
@@ -1075,6 +1413,7 @@ class MySQLCursorPrepared(MySQLCursor):
         self._prepared = None
         self._binary = True
         self._have_result = None
+        self.pipeline_size = 0
 
     def callproc(self, *args, **kwargs):
         """Calls a stored procedue
@@ -1086,18 +1425,29 @@ class MySQLCursorPrepared(MySQLCursor):
     def close(self):
         """Close the cursor
 
-        This method will try to deallocate the prepared statement and close
-        the cursor.
+        This method gives the prepared statement back to the connection,
+        which caches or deallocates it, and closes the cursor.
         """
         if self._prepared:
             try:
-                self._connection.cmd_stmt_close(self._prepared['statement_id'])
+                self._release_prepared()
             except errors.Error:
                 # We tried to deallocate, but it's OK when we fail.
                 pass
             self._prepared = None
         super(MySQLCursorPrepared, self).close()
 
+    def _release_prepared(self):
+        """Give the prepared statement back to the connection
+
+        When the result was not read completely, the statement is marked
+        so it is reset before it is executed again.
+        """
+        if self._have_unread_result():
+            self._prepared['reset_needed'] = True
+        self._connection.release_prepared_statement(self._prepared)
+        self._prepared = None
+
     def _row_to_python(self, rowdata, desc=None):
         """Convert row data from MySQL to Python types
 
@@ -1117,18 +1467,16 @@ class MySQLCursorPrepared(MySQLCursor):
             self._connection.unread_result = True
             self._have_result = True
 
-    def execute(self, operation, params=(), multi=False):  # multi is unused
-        """Prepare and execute a MySQL Prepared Statement
-
-        This method will preare the given operation and execute it using
-        the optionally given parameters.
+    def _prepare(self, operation):
+        """Prepare the operation unless it was prepared already
 
-        If the cursor instance already had a prepared statement, it is
-        first closed.
+        Prepared statements are got from the connection, which caches
+        them. If the cursor instance already had a prepared statement for
+        another operation, it is first given back to the connection.
         """
-        if operation is not self._executed:
+        if operation != self._executed:
             if self._prepared:
-                self._connection.cmd_stmt_close(self._prepared['statement_id'])
+                self._release_prepared()
 
             self._executed = operation
             try:
@@ -1142,27 +1490,91 @@ class MySQLCursorPrepared(MySQLCursor):
                 operation = re.sub(RE_SQL_FIND_PARAM, b'?', operation)
 
             try:
-                self._prepared = self._connection.cmd_stmt_prepare(operation)
+                self._prepared = self._connection.get_prepared_statement(
+                    operation)
             except errors.Error:
                 self._executed = None
                 raise
 
-        self._connection.cmd_stmt_reset(self._prepared['statement_id'])
+        if self._prepared.get('reset_needed') or self._have_unread_result():
+            # Discard long data and the cursor of an aborted fetch
+            self._connection.cmd_stmt_reset(self._prepared['statement_id'])
+            self._prepared['reset_needed'] = False
+            self._prepared['bound_types'] = []
 
-        if self._prepared['parameters'] and not params:
-            return
-        elif len(self._prepared['parameters']) != len(params):
+    def _check_params(self, params):
+        """Check the number of parameters"""
+        if len(self._prepared['parameters']) != len(params):
             raise errors.ProgrammingError(
                 errno=1210,
                 msg="Incorrect number of arguments " \
                     "executing prepared statement")
 
-        res = self._connection.cmd_stmt_execute(
-            self._prepared['statement_id'],
-            data=params,
-            parameters=self._prepared['parameters'])
+    def execute(self, operation, params=(), multi=False):  # multi is unused
+        """Prepare and execute a MySQL Prepared Statement
+
+        This method will preare the given operation and execute it using
+        the optionally given parameters.
+
+        Prepared statements are got from the connection, which caches
+        them. If the cursor instance already had a prepared statement for
+        another operation, it is first given back to the connection.
+        """
+        self._prepare(operation)
+
+        if self._prepared['parameters'] and not params:
+            return
+        self._check_params(params)
+
+        try:
+            res = self._connection.cmd_stmt_execute(
+                self._prepared['statement_id'],
+                data=params,
+                parameters=self._prepared['parameters'],
+                flags=self._cursor_type,
+                bound_types=self._prepared.setdefault('bound_types', []))
+        except errors.Error:
+            # Long data might have been sent before failing
+            self._prepared['reset_needed'] = True
+            self._prepared['bound_types'] = []
+            raise
         self._handle_result(res)
 
+    def _execute_pipelined(self, seq_params, offset):
+        """Execute the prepared statement for each set of parameters
+
+        The statement is executed using
+        MySQLConnection.cmd_stmt_execute_many(), sending all executions
+        before reading their results. The offset argument is the index of
+        the first set of parameters in the sequence given to executemany().
+
+        Raises the error of the first failed execution, mentioning the
+        index of its parameters.
+
+        Returns the number of affected rows.
+        """
+        for params in seq_params:
+            self._check_params(params)
+
+        results = self._connection.cmd_stmt_execute_many(
+            self._prepared['statement_id'], seq_params,
+            parameters=self._prepared['parameters'],
+            flags=self._cursor_type,
+            bound_types=self._prepared.setdefault('bound_types', []))
+
+        rowcnt = 0
+        for index, res in enumerate(results):
+            if isinstance(res, errors.Error):
+                self._prepared['bound_types'] = []
+                raise errors.get_mysql_exception(
+                    res.errno,
+                    "{0} (parameters at index {1})".format(res.msg,
+                                                          offset + index),
+                    res.sqlstate)
+            rowcnt += res['affected_rows']
+        self._handle_result(results[-1])
+        return rowcnt
+
     def executemany(self, operation, seq_params):
         """Prepare and execute a MySQL Prepared Statement many times
 
@@ -1172,15 +1584,49 @@ class MySQLCursorPrepared(MySQLCursor):
         If the cursor instance already had a prepared statement, it is
         first closed.
 
-        executemany() simply calls execute().
+        When pipeline_size is bigger than 1 and the statement does not
+        return a result set, nor is a CALL statement which could return
+        result sets, executions are pipelined: for up to
+        pipeline_size tuples at a time, all executions are sent to the
+        MySQL server before reading their results. All executions which
+        were sent are done, even when one of them fails. The error of the
+        first failed execution is raised, mentioning the index of its
+        parameters in seq_params. Parameters sent as long data, for
+        example files, are not pipelined.
+
+        Otherwise, executemany() simply calls execute().
         """
         rowcnt = 0
         try:
-            for params in seq_params:
+            pipelined = None
+            batch = []
+            for index, params in enumerate(seq_params):
+                if pipelined is None:
+                    pipelined = False
+                    if self.pipeline_size > 1:
+                        self._prepare(operation)
+                        pipelined = not (self._prepared['columns'] or
+                                         _first_keyword(operation) == 'CALL')
+                if pipelined and not any(
+                        isinstance(param, IOBase) for param in params):
+                    batch.append(params)
+                    if len(batch) < self.pipeline_size:
+                        continue
+                    rowcnt += self._execute_pipelined(
+                        batch, index + 1 - len(batch))
+                    batch = []
+                    continue
+                if batch:
+                    rowcnt += self._execute_pipelined(
+                        batch, index - len(batch))
+                    batch = []
                 self.execute(operation, params)
                 if self.with_rows and self._have_unread_result():
                     self.fetchall()
                 rowcnt += self._rowcount
+            if batch:
+                rowcnt += self._execute_pipelined(batch,
+                                                  index + 1 - len(batch))
         except (ValueError, TypeError) as err:
             raise errors.InterfaceError(
                 "Failed executing the operation; {error}".format(error=err))
@@ -1216,6 +1662,111 @@ class MySQLCursorPrepared(MySQLCursor):
         return rows
 
 
+class MySQLCursorPreparedServerSide(MySQLCursorPrepared):
+    """Cursor using MySQL Prepared Statements and server-side cursors
+
+    Statements are executed opening a read-only cursor on the MySQL server,
+    which keeps the result set. Rows are only sent when fetching them and
+    fetchmany() reads the requested number of rows in one round trip, so
+    large result sets can be read using little memory. Other statements
+    can be executed using the same connection while the cursor is open.
+
+    When the MySQL server does not open a cursor, for example for
+    statements not returning rows, it works like MySQLCursorPrepared.
+    """
+
+    _cursor_type = CursorType.READ_ONLY
+
+    # Number of rows requested when fetching all rows
+    _fetch_all_rows = 0xffffffff
+
+    def __init__(self, connection=None):
+        super(MySQLCursorPreparedServerSide, self).__init__(connection)
+        self._cursor_exists = False
+
+    def close(self):
+        """Close the cursor
+
+        Closing the prepared statement also closes the cursor on the
+        MySQL server.
+        """
+        self._cursor_exists = False
+        super(MySQLCursorPreparedServerSide, self).close()
+
+    def _handle_result(self, res):
+        """Handle result after execution"""
+        self._cursor_exists = False
+        super(MySQLCursorPreparedServerSide, self)._handle_result(res)
+        if (self._have_result
+                and res[2]['status_flag'] & ServerFlag.STATUS_CURSOR_EXISTS):
+            # Rows are kept by the server until fetched
+            self._connection.unread_result = False
+            self._cursor_exists = True
+            self._rowcount = 0
+
+    def _have_unread_result(self):
+        """Check whether there is an unread result"""
+        if self._cursor_exists:
+            return True
+        return super(MySQLCursorPreparedServerSide,
+                     self)._have_unread_result()
+
+    def _fetch_cursor_rows(self, count):
+        """Fetch rows from the cursor on the MySQL server
+
+        Returns a list of at most count rows.
+        """
+        self._connection.cmd_stmt_fetch(self._prepared['statement_id'], count)
+        (rows, eof) = self._connection.get_rows(
+            binary=self._binary, columns=self.description)
+        self._rowcount += len(rows)
+        if not rows or eof['status_flag'] & ServerFlag.STATUS_LAST_ROW_SENT:
+            self._cursor_exists = False
+            self._handle_eof(eof)
+        return rows
+
+    def _fetch_row_batches(self, size):
+        """Returns the remaining rows of the result set in batches
+
+        Each batch is fetched from the cursor on the MySQL server.
+
+        Returns an iterator over lists of rows.
+        """
+        if not self._cursor_exists:
+            return super(MySQLCursorPreparedServerSide,
+                         self)._fetch_row_batches(size)
+
+        def read_batches():
+            """Fetch rows until the cursor has no more rows"""
+            while self._cursor_exists:
+                yield self._fetch_cursor_rows(size)
+        return read_batches()
+
+    def fetchone(self):
+        """Returns next row of a query result set
+
+        Returns a tuple or None.
+        """
+        if not self._cursor_exists:
+            return super(MySQLCursorPreparedServerSide, self).fetchone()
+        rows = self._fetch_cursor_rows(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=None):
+        if not self._cursor_exists:
+            return super(MySQLCursorPreparedServerSide,
+                         self).fetchmany(size)
+        return self._fetch_cursor_rows(size or self.arraysize)
+
+    def fetchall(self):
+        if not self._cursor_exists:
+            return super(MySQLCursorPreparedServerSide, self).fetchall()
+        rows = []
+        while self._cursor_exists:
+            rows.extend(self._fetch_cursor_rows(self._fetch_all_rows))
+        return rows
+
+
 class MySQLCursorDict(MySQLCursor):
     """
     Cursor fetching rows as dictionaries.
@@ -1233,7 +1784,7 @@ class MySQLCursorDict(MySQLCursor):
         Returns a dictionary.
         """
         if hasattr(self._connection, 'converter'):
-            row = self._connection.converter.row_to_python(rowdata, desc)
+            row = self._get_row_decoder()(rowdata)
         else:
             row = rowdata
 
@@ -1282,7 +1833,7 @@ class MySQLCursorNamedTuple(MySQLCursor):
         Returns a named tuple.
         """
         if hasattr(self._connection, 'converter'):
-            row = self._connection.converter.row_to_python(rowdata, desc)
+            row = self._get_row_decoder()(rowdata)
         else:
             row = rowdata
 
@@ -25,20 +25,19 @@
 """
 
 from collections import namedtuple
-import re
 import weakref
 
 from _mysql_connector import MySQLInterfaceError  # pylint: disable=F0401,E0611
 
 from .abstracts import MySQLConnectionAbstract, MySQLCursorAbstract
 from .catch23 import PY2, isunicode
-from . import errors
+from . import columnar, errors
+from .conversion import MySQLConverter
 from .errorcode import CR_NO_RESULT_SET
 
 from .cursor import (
-    RE_PY_PARAM, RE_SQL_INSERT_STMT,
-    RE_SQL_ON_DUPLICATE, RE_SQL_COMMENT, RE_SQL_INSERT_VALUES,
-    RE_SQL_SPLIT_STMTS
+    RE_PY_PARAM, RE_SQL_SPLIT_STMTS,
+    _batch_insert_chunks, _split_batch_insert
 )
 
 
@@ -266,33 +265,27 @@ class CMySQLCursor(MySQLCursorAbstract):
         return None
 
     def _batch_insert(self, operation, seq_params):
-        """Implements multi row insert"""
-        def remove_comments(match):
-            """Remove comments from INSERT statements.
-
-            This function is used while removing comments from INSERT
-            statements. If the matched string is a comment not enclosed
-            by quotes, it returns an empty string, else the string itself.
-            """
-            if match.group(1):
-                return ""
-            else:
-                return match.group(2)
-
-        tmp = re.sub(RE_SQL_ON_DUPLICATE, '',
-                     re.sub(RE_SQL_COMMENT, remove_comments, operation))
+        """Implements multi row insert
 
-        matches = re.search(RE_SQL_INSERT_VALUES, tmp)
-        if not matches:
-            raise errors.InterfaceError(
-                "Failed rewriting statement for multi-row INSERT. "
-                "Check SQL syntax."
-            )
-        fmt = matches.group(1).encode(self._cnx.charset)
-        values = []
+        Returns an iterator over the multi-row INSERT or REPLACE statements,
+        each of them no larger than the connection's max_batch_size, or None
+        when the statement can not be rewritten.
+        """
+        parts = _split_batch_insert(operation)
+        if parts is None:
+            return None
+        try:
+            prefix, fmt, suffix = [part.encode(self._cnx.charset)
+                                   for part in parts]
+        except (UnicodeDecodeError, UnicodeEncodeError) as err:
+            raise errors.ProgrammingError(str(err))
+        return _batch_insert_chunks(
+            prefix, self._batch_insert_values(fmt, seq_params), suffix,
+            self._cnx.max_batch_size)
 
+    def _batch_insert_values(self, fmt, seq_params):
+        """Generate the VALUES rows of a multi row insert"""
         try:
-            stmt = operation.encode(self._cnx.charset)
             for params in seq_params:
                 tmp = fmt
                 prepared = self._cnx.prepare_for_mysql(params)
@@ -305,21 +298,13 @@ class CMySQLCursor(MySQLCursorAbstract):
                     if psub.remaining != 0:
                         raise errors.ProgrammingError(
                             "Not all parameters were used in the SQL statement")
-                values.append(tmp)
-
-            if fmt in stmt:
-                stmt = stmt.replace(fmt, b','.join(values), 1)
-                self._executed = stmt
-                return stmt
-            else:
-                return None
+                yield tmp
         except (UnicodeDecodeError, UnicodeEncodeError) as err:
             raise errors.ProgrammingError(str(err))
         except Exception as err:
             raise errors.InterfaceError(
                 "Failed executing the operation; %s" % err)
 
-
     def executemany(self, operation, seq_params):
         """Execute the given operation multiple times"""
         if not operation or not seq_params:
@@ -329,18 +314,21 @@ class CMySQLCursor(MySQLCursorAbstract):
             raise errors.ProgrammingError("Cursor is not connected")
         self._cnx.handle_unread_result()
 
-        if not isinstance(seq_params, (list, tuple)):
+        try:
+            _ = iter(seq_params)
+        except TypeError:
             raise errors.ProgrammingError(
-                "Parameters for query must be list or tuple.")
-
-        # Optimize INSERTs by batching them
-        if re.match(RE_SQL_INSERT_STMT, operation):
-            if not seq_params:
-                self._rowcount = 0
-                return
-            stmt = self._batch_insert(operation, seq_params)
-            if stmt is not None:
-                return self.execute(stmt)
+                "Parameters for query must be an Iterable.")
+
+        # Optimize INSERT and REPLACE statements by batching them
+        stmts = self._batch_insert(operation, seq_params)
+        if stmts is not None:
+            rowcnt = 0
+            for stmt in stmts:
+                self.execute(stmt)
+                rowcnt += self._affected_rows
+            self._rowcount = rowcnt
+            return None
 
         rowcnt = 0
         try:
@@ -492,6 +480,77 @@ class CMySQLCursor(MySQLCursorAbstract):
         self._handle_eof()
         return rows
 
+    def _fetch_row_batches(self, size):
+        """Returns the remaining rows of the result set in batches
+
+        Rows are read from the connection at most size at a time.
+
+        Returns an iterator over lists of rows.
+        """
+        if not self._cnx.unread_result:
+            raise errors.InterfaceError("No result set to fetch from.")
+
+        def read_batches():
+            """Read rows until the end of the result set"""
+            rows = []
+            if self._nextrow:
+                rows.append(self._nextrow)
+                self._nextrow = None
+            while True:
+                batch = self._cnx.get_rows(size)
+                rows.extend(batch)
+                self._rowcount += len(rows)
+                if len(batch) < size:
+                    self._handle_eof()
+                    yield rows
+                    return
+                yield rows
+                rows = []
+        return read_batches()
+
+    def _column_decoders(self):
+        """Returns functions converting the columns of the result set
+
+        Returns None when the rows are converted by the connection.
+        """
+        if not self._raw or self._cnx.converter:
+            return None
+        return columnar.column_decoders(MySQLConverter(self._cnx.charset),
+                                        self._description)
+
+    def fetch_columns(self):
+        """Returns the remaining rows of the result set as columns
+
+        Rows are read in batches and split into columns, so the result set
+        is not held both as rows and as columns.
+
+        Returns a list with a list of values for each column.
+        """
+        batches = self._fetch_row_batches(columnar.BATCH_SIZE)
+        collector = columnar.ColumnCollector(self._description)
+        for rows in batches:
+            collector.add_rows(rows)
+        return collector.columns()
+
+    def fetchall_numpy(self):
+        """Returns the remaining rows of the result set as NumPy arrays
+
+        Each column is returned as a numpy.ma.MaskedArray in which NULL
+        values are masked. Integer, floating point and temporal columns
+        use native NumPy data types, other columns contain Python objects.
+        Values are converted even when the cursor returns raw rows.
+
+        Raises errors.InterfaceError when NumPy is not available.
+
+        Returns a list with an array for each column.
+        """
+        batches = self._fetch_row_batches(columnar.BATCH_SIZE)
+        collector = columnar.NumPyColumnCollector(self._description,
+                                                  self._column_decoders())
+        for rows in batches:
+            collector.add_rows(rows)
+        return collector.columns()
+
     def fetchmany(self, size=1):
         """Returns the next set of rows of a result set"""
         if self._nextrow:
@@ -672,6 +731,18 @@ class CMySQLCursorBuffered(CMySQLCursor):
         self._next_row = len(self._rows)
         return res
 
+    def _fetch_row_batches(self, size):
+        """Returns the remaining buffered rows in batches
+
+        Returns an iterator over lists of rows.
+        """
+        if self._rows is None:
+            raise errors.InterfaceError("No result set to fetch from.")
+        start = self._next_row
+        self._next_row = len(self._rows)
+        return (self._rows[offset:offset + size]
+                for offset in range(start, self._next_row, size))
+
     def fetchmany(self, size=1):
         res = []
         cnt = size or self.arraysize
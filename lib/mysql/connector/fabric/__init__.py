@@ -26,15 +26,6 @@
 
 from collections import namedtuple
 
-from .connection import (
-    MODE_READONLY, MODE_READWRITE,
-    STATUS_PRIMARY, STATUS_SECONDARY,
-    SCOPE_GLOBAL, SCOPE_LOCAL,
-    Fabric, FabricConnection,
-    MySQLFabricConnection,
-    FabricSet,
-)
-
 # Order of field_names must match how Fabric is returning the data
 FabricMySQLServer = namedtuple(
     'FabricMySQLServer',
@@ -48,6 +39,16 @@ FabricShard = namedtuple(
      'shard', 'shard_type', 'group', 'global_group']
     )
 
+# Imported after the named tuples, which the connection module uses
+from .connection import (
+    MODE_READONLY, MODE_READWRITE,
+    STATUS_PRIMARY, STATUS_SECONDARY,
+    SCOPE_GLOBAL, SCOPE_LOCAL,
+    Fabric, FabricConnection,
+    MySQLFabricConnection,
+    FabricSet,
+)
+
 
 def connect(**kwargs):
     """Create a MySQLFabricConnection object"""
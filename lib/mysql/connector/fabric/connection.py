@@ -38,6 +38,7 @@ from hashlib import md5
 import mysql.connector
 
 from ..connection import MySQLConnection
+from ..constants import CNX_POOL_ARGS
 from ..conversion import MySQLConverter
 from ..pooling import MySQLConnectionPool
 from ..errors import (
@@ -1415,12 +1416,9 @@ class MySQLFabricConnection(object):
 
         # Try to use the configuration
         test_config = config.copy()
-        if 'pool_name' in test_config:
-            del test_config['pool_name']
-        if 'pool_size' in test_config:
-            del test_config['pool_size']
-        if 'pool_reset_session' in test_config:
-            del test_config['pool_reset_session']
+        for key in CNX_POOL_ARGS:
+            if key in test_config:
+                del test_config[key]
         try:
             pool = MySQLConnectionPool(pool_name=str(uuid.uuid4()))
             pool.set_config(**test_config)
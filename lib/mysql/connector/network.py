@@ -25,6 +25,8 @@
 """
 
 from collections import deque
+import errno
+import select
 import socket
 import struct
 import sys
@@ -36,10 +38,27 @@ except:
     # If import fails, we don't have SSL support.
     pass
 
+try:
+    import zstandard
+except ImportError:
+    # zstd compression is optional
+    HAVE_ZSTD = False
+else:
+    HAVE_ZSTD = True
+
 from . import constants, errors
 from .catch23 import PY2, init_bytearray, struct_unpack
 
 
+# Maximum number of buffers passed to a single sendmsg() call
+_IOV_MAX = 1024
+
+if HAVE_ZSTD:
+    _DECOMPRESS_ERRORS = (zlib.error, zstandard.ZstdError)
+else:
+    _DECOMPRESS_ERRORS = (zlib.error,)
+
+
 def _strioerror(err):
     """Reformat the IOError error message
 
@@ -66,6 +85,55 @@ def _prepare_packets(buf, pktnr):
     return pkts
 
 
+def _packet_views(buf, pktnr):
+    """Split a payload in MySQL packets without copying it
+
+    This function returns the same data as _prepare_packets(), but as a
+    list of packet headers each followed by a view on the part of buf
+    holding the packet's payload.
+    """
+    if PY2:
+        view = buffer(buf)  # pylint: disable=E0602
+    else:
+        view = memoryview(buf)
+    views = []
+    pllen = len(buf)
+    maxpktlen = constants.MAX_PACKET_LENGTH
+    offset = 0
+    while pllen - offset >= maxpktlen:
+        views.append(b'\xff\xff\xff' + struct.pack('<B', pktnr))
+        views.append(view[offset:offset + maxpktlen])
+        offset += maxpktlen
+        pktnr = (pktnr + 1) % 256
+    views.append(struct.pack('<I', pllen - offset)[0:3]
+                 + struct.pack('<B', pktnr))
+    views.append(view[offset:])
+    return views
+
+
+def _frame_views(views, first_size, size):
+    """Group views in compressed packets
+
+    The first group holds first_size bytes, all following groups size
+    bytes except the last one. Views crossing a group boundary are sliced.
+
+    Returns an iterator over lists of views.
+    """
+    frame = []
+    room = first_size
+    for view in views:
+        while len(view) > room:
+            frame.append(view[:room])
+            yield frame
+            view = view[room:]
+            frame = []
+            room = size
+        frame.append(view)
+        room -= len(view)
+    if frame:
+        yield frame
+
+
 class BaseMySQLSocket(object):
     """Base class for MySQL socket communication
 
@@ -82,6 +150,18 @@ class BaseMySQLSocket(object):
         self._compressed_packet_number = -1
         self._packet_queue = deque()
         self.recvsize = 8192
+        self._recv_buffer = None
+        self._recv_view = None
+        self._recv_start = 0
+        self._recv_end = 0
+        self._vectored_send = False
+        self._compress_level = zlib.Z_DEFAULT_COMPRESSION
+        self._compress_min_size = 50
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+        self._compressed_header = bytearray(7)
+        self._compressed_buffer = bytearray(b'')
+        self._uncompressed = bytearray(b'')
 
     @property
     def next_packet_number(self):
@@ -99,6 +179,83 @@ class BaseMySQLSocket(object):
             self._compressed_packet_number = 0
         return self._compressed_packet_number
 
+    def set_recv_buffer_size(self, size):
+        """Set the size of the read-ahead receive buffer
+
+        When size is bigger than 0, MySQL packets are taken from a reusable
+        buffer which is refilled using recv_into(). This way many small
+        packets, for example rows of a result set, are received using a
+        single system call. Packets which do not fit in the buffer are
+        read directly from the socket.
+
+        Setting size to 0 or None disables the read-ahead buffer.
+        """
+        self._recv_start = 0
+        self._recv_end = 0
+        if size and sys.version_info[0:2] != (2, 6):
+            self._recv_buffer = bytearray(int(size))
+            self._recv_view = memoryview(self._recv_buffer)
+            self.recv = self.recv_buffered
+        else:
+            self._recv_buffer = None
+            self._recv_view = None
+            self.recv = self.recv_plain
+
+    def set_compression(self, level=None, min_size=None):
+        """Set how packets are compressed
+
+        The level is passed on to zlib, and payloads smaller than min_size
+        bytes are sent without compressing them. When None, the defaults
+        Z_DEFAULT_COMPRESSION and 50 bytes are used.
+        """
+        if level is None:
+            level = zlib.Z_DEFAULT_COMPRESSION
+        if min_size is None:
+            min_size = 50
+        self._compress_level = level
+        self._compress_min_size = min_size
+
+    def set_compression_algorithm(self, algorithm, level=None):
+        """Set the algorithm used by the compressed protocol
+
+        The algorithm is either 'zlib' or 'zstd'. For zstd, level is the
+        zstd compression level, by default 3.
+
+        Raises InterfaceError when zstd is used without the zstandard
+        module being available.
+        """
+        if algorithm == 'zstd':
+            if not HAVE_ZSTD:
+                raise errors.InterfaceError(
+                    "zstd compression requires the zstandard module")
+            self._zstd_compressor = zstandard.ZstdCompressor(level=level or 3)
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+        else:
+            self._zstd_compressor = None
+            self._zstd_decompressor = None
+
+    def _compressobj(self):
+        """Return a compression object for the algorithm in use"""
+        if self._zstd_compressor:
+            return self._zstd_compressor.compressobj()
+        return zlib.compressobj(self._compress_level)
+
+    def _compress(self, data):
+        """Compress data using the algorithm in use"""
+        if self._zstd_compressor:
+            return self._zstd_compressor.compress(data)
+        return zlib.compress(data, self._compress_level)
+
+    def _decompress(self, data, size):
+        """Decompress data using the algorithm in use
+
+        The size is the length of the data before it was compressed.
+        """
+        if self._zstd_decompressor:
+            return self._zstd_decompressor.decompress(
+                data, max_output_size=size)
+        return zlib.decompress(data)
+
     def open_connection(self):
         """Open the socket"""
         raise NotImplementedError
@@ -112,43 +269,115 @@ class BaseMySQLSocket(object):
         try:
             self.sock.shutdown(socket.SHUT_RDWR)
             self.sock.close()
+            self._recv_start = self._recv_end = 0
             del self._packet_queue
         except (socket.error, AttributeError):
             pass
 
+    def is_alive(self):
+        """Check whether the socket of an idle connection is usable
+
+        The check does not block nor send anything to the MySQL server.
+        An idle connection has nothing to read: when the socket is
+        readable, the server closed the connection or sent something
+        unexpected, like an error before disconnecting. Plain sockets
+        are peeked using MSG_PEEK; SSL sockets are checked using select().
+
+        Returns True or False.
+        """
+        try:
+            if (self.sock is None or self._recv_start < self._recv_end
+                    or self._packet_queue):
+                return False
+        except AttributeError:
+            # Socket was closed
+            return False
+
+        try:
+            if isinstance(self.sock, ssl.SSLSocket):
+                if self.sock.pending():
+                    return False
+                return not select.select([self.sock], [], [], 0)[0]
+        except NameError:
+            # No SSL support
+            pass
+        except (select.error, socket.error, ValueError):
+            return False
+
+        timeout = self.sock.gettimeout()
+        try:
+            self.sock.setblocking(False)
+            self.sock.recv(1, socket.MSG_PEEK)
+        except socket.error as err:
+            return err.errno in (errno.EAGAIN, errno.EWOULDBLOCK)
+        finally:
+            try:
+                self.sock.settimeout(timeout)
+            except socket.error:
+                pass
+        return False
+
     def close_connection(self):
         """Close the socket"""
         try:
             self.sock.close()
+            self._recv_start = self._recv_end = 0
             del self._packet_queue
         except (socket.error, AttributeError):
             pass
 
+    def _sendmsg(self, buffers):
+        """Send buffers using vectored I/O
+
+        The buffers are passed to sendmsg() as they are, so headers and
+        payload are written without joining them first. Partial writes
+        continue with the first buffer which was not completely sent.
+        """
+        i = 0
+        while i < len(buffers):
+            sent = self.sock.sendmsg(buffers[i:i + _IOV_MAX])
+            while i < len(buffers) and sent >= len(buffers[i]):
+                sent -= len(buffers[i])
+                i += 1
+            if sent:
+                buffers[i] = memoryview(buffers[i])[sent:]
+
     def send_plain(self, buf, packet_number=None,
                    compressed_packet_number=None):
-        """Send packets to the MySQL server"""
+        """Send packets to the MySQL server
+
+        When the socket supports it, all packets are sent with a single
+        sendmsg() call without copying the payload.
+        """
         if packet_number is None:
             self.next_packet_number  # pylint: disable=W0104
         else:
             self._packet_number = packet_number
-        packets = _prepare_packets(buf, self._packet_number)
-        for packet in packets:
-            try:
+        try:
+            if self._vectored_send:
+                self._sendmsg(_packet_views(buf, self._packet_number))
+                return
+            packets = _prepare_packets(buf, self._packet_number)
+            for packet in packets:
                 if PY2:
                     self.sock.sendall(buffer(packet))  # pylint: disable=E0602
                 else:
                     self.sock.sendall(packet)
-            except IOError as err:
-                raise errors.OperationalError(
-                    errno=2055, values=(self.get_address(), _strioerror(err)))
-            except AttributeError:
-                raise errors.OperationalError(errno=2006)
+        except IOError as err:
+            raise errors.OperationalError(
+                errno=2055, values=(self.get_address(), _strioerror(err)))
+        except AttributeError:
+            raise errors.OperationalError(errno=2006)
 
     send = send_plain
 
     def send_compressed(self, buf, packet_number=None,
                         compressed_packet_number=None):
-        """Send compressed packets to the MySQL server"""
+        """Send compressed packets to the MySQL server
+
+        Like send_plain(), all compressed packets are sent with a single
+        sendmsg() call when the socket supports it.
+        """
         if packet_number is None:
             self.next_packet_number  # pylint: disable=W0104
         else:
@@ -162,74 +391,51 @@ class BaseMySQLSocket(object):
         pllen = len(buf)
         zpkts = []
         maxpktlen = constants.MAX_PACKET_LENGTH
-        if pllen > maxpktlen:
-            pkts = _prepare_packets(buf, pktnr)
-            if PY2:
-                tmpbuf = bytearray()
-                for pkt in pkts:
-                    tmpbuf += pkt
-                tmpbuf = buffer(tmpbuf)  # pylint: disable=E0602,R0204
-            else:
-                tmpbuf = b''.join(pkts)  # pylint: disable=R0204
-            del pkts
-            zbuf = zlib.compress(tmpbuf[:16384])
-            header = (struct.pack('<I', len(zbuf))[0:3]
-                      + struct.pack('<B', self._compressed_packet_number)
-                      + b'\x00\x40\x00')
-            if PY2:
-                header = buffer(header)  # pylint: disable=E0602
-            zpkts.append(header + zbuf)
-            tmpbuf = tmpbuf[16384:]
-            pllen = len(tmpbuf)
-            self.next_compressed_packet_number  # pylint: disable=W0104
-            while pllen > maxpktlen:
-                zbuf = zlib.compress(tmpbuf[:maxpktlen])
-                header = (struct.pack('<I', len(zbuf))[0:3]
-                          + struct.pack('<B', self._compressed_packet_number)
-                          + b'\xff\xff\xff')
-                if PY2:
-                    header = buffer(header)  # pylint: disable=E0602
-                zpkts.append(header + zbuf)
-                tmpbuf = tmpbuf[maxpktlen:]
-                pllen = len(tmpbuf)
-                self.next_compressed_packet_number  # pylint: disable=W0104
-            if tmpbuf:
-                zbuf = zlib.compress(tmpbuf)
-                header = (struct.pack('<I', len(zbuf))[0:3]
-                          + struct.pack('<B', self._compressed_packet_number)
-                          + struct.pack('<I', pllen)[0:3])
-                if PY2:
-                    header = buffer(header)  # pylint: disable=E0602
-                zpkts.append(header + zbuf)
-            del tmpbuf
+        if pllen + 4 > maxpktlen:
+            # Compress the packets in parts, reading them through views
+            frames = _frame_views(_packet_views(buf, pktnr),
+                                  16384, maxpktlen)
+            for i, frame in enumerate(frames):
+                if i:
+                    self.next_compressed_packet_number  # pylint: disable=W0104
+                zobj = self._compressobj()
+                zbuf = b''.join([zobj.compress(view) for view in frame])
+                zbuf += zobj.flush()
+                frame_len = sum([len(view) for view in frame])
+                zpkts.append((struct.pack('<I', len(zbuf))[0:3]
+                              + struct.pack('<B',
+                                            self._compressed_packet_number)
+                              + struct.pack('<I', frame_len)[0:3], zbuf))
         else:
             pkt = (struct.pack('<I', pllen)[0:3] +
                    struct.pack('<B', pktnr) + buf)
             if PY2:
                 pkt = buffer(pkt)  # pylint: disable=E0602
-            pllen = len(pkt)
-            if pllen > 50:
-                zbuf = zlib.compress(pkt)
-                zpkts.append(struct.pack('<I', len(zbuf))[0:3]
-                             + struct.pack('<B', self._compressed_packet_number)
-                             + struct.pack('<I', pllen)[0:3]
-                             + zbuf)
+            if pllen >= self._compress_min_size:
+                zbuf = self._compress(pkt)
+                zpkts.append((struct.pack('<I', len(zbuf))[0:3]
+                              + struct.pack('<B',
+                                            self._compressed_packet_number)
+                              + struct.pack('<I', len(pkt))[0:3], zbuf))
             else:
-                header = (struct.pack('<I', pllen)[0:3]
+                header = (struct.pack('<I', len(pkt))[0:3]
                           + struct.pack('<B', self._compressed_packet_number)
                           + struct.pack('<I', 0)[0:3])
                 if PY2:
                     header = buffer(header)  # pylint: disable=E0602
-                zpkts.append(header + pkt)
+                zpkts.append((header, pkt))
 
-        for zip_packet in zpkts:
-            try:
-                self.sock.sendall(zip_packet)
-            except IOError as err:
-                raise errors.OperationalError(
-                    errno=2055, values=(self.get_address(), _strioerror(err)))
-            except AttributeError:
-                raise errors.OperationalError(errno=2006)
+        try:
+            if self._vectored_send:
+                self._sendmsg([data for zpkt in zpkts for data in zpkt])
+                return
+            for header, zip_payload in zpkts:
+                self.sock.sendall(header + zip_payload)
+        except IOError as err:
+            raise errors.OperationalError(
+                errno=2055, values=(self.get_address(), _strioerror(err)))
+        except AttributeError:
+            raise errors.OperationalError(errno=2006)
 
     def recv_plain(self):
         """Receive packets from the MySQL server"""
@@ -269,6 +475,70 @@ class BaseMySQLSocket(object):
             raise errors.OperationalError(
                 errno=2055, values=(self.get_address(), _strioerror(err)))
 
+    def _fill_recv_buffer(self, size):
+        """Make sure size bytes are available in the receive buffer
+
+        Unread data is moved to the start of the buffer when there is not
+        enough room left after it. The buffer is then refilled reading as
+        much as the socket has available, up to the size of the buffer.
+        """
+        start = self._recv_start
+        end = self._recv_end
+        if start + size > len(self._recv_buffer):
+            end -= start
+            self._recv_buffer[0:end] = self._recv_buffer[start:start + end]
+            start = 0
+            self._recv_start = 0
+            self._recv_end = end
+        while end - start < size:
+            read = self.sock.recv_into(self._recv_view[end:])
+            if not read:
+                raise errors.InterfaceError(errno=2013)
+            end += read
+            self._recv_end = end
+
+    def recv_buffered(self):
+        """Receive packets from the MySQL server using read-ahead
+
+        This method returns the same packets as recv_plain(), but reads
+        from the socket in chunks as big as the receive buffer.
+        """
+        try:
+            if self._recv_end - self._recv_start < 4:
+                self._fill_recv_buffer(4)
+            start = self._recv_start
+            buf = self._recv_buffer
+
+            # Save the packet number and payload length
+            self._packet_number = buf[start + 3]
+            packet_len = (buf[start] | buf[start + 1] << 8
+                          | buf[start + 2] << 16) + 4
+
+            if packet_len <= len(self._recv_buffer):
+                if self._recv_end - start < packet_len:
+                    self._fill_recv_buffer(packet_len)
+                    start = self._recv_start
+                self._recv_start = start + packet_len
+                return buf[start:start + packet_len]
+
+            # Packet is bigger than the buffer; read the rest directly
+            packet = bytearray(packet_len)
+            buffered = self._recv_end - start
+            packet[0:buffered] = self._recv_view[start:self._recv_end]
+            self._recv_start = self._recv_end = 0
+            packet_view = memoryview(packet)[buffered:]
+            rest = packet_len - buffered
+            while rest:
+                read = self.sock.recv_into(packet_view, rest)
+                if not read:
+                    raise errors.InterfaceError(errno=2013)
+                packet_view = packet_view[read:]
+                rest -= read
+            return packet
+        except IOError as err:
+            raise errors.OperationalError(
+                errno=2055, values=(self.get_address(), _strioerror(err)))
+
     def recv_py26_plain(self):
         """Receive packets from the MySQL server"""
         try:
@@ -306,97 +576,95 @@ class BaseMySQLSocket(object):
     else:
         recv = recv_plain
 
-    def _split_zipped_payload(self, packet_bunch):
-        """Split compressed payload"""
-        while packet_bunch:
-            if PY2:
-                payload_length = struct.unpack_from(
-                    "<I",
-                    packet_bunch[0:3] + b'\x00')[0]  # pylint: disable=E0602
-            else:
-                payload_length = struct.unpack("<I", packet_bunch[0:3] + b'\x00')[0]
-
-            self._packet_queue.append(packet_bunch[0:payload_length + 4])
-            packet_bunch = packet_bunch[payload_length + 4:]
+    def _recv_into(self, buf, size):
+        """Read exactly size bytes from the socket into buf"""
+        if sys.version_info[0:2] == (2, 6):
+            pos = 0
+            while pos < size:
+                chunk = self.sock.recv(size - pos)
+                if not chunk:
+                    raise errors.InterfaceError(errno=2013)
+                buf[pos:pos + len(chunk)] = chunk
+                pos += len(chunk)
+            return
+        view = memoryview(buf)[0:size]
+        while size:
+            read = self.sock.recv_into(view, size)
+            if not read:
+                raise errors.InterfaceError(errno=2013)
+            view = view[read:]
+            size -= read
+
+    def _split_zipped_payload(self):
+        """Queue the complete MySQL packets found in the received payload
+
+        Bytes of a MySQL packet which continues in the next compressed
+        packet are kept until the rest has been received.
+        """
+        data = self._uncompressed
+        start = 0
+        end = len(data)
+        while end - start >= 4:
+            packet_end = start + 4 + (data[start] | data[start + 1] << 8
+                                      | data[start + 2] << 16)
+            if packet_end > end:
+                break
+            self._packet_queue.append(data[start:packet_end])
+            start = packet_end
+        if start:
+            del data[0:start]
+
+    def _recv_zipped_packet(self):
+        """Receive one compressed packet from the MySQL server
+
+        The compressed packet is read into a reusable buffer using two
+        reads, one for the 7 byte header and one for the payload.
+        """
+        header = self._compressed_header
+        self._recv_into(header, 7)
+
+        # Length of the compressed payload and the payload before compression
+        zip_payload_length = header[0] | header[1] << 8 | header[2] << 16
+        self._compressed_packet_number = header[3]
+        payload_length = header[4] | header[5] << 8 | header[6] << 16
+
+        if len(self._compressed_buffer) < zip_payload_length:
+            self._compressed_buffer = bytearray(zip_payload_length)
+        zip_payload = self._compressed_buffer
+        self._recv_into(zip_payload, zip_payload_length)
+
+        if payload_length == 0:
+            # Payload was not compressed
+            self._uncompressed += zip_payload[0:zip_payload_length]
+        elif PY2:
+            self._uncompressed += self._decompress(
+                buffer(zip_payload, 0,  # pylint: disable=E0602
+                       zip_payload_length), payload_length)
+        else:
+            self._uncompressed += self._decompress(
+                memoryview(zip_payload)[0:zip_payload_length], payload_length)
 
     def recv_compressed(self):
-        """Receive compressed packets from the MySQL server"""
-        try:
-            pkt = self._packet_queue.popleft()
-            self._packet_number = pkt[3]
-            return pkt
-        except IndexError:
-            pass
+        """Receive compressed packets from the MySQL server
 
-        header = bytearray(b'')
-        packets = []
+        A compressed packet can hold several MySQL packets, or part of
+        one. MySQL packets are queued as soon as they are complete and
+        returned one at a time.
+        """
         try:
-            abyte = self.sock.recv(1)
-            while abyte and len(header) < 7:
-                header += abyte
-                abyte = self.sock.recv(1)
-            while header:
-                if len(header) < 7:
-                    raise errors.InterfaceError(errno=2013)
-
-                # Get length of compressed packet
-                zip_payload_length = struct_unpack("<I",
-                                                   header[0:3] + b'\x00')[0]
-                self._compressed_packet_number = header[3]
-
-                # Get payload length before compression
-                payload_length = struct_unpack("<I", header[4:7] + b'\x00')[0]
-
-                zip_payload = init_bytearray(abyte)
-                while len(zip_payload) < zip_payload_length:
-                    chunk = self.sock.recv(zip_payload_length
-                                           - len(zip_payload))
-                    if len(chunk) == 0:
-                        raise errors.InterfaceError(errno=2013)
-                    zip_payload = zip_payload + chunk
-
-                # Payload was not compressed
-                if payload_length == 0:
-                    self._split_zipped_payload(zip_payload)
-                    pkt = self._packet_queue.popleft()
-                    self._packet_number = pkt[3]
-                    return pkt
-
-                packets.append((payload_length, zip_payload))
-
-                if zip_payload_length <= 16384:
-                    # We received the full compressed packet
-                    break
-
-                # Get next compressed packet
-                header = init_bytearray(b'')
-                abyte = self.sock.recv(1)
-                while abyte and len(header) < 7:
-                    header += abyte
-                    abyte = self.sock.recv(1)
-
+            while not self._packet_queue:
+                self._recv_zipped_packet()
+                self._split_zipped_payload()
         except IOError as err:
             raise errors.OperationalError(
                 errno=2055, values=(self.get_address(), _strioerror(err)))
+        except _DECOMPRESS_ERRORS as err:
+            raise errors.InterfaceError(
+                "Failed decompressing packet; {0}".format(err))
 
-        # Compressed packet can contain more than 1 MySQL packets
-        # We decompress and make one so we can split it up
-        tmp = init_bytearray(b'')
-        for payload_length, payload in packets:
-            # payload_length can not be 0; this was previously handled
-            if PY2:
-                tmp += zlib.decompress(buffer(payload))  # pylint: disable=E0602
-            else:
-                tmp += zlib.decompress(payload)
-        self._split_zipped_payload(tmp)
-        del tmp
-
-        try:
-            pkt = self._packet_queue.popleft()
-            self._packet_number = pkt[3]
-            return pkt
-        except IndexError:
-            pass
+        pkt = self._packet_queue.popleft()
+        self._packet_number = pkt[3]
+        return pkt
 
     def set_connection_timeout(self, timeout):
         """Set the connection timeout"""
@@ -419,6 +687,7 @@ class BaseMySQLSocket(object):
                 cert_reqs=cert_reqs, do_handshake_on_connect=False,
                 ssl_version=ssl.PROTOCOL_TLSv1, ciphers=cipher)
             self.sock.do_handshake()
+            self._vectored_send = False
         except NameError:
             raise errors.NotSupportedError(
                 "Python installation has no SSL support")
@@ -450,6 +719,7 @@ class MySQLUnixSocket(BaseMySQLSocket):
             self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             self.sock.settimeout(self._connection_timeout)
             self.sock.connect(self.unix_socket)
+            self._vectored_send = hasattr(self.sock, 'sendmsg')
         except IOError as err:
             raise errors.InterfaceError(
                 errno=2002, values=(self.get_address(), _strioerror(err)))
@@ -507,6 +777,7 @@ class MySQLTCPSocket(BaseMySQLSocket):
             self.sock = socket.socket(self._family, socktype, proto)
             self.sock.settimeout(self._connection_timeout)
             self.sock.connect(sockaddr)
+            self._vectored_send = hasattr(self.sock, 'sendmsg')
         except IOError as err:
             raise errors.InterfaceError(
                 errno=2003, values=(self.get_address(), _strioerror(err)))
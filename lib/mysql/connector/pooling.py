@@ -25,6 +25,9 @@
 """
 
 import re
+import weakref
+from collections import deque
+from time import sleep, time
 from uuid import uuid4
 # pylint: disable=F0401
 try:
@@ -38,10 +41,13 @@ import threading
 from . import errors
 from .connection import MySQLConnection
 
+# Guards the pools registered by mysql.connector.connect(); each pool has
+# its own lock
 CONNECTION_POOL_LOCK = threading.RLock()
 CNX_POOL_MAXSIZE = 32
 CNX_POOL_MAXNAMESIZE = 64
 CNX_POOL_NAMEREGEX = re.compile(r'[^a-zA-Z0-9._:\-*$#]')
+CNX_POOL_VALIDATIONS = ('none', 'ping', 'probe')
 
 
 def generate_pool_name(**kwargs):
@@ -69,6 +75,36 @@ def generate_pool_name(**kwargs):
     return '_'.join(parts)
 
 
+def _seconds(value, name):
+    """Return a number of seconds given as pool argument
+
+    Raises an AttributeError when value is not a number or is negative.
+
+    Returns a float.
+    """
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise AttributeError("{0} should be a number".format(name))
+    if value < 0:
+        raise AttributeError("{0} should be 0 or higher".format(name))
+    return value
+
+
+def _maintain_pool(pool_ref, interval):
+    """Close idle and recycle old connections of a pool
+
+    This runs in a daemon thread until the pool is garbage collected.
+    """
+    while True:
+        sleep(interval)
+        pool = pool_ref()
+        if pool is None:
+            return
+        pool._maintain_connections()  # pylint: disable=W0212
+        del pool
+
+
 class PooledMySQLConnection(object):
     """Class holding a MySQL Connection in a pool
 
@@ -110,11 +146,13 @@ class PooledMySQLConnection(object):
         can be reused.
 
         When the pool is configured to reset the session, the session
-        state will be cleared by re-authenticating the user.
+        state will be cleared by re-authenticating the user. With
+        pool_reset_session set to 'lazy', the session is only cleared when
+        its state might have changed.
         """
         cnx = self._cnx
         if self._cnx_pool.reset_session:
-            cnx.reset_session()
+            cnx.reset_session(lazy=self._cnx_pool.reset_session == 'lazy')
 
         self._cnx_pool.add_connection(cnx)
         self._cnx = None
@@ -133,8 +171,34 @@ class PooledMySQLConnection(object):
 
 
 class MySQLConnectionPool(object):
-    """Class defining a pool of MySQL connections"""
+    """Class defining a pool of MySQL connections
+
+    The pool holds up to pool_size connections, or pool_max_size when
+    given. Initializing the pool opens pool_min_size of them, which
+    defaults to all. A pool with pool_min_size below its size opens the
+    other connections when get_connection() needs them.
+
+    With pool_idle_timeout set, a background thread closes connections
+    not used for that many seconds, keeping at least pool_min_size. With
+    pool_max_lifetime set, connections which were opened that many
+    seconds ago are reconnected, in the background while idle or else
+    when they are handed out.
+
+    pool_validation sets how get_connection() checks an idle connection
+    before handing it out: 'ping' sends a COM_PING when the connection
+    was idle for pool_validation_interval seconds or more, 'probe'
+    checks the socket without a round trip and 'none' does not check.
+    A dead connection is reconnected in the background when another
+    idle connection can be handed out instead.
+
+    pool_reset_session set to 'lazy' resets the session of a connection
+    added back only when its state might have changed, see
+    MySQLConnection.reset_session().
+    """
     def __init__(self, pool_size=5, pool_name=None, pool_reset_session=True,
+                 pool_timeout=0, pool_min_size=None, pool_max_size=None,
+                 pool_idle_timeout=0, pool_max_lifetime=0,
+                 pool_validation='ping', pool_validation_interval=0,
                  **kwargs):
         """Initialize
 
@@ -142,23 +206,48 @@ class MySQLConnectionPool(object):
         connections set to pool_size. The rest of the keywords
         arguments, kwargs, are configuration arguments for MySQLConnection
         instances.
+
+        When all connections are in use, get_connection() waits up to
+        pool_timeout seconds for one to be added back.
         """
         self._pool_size = None
+        self._pool_min_size = None
         self._pool_name = None
+        self._pool_timeout = None
+        self._validation = None
         self._reset_session = pool_reset_session
-        self._set_pool_size(pool_size)
+        self._set_pool_size(pool_max_size or pool_size)
+        self._set_pool_min_size(pool_min_size)
         self._set_pool_name(pool_name or generate_pool_name(**kwargs))
+        self._set_pool_timeout(pool_timeout)
+        self._idle_timeout = _seconds(pool_idle_timeout, "Pool idle timeout")
+        self._max_lifetime = _seconds(pool_max_lifetime, "Pool max lifetime")
+        self._set_pool_validation(pool_validation)
+        self._validation_interval = _seconds(pool_validation_interval,
+                                             "Pool validation interval")
         self._cnx_config = {}
-        self._cnx_queue = queue.Queue(self._pool_size)
+        self._cnx_queue = queue.LifoQueue(self._pool_size)
+        self._cnx_waiters = deque()
+        self._cnx_count = 0
         self._config_version = uuid4()
+        self._lock = threading.RLock()
 
         if kwargs:
             self.set_config(**kwargs)
             cnt = 0
-            while cnt < self._pool_size:
+            while cnt < self._pool_min_size:
                 self.add_connection()
                 cnt += 1
 
+        intervals = [seconds for seconds in (self._idle_timeout,
+                                             self._max_lifetime) if seconds]
+        if intervals:
+            thread = threading.Thread(
+                target=_maintain_pool,
+                args=(weakref.ref(self), min(intervals) / 2))
+            thread.daemon = True
+            thread.start()
+
     @property
     def pool_name(self):
         """Return the name of the connection pool"""
@@ -169,11 +258,21 @@ class MySQLConnectionPool(object):
         """Return number of connections managed by the pool"""
         return self._pool_size
 
+    @property
+    def pool_min_size(self):
+        """Return number of connections the pool keeps open"""
+        return self._pool_min_size
+
     @property
     def reset_session(self):
         """Return whether to reset session"""
         return self._reset_session
 
+    @property
+    def pool_timeout(self):
+        """Return number of seconds get_connection() waits by default"""
+        return self._pool_timeout
+
     def set_config(self, **kwargs):
         """Set the connection configuration for MySQLConnection instances
 
@@ -186,7 +285,7 @@ class MySQLConnectionPool(object):
         if not kwargs:
             return
 
-        with CONNECTION_POOL_LOCK:
+        with self._lock:
             try:
                 test_cnx = MySQLConnection()
                 test_cnx.config(**kwargs)
@@ -210,6 +309,22 @@ class MySQLConnectionPool(object):
                 "lower or equal to {0}".format(CNX_POOL_MAXSIZE))
         self._pool_size = pool_size
 
+    def _set_pool_min_size(self, pool_min_size):
+        """Set the number of connections the pool keeps open
+
+        When pool_min_size is None, the size of the pool is used.
+
+        Raises an AttributeError when pool_min_size is negative or higher
+        than the size of the pool.
+        """
+        if pool_min_size is None:
+            pool_min_size = self._pool_size
+        if pool_min_size < 0 or pool_min_size > self._pool_size:
+            raise AttributeError(
+                "Pool minimum size should be 0 or higher and "
+                "lower or equal to {0}".format(self._pool_size))
+        self._pool_min_size = pool_min_size
+
     def _set_pool_name(self, pool_name):
         r"""Set the name of the pool
 
@@ -226,6 +341,43 @@ class MySQLConnectionPool(object):
                 "Pool name '{0}' is too long".format(pool_name))
         self._pool_name = pool_name
 
+    def _set_pool_timeout(self, pool_timeout):
+        """Set the time get_connection() waits by default
+
+        Raises an AttributeError when pool_timeout is not a number or is
+        negative.
+        """
+        self._pool_timeout = _seconds(pool_timeout, "Pool timeout")
+
+    def _set_pool_validation(self, pool_validation):
+        """Set how connections are checked when handed out
+
+        Raises an AttributeError when pool_validation is not one of
+        CNX_POOL_VALIDATIONS.
+        """
+        if pool_validation not in CNX_POOL_VALIDATIONS:
+            raise AttributeError(
+                "Pool validation should be one of {0}".format(
+                    ', '.join(CNX_POOL_VALIDATIONS)))
+        self._validation = pool_validation
+
+    def _can_open_connection(self):
+        """Return whether get_connection() can open a new connection
+
+        It will not acquire a lock as the methods using it will have it set.
+        """
+        return (self._pool_min_size < self._pool_size
+                and self._cnx_count < self._pool_size)
+
+    def _notify_waiter(self):
+        """Wake the caller waiting longest for a connection
+
+        It will not acquire a lock as the methods using it will have it set.
+        """
+        if self._cnx_waiters and (not self._cnx_queue.empty()
+                                  or self._can_open_connection()):
+            self._cnx_waiters[0].notify()
+
     def _queue_connection(self, cnx):
         """Put connection back in the queue
 
@@ -239,11 +391,150 @@ class MySQLConnectionPool(object):
             raise errors.PoolError(
                 "Connection instance not subclass of MySQLConnection.")
 
+        # pylint: disable=W0201,W0212
+        if not hasattr(cnx, '_pool_connected'):
+            cnx._pool_connected = time()
+        cnx._pool_last_used = time()
+        # pylint: enable=W0201,W0212
         try:
             self._cnx_queue.put(cnx, block=False)
         except queue.Full:
             errors.PoolError("Failed adding connection; queue is full")
 
+        self._notify_waiter()
+
+    def _get_queued_connection(self, timeout):
+        """Get a connection from the queue
+
+        When the queue is empty and the pool can not open a new
+        connection, this waits up to timeout seconds for a connection to
+        be put back. Waiting callers get connections in the order they
+        asked for them. It will not acquire a lock as get_connection() has
+        it set.
+
+        Raises PoolError when no connection is available in time.
+
+        Returns a MySQLConnection instance, or None when the caller should
+        open a new connection.
+        """
+        def available():
+            """Return whether a connection can be handed out"""
+            return not self._cnx_queue.empty() or self._can_open_connection()
+
+        if self._cnx_waiters or not available():
+            if timeout <= 0:
+                raise errors.PoolError(
+                    "Failed getting connection; pool exhausted")
+
+            waiter = threading.Condition(self._lock)
+            self._cnx_waiters.append(waiter)
+            try:
+                deadline = time() + timeout
+                while self._cnx_waiters[0] is not waiter or not available():
+                    remaining = deadline - time()
+                    if remaining <= 0:
+                        raise errors.PoolError(
+                            "Failed getting connection; pool exhausted")
+                    waiter.wait(remaining)
+            finally:
+                self._cnx_waiters.remove(waiter)
+
+        if not self._cnx_queue.empty():
+            cnx = self._cnx_queue.get(block=False)
+        else:
+            self._cnx_count += 1
+            cnx = None
+        self._notify_waiter()
+        return cnx
+
+    def _open_connection(self, cnx_config, config_version):
+        """Open a new connection counted in the pool
+
+        The caller has counted the connection in _cnx_count; when opening
+        fails, it is uncounted.
+
+        Returns a MySQLConnection instance.
+        """
+        try:
+            cnx = MySQLConnection(**cnx_config)
+            try:
+                if (self._reset_session and cnx_config['compress']
+                        and cnx.get_server_version() < (5, 7, 3)):
+                    raise errors.NotSupportedError("Pool reset session is "
+                                                   "not supported with "
+                                                   "compression for MySQL "
+                                                   "server version 5.7.2 "
+                                                   "or earlier.")
+            except KeyError:
+                pass
+        except:
+            with self._lock:
+                self._cnx_count -= 1
+                self._notify_waiter()
+            raise
+
+        # pylint: disable=W0201,W0212
+        cnx._pool_config_version = config_version
+        cnx._pool_connected = time()
+        # pylint: enable=W0201,W0212
+        return cnx
+
+    def _reconnect(self, cnx, cnx_config, config_version):
+        """Reconnect a connection of the pool
+
+        When reconnecting fails, the connection is put back in the queue.
+        """
+        cnx.config(**cnx_config)
+        try:
+            cnx.reconnect()
+        except errors.InterfaceError:
+            # Failed to reconnect, give connection back to pool
+            with self._lock:
+                self._queue_connection(cnx)
+            raise
+        # pylint: disable=W0201,W0212
+        cnx._pool_config_version = config_version
+        cnx._pool_connected = time()
+        # pylint: enable=W0201,W0212
+
+    def _recycle_connection(self, cnx, cnx_config, config_version):
+        """Reconnect a connection taken from the queue and put it back
+
+        When reconnecting fails, the connection is put back as well and
+        reconnected again when handed out.
+
+        Returns True when reconnecting succeeded, False otherwise.
+        """
+        try:
+            self._reconnect(cnx, cnx_config, config_version)
+        except errors.InterfaceError:
+            return False
+        with self._lock:
+            self._queue_connection(cnx)
+        return True
+
+    def _is_valid(self, cnx):
+        """Return whether an idle connection can be handed out
+
+        The connection is checked following pool_validation.
+        """
+        # pylint: disable=W0212
+        if self._validation == 'none':
+            return True
+        if self._validation == 'probe':
+            return cnx._socket is not None and cnx._socket.is_alive()
+        if time() - cnx._pool_last_used < self._validation_interval:
+            return True
+        # pylint: enable=W0212
+        return cnx.is_connected()
+
+    def _is_expired(self, cnx):
+        """Return whether the connection exceeds pool_max_lifetime"""
+        # pylint: disable=W0212
+        return (self._max_lifetime > 0 and
+                time() - cnx._pool_connected >= self._max_lifetime)
+        # pylint: enable=W0212
+
     def add_connection(self, cnx=None):
         """Add a connection to the pool
 
@@ -253,77 +544,155 @@ class MySQLConnectionPool(object):
         If cnx is a MySQLConnection instance, it will be added to the
         queue.
 
+        The new connection is opened without holding the lock of the pool.
+
         Raises PoolError when no configuration is set, when no more
         connection can be added (maximum reached) or when the connection
         can not be instantiated.
         """
-        with CONNECTION_POOL_LOCK:
+        with self._lock:
             if not self._cnx_config:
                 raise errors.PoolError(
                     "Connection configuration not available")
 
-            if self._cnx_queue.full():
+            if self._cnx_queue.full() or (
+                    not cnx and self._cnx_count >= self._pool_size):
                 raise errors.PoolError(
                     "Failed adding connection; queue is full")
 
             if not cnx:
-                cnx = MySQLConnection(**self._cnx_config)
-                try:
-                    if (self._reset_session and self._cnx_config['compress']
-                            and cnx.get_server_version() < (5, 7, 3)):
-                        raise errors.NotSupportedError("Pool reset session is "
-                                                       "not supported with "
-                                                       "compression for MySQL "
-                                                       "server version 5.7.2 "
-                                                       "or earlier.")
-                except KeyError:
-                    pass
-
-                # pylint: disable=W0201,W0212
-                cnx._pool_config_version = self._config_version
-                # pylint: enable=W0201,W0212
-            else:
-                if not isinstance(cnx, MySQLConnection):
-                    raise errors.PoolError(
-                        "Connection instance not subclass of MySQLConnection.")
+                self._cnx_count += 1
+            cnx_config = self._cnx_config
+            config_version = self._config_version
+
+        if not cnx:
+            cnx = self._open_connection(cnx_config, config_version)
+        else:
+            if not isinstance(cnx, MySQLConnection):
+                raise errors.PoolError(
+                    "Connection instance not subclass of MySQLConnection.")
 
+        with self._lock:
             self._queue_connection(cnx)
 
-    def get_connection(self):
+    def get_connection(self, timeout=None):
         """Get a connection from the pool
 
         This method returns an PooledMySQLConnection instance which
         has a reference to the pool that created it, and the next available
         MySQL connection.
 
-        When the MySQL connection is not connect, a reconnect is attempted.
+        When no connection is available and the pool can not open a new
+        one, this waits up to timeout seconds, or pool_timeout when timeout
+        is None, for one to be added back. Callers waiting at the same time
+        get connections in the order they asked for them.
+
+        When the MySQL connection is older than pool_max_lifetime, or
+        fails the check set by pool_validation, a reconnect is attempted.
+        A connection failing the check is reconnected in the background
+        when another idle connection can be handed out instead. Opening,
+        checking and reconnecting are done without holding the lock of
+        the pool.
 
         Raises PoolError on errors.
 
         Returns a PooledMySQLConnection instance.
         """
-        with CONNECTION_POOL_LOCK:
-            try:
-                cnx = self._cnx_queue.get(block=False)
-            except queue.Empty:
-                raise errors.PoolError(
-                    "Failed getting connection; pool exhausted")
+        if timeout is None:
+            timeout = self._pool_timeout
 
-            # pylint: disable=W0201,W0212
-            if not cnx.is_connected() \
-                    or self._config_version != cnx._pool_config_version:
-                cnx.config(**self._cnx_config)
-                try:
-                    cnx.reconnect()
-                except errors.InterfaceError:
-                    # Failed to reconnect, give connection back to pool
-                    self._queue_connection(cnx)
-                    raise
-                cnx._pool_config_version = self._config_version
-            # pylint: enable=W0201,W0212
+        while True:
+            with self._lock:
+                if not self._cnx_config:
+                    raise errors.PoolError(
+                        "Connection configuration not available")
+                cnx = self._get_queued_connection(timeout)
+                cnx_config = self._cnx_config
+                config_version = self._config_version
+
+            if cnx is None:
+                cnx = self._open_connection(cnx_config, config_version)
+            # pylint: disable=W0212
+            elif (self._is_expired(cnx)
+                  or config_version != cnx._pool_config_version):
+                self._reconnect(cnx, cnx_config, config_version)
+            # pylint: enable=W0212
+            elif not self._is_valid(cnx):
+                with self._lock:
+                    spare = not self._cnx_queue.empty()
+                if spare:
+                    thread = threading.Thread(
+                        target=self._recycle_connection,
+                        args=(cnx, cnx_config, config_version))
+                    thread.daemon = True
+                    thread.start()
+                    continue
+                self._reconnect(cnx, cnx_config, config_version)
 
             return PooledMySQLConnection(self, cnx)
 
+    def _get_idle_connections(self):
+        """Take all connections out of the queue
+
+        It will not acquire a lock as the methods using it will have it set.
+
+        Returns a list of MySQLConnection instances, least recently used
+        first.
+        """
+        idle = []
+        while not self._cnx_queue.empty():
+            idle.append(self._cnx_queue.get(block=False))
+        idle.reverse()
+        return idle
+
+    def _maintain_connections(self):
+        """Close idle and recycle old connections
+
+        Connections idle for pool_idle_timeout seconds are closed, keeping
+        pool_min_size connections. Connections older than
+        pool_max_lifetime are reconnected one at a time, so the others
+        stay available. Both are done without holding the lock of the
+        pool.
+        """
+        evicted = []
+        with self._lock:
+            now = time()
+            for cnx in self._get_idle_connections():
+                # pylint: disable=W0212
+                if (self._idle_timeout > 0 and
+                        now - cnx._pool_last_used >= self._idle_timeout and
+                        self._cnx_count > self._pool_min_size):
+                    self._cnx_count -= 1
+                    evicted.append(cnx)
+                else:
+                    self._cnx_queue.put(cnx, block=False)
+                # pylint: enable=W0212
+            self._notify_waiter()
+
+        for cnx in evicted:
+            try:
+                cnx.disconnect()
+            except errors.Error:
+                # Any error when closing means connection is closed
+                pass
+
+        while True:
+            expired = None
+            with self._lock:
+                for cnx in self._get_idle_connections():
+                    if expired is None and self._is_expired(cnx):
+                        expired = cnx
+                    else:
+                        self._cnx_queue.put(cnx, block=False)
+                cnx_config = self._cnx_config
+                config_version = self._config_version
+            if expired is None:
+                return
+
+            if not self._recycle_connection(expired, cnx_config,
+                                            config_version):
+                return
+
     def _remove_connections(self):
         """Close all connections
 
@@ -334,20 +703,25 @@ class MySQLConnectionPool(object):
 
         Returns int.
         """
-        with CONNECTION_POOL_LOCK:
-            cnt = 0
+        cnxs = []
+        with self._lock:
             cnxq = self._cnx_queue
             while cnxq.qsize():
                 try:
-                    cnx = cnxq.get(block=False)
-                    cnx.disconnect()
-                    cnt += 1
+                    cnxs.append(cnxq.get(block=False))
                 except queue.Empty:
-                    return cnt
-                except errors.PoolError:
-                    raise
-                except errors.Error:
-                    # Any other error when closing means connection is closed
-                    pass
-
-            return cnt
+                    break
+            self._cnx_count -= len(cnxs)
+
+        cnt = 0
+        for cnx in cnxs:
+            try:
+                cnx.disconnect()
+                cnt += 1
+            except errors.PoolError:
+                raise
+            except errors.Error:
+                # Any other error when closing means connection is closed
+                pass
+
+        return cnt
@@ -29,10 +29,10 @@ import datetime
 from decimal import Decimal
 
 from .constants import (
-    FieldFlag, ServerCmd, FieldType, ClientFlag)
+    FieldFlag, ServerCmd, FieldType, ClientFlag, ServerFlag, SessionStateType)
 from . import errors, utils
 from .authentication import get_auth_plugin
-from .catch23 import PY2, struct_unpack
+from .catch23 import PY2, struct_unpack, struct_unpack_from
 from .errors import get_exception
 
 
@@ -74,7 +74,7 @@ class MySQLProtocol(object):
     def make_auth(self, handshake, username=None, password=None, database=None,
                   charset=33, client_flags=0,
                   max_allowed_packet=1073741824, ssl_enabled=False,
-                  auth_plugin=None):
+                  auth_plugin=None, zstd_level=3):
         """Make a MySQL Authentication packet"""
 
         try:
@@ -106,6 +106,9 @@ class MySQLProtocol(object):
         if client_flags & ClientFlag.PLUGIN_AUTH:
             packet += auth_plugin.encode('utf8') + b'\x00'
 
+        if client_flags & ClientFlag.ZSTD_COMPRESSION_ALGORITHM:
+            packet += struct.pack('<B', zstd_level)
+
         return packet
 
     def make_auth_ssl(self, charset=33, client_flags=0,
@@ -204,25 +207,82 @@ class MySQLProtocol(object):
         return res
 
     def parse_ok(self, packet):
-        """Parse a MySQL OK-packet"""
+        """Parse a MySQL OK-packet
+
+        When the MySQL server reports session state changes, which it does
+        for clients using the CLIENT_SESSION_TRACK capability, they are
+        parsed into the session_state item; see parse_session_state().
+        """
         if not packet[4] == 0:
             raise errors.InterfaceError("Failed parsing OK packet (invalid).")
 
         ok_packet = {}
         try:
-            ok_packet['field_count'] = struct_unpack('<xxxxB', packet[0:5])[0]
-            (packet, ok_packet['affected_rows']) = utils.read_lc_int(packet[5:])
-            (packet, ok_packet['insert_id']) = utils.read_lc_int(packet)
+            ok_packet['field_count'] = packet[4]
+            (pos, ok_packet['affected_rows']) = utils.read_lc_int_at(packet, 5)
+            (pos, ok_packet['insert_id']) = utils.read_lc_int_at(packet, pos)
             (ok_packet['status_flag'],
-             ok_packet['warning_count']) = struct_unpack('<HH', packet[0:4])
-            packet = packet[4:]
-            if packet:
-                (packet, ok_packet['info_msg']) = utils.read_lc_string(packet)
-                ok_packet['info_msg'] = ok_packet['info_msg'].decode('utf-8')
-        except ValueError:
+             ok_packet['warning_count']) = struct_unpack_from('<HH', packet,
+                                                              pos)
+            pos += 4
+            if pos < len(packet):
+                (pos, info_msg) = utils.read_lc_string_at(packet, pos)
+                ok_packet['info_msg'] = info_msg.decode('utf-8')
+            if (ok_packet['status_flag'] & ServerFlag.SESSION_STATE_CHANGED
+                    and pos < len(packet)):
+                (pos, state) = utils.read_lc_string_at(packet, pos)
+                ok_packet['session_state'] = self.parse_session_state(state)
+        except (ValueError, struct.error):
             raise errors.InterfaceError("Failed parsing OK packet.")
         return ok_packet
 
+    def parse_session_state(self, data):
+        """Parse the session state changes of a MySQL OK-packet
+
+        The result is a dictionary which holds, when they changed:
+          system_variables: dictionary with the tracked system variables
+          schema: the current database
+          state_change: whether the session state changed
+          gtids: GTIDs of the transactions committed
+          transaction_characteristics: statements to restart the
+            transaction
+          transaction_state: the transaction state as reported by the
+            MySQL server
+
+        Unknown types of changes are skipped.
+
+        Returns a dict()
+        """
+        def decode(value):
+            """Decode a string, keeping NULL as None"""
+            return None if value is None else value.decode('utf-8')
+
+        state = {}
+        pos = 0
+        while pos < len(data):
+            state_type = data[pos]
+            (pos, value) = utils.read_lc_string_at(data, pos + 1)
+            if state_type == SessionStateType.SYSTEM_VARIABLES:
+                (vpos, name) = utils.read_lc_string_at(value, 0)
+                variables = state.setdefault('system_variables', {})
+                variables[decode(name)] = decode(
+                    utils.read_lc_string_at(value, vpos)[1])
+            elif state_type == SessionStateType.SCHEMA:
+                state['schema'] = decode(utils.read_lc_string_at(value, 0)[1])
+            elif state_type == SessionStateType.STATE_CHANGE:
+                state['state_change'] = (
+                    utils.read_lc_string_at(value, 0)[1] == b'1')
+            elif state_type == SessionStateType.GTIDS:
+                # First byte is the encoding specification
+                state['gtids'] = decode(utils.read_lc_string_at(value, 1)[1])
+            elif state_type == SessionStateType.TRANSACTION_CHARACTERISTICS:
+                state['transaction_characteristics'] = decode(
+                    utils.read_lc_string_at(value, 0)[1])
+            elif state_type == SessionStateType.TRANSACTION_STATE:
+                state['transaction_state'] = decode(
+                    utils.read_lc_string_at(value, 0)[1])
+        return state
+
     def parse_column_count(self, packet):
         """Parse a MySQL packet with the number of columns in result set"""
         try:
@@ -233,17 +293,16 @@ class MySQLProtocol(object):
 
     def parse_column(self, packet, charset='utf-8'):
         """Parse a MySQL column-packet"""
-        (packet, _) = utils.read_lc_string(packet[4:])  # catalog
-        (packet, _) = utils.read_lc_string(packet)  # db
-        (packet, _) = utils.read_lc_string(packet)  # table
-        (packet, _) = utils.read_lc_string(packet)  # org_table
-        (packet, name) = utils.read_lc_string(packet)  # name
-        (packet, _) = utils.read_lc_string(packet)  # org_name
-
         try:
+            pos = utils.skip_lc_string_at(packet, 4)  # catalog
+            pos = utils.skip_lc_string_at(packet, pos)  # db
+            pos = utils.skip_lc_string_at(packet, pos)  # table
+            pos = utils.skip_lc_string_at(packet, pos)  # org_table
+            (pos, name) = utils.read_lc_string_at(packet, pos)  # name
+            pos = utils.skip_lc_string_at(packet, pos)  # org_name
             (_, _, field_type,
-             flags, _) = struct_unpack('<xHIBHBxx', packet)
-        except struct.error:
+             flags, _) = struct_unpack_from('<xHIBHBxx', packet, pos)
+        except (struct.error, ValueError):
             raise errors.InterfaceError("Failed parsing column information")
 
         return (
@@ -333,7 +392,7 @@ class MySQLProtocol(object):
                 rowdata = None
             else:
                 eof = None
-                rowdata = utils.read_lc_string_list(packet[4:])
+                rowdata = utils.read_lc_string_list(packet, 4)
             if eof is None and rowdata is not None:
                 rows.append(rowdata)
             elif eof is None and rowdata is None:
@@ -341,8 +400,8 @@ class MySQLProtocol(object):
             i += 1
         return rows, eof
 
-    def _parse_binary_integer(self, packet, field):
-        """Parse an integer from a binary packet"""
+    def _read_binary_integer(self, packet, pos, field):
+        """Read an integer from a binary packet starting at position pos"""
         if field[1] == FieldType.TINY:
             format_ = 'b'
             length = 1
@@ -359,10 +418,15 @@ class MySQLProtocol(object):
         if field[7] & FieldFlag.UNSIGNED:
             format_ = format_.upper()
 
-        return (packet[length:], struct_unpack(format_, packet[0:length])[0])
+        return (pos + length, struct_unpack_from(format_, packet, pos)[0])
 
-    def _parse_binary_float(self, packet, field):
-        """Parse a float/double from a binary packet"""
+    def _parse_binary_integer(self, packet, field):
+        """Parse an integer from a binary packet"""
+        (pos, value) = self._read_binary_integer(packet, 0, field)
+        return (packet[pos:], value)
+
+    def _read_binary_float(self, packet, pos, field):
+        """Read a float/double from a binary packet starting at pos"""
         if field[1] == FieldType.DOUBLE:
             length = 8
             format_ = 'd'
@@ -370,78 +434,99 @@ class MySQLProtocol(object):
             length = 4
             format_ = 'f'
 
-        return (packet[length:], struct_unpack(format_, packet[0:length])[0])
+        return (pos + length, struct_unpack_from(format_, packet, pos)[0])
 
-    def _parse_binary_timestamp(self, packet, field):
-        """Parse a timestamp from a binary packet"""
-        length = packet[0]
+    def _parse_binary_float(self, packet, field):
+        """Parse a float/double from a binary packet"""
+        (pos, value) = self._read_binary_float(packet, 0, field)
+        return (packet[pos:], value)
+
+    def _read_binary_timestamp(self, packet, pos, field):
+        """Read a timestamp from a binary packet starting at position pos"""
+        length = packet[pos]
         value = None
         if length == 4:
             value = datetime.date(
-                year=struct_unpack('H', packet[1:3])[0],
-                month=packet[3],
-                day=packet[4])
+                year=packet[pos + 1] | packet[pos + 2] << 8,
+                month=packet[pos + 3],
+                day=packet[pos + 4])
         elif length >= 7:
             mcs = 0
             if length == 11:
-                mcs = struct_unpack('I', packet[8:length + 1])[0]
+                mcs = struct_unpack_from('<I', packet, pos + 8)[0]
             value = datetime.datetime(  # pylint: disable=R0204
-                year=struct_unpack('H', packet[1:3])[0],
-                month=packet[3],
-                day=packet[4],
-                hour=packet[5],
-                minute=packet[6],
-                second=packet[7],
+                year=packet[pos + 1] | packet[pos + 2] << 8,
+                month=packet[pos + 3],
+                day=packet[pos + 4],
+                hour=packet[pos + 5],
+                minute=packet[pos + 6],
+                second=packet[pos + 7],
                 microsecond=mcs)
 
-        return (packet[length + 1:], value)
+        return (pos + length + 1, value)
 
-    def _parse_binary_time(self, packet, field):
-        """Parse a time value from a binary packet"""
-        length = packet[0]
-        data = packet[1:length + 1]
+    def _parse_binary_timestamp(self, packet, field):
+        """Parse a timestamp from a binary packet"""
+        (pos, value) = self._read_binary_timestamp(packet, 0, field)
+        return (packet[pos:], value)
+
+    def _read_binary_time(self, packet, pos, field):
+        """Read a time value from a binary packet starting at position pos"""
+        length = packet[pos]
+        if length == 0:
+            # TIME '00:00:00' is sent without any value bytes
+            return (pos + 1, datetime.timedelta(0))
         mcs = 0
         if length > 8:
-            mcs = struct_unpack('I', data[8:])[0]
-        days = struct_unpack('I', data[1:5])[0]
-        if data[0] == 1:
+            mcs = struct_unpack_from('<I', packet, pos + 9)[0]
+        days = struct_unpack_from('<I', packet, pos + 2)[0]
+        if packet[pos + 1] == 1:
             days *= -1
         tmp = datetime.timedelta(days=days,
-                                 seconds=data[7],
+                                 seconds=packet[pos + 8],
                                  microseconds=mcs,
-                                 minutes=data[6],
-                                 hours=data[5])
+                                 minutes=packet[pos + 7],
+                                 hours=packet[pos + 6])
 
-        return (packet[length + 1:], tmp)
+        return (pos + length + 1, tmp)
 
-    def _parse_binary_values(self, fields, packet):
-        """Parse values from a binary result packet"""
+    def _parse_binary_time(self, packet, field):
+        """Parse a time value from a binary packet"""
+        (pos, value) = self._read_binary_time(packet, 0, field)
+        return (packet[pos:], value)
+
+    def _parse_binary_values(self, fields, packet, offset=0):
+        """Parse values from a binary result packet
+
+        Values are read starting at position offset of the packet; only
+        the values themselves are copied out of the packet.
+        """
         null_bitmap_length = (len(fields) + 7 + 2) // 8
-        null_bitmap = [int(i) for i in packet[0:null_bitmap_length]]
-        packet = packet[null_bitmap_length:]
+        null_bitmap = packet[offset:offset + null_bitmap_length]
+        pos = offset + null_bitmap_length
 
         values = []
-        for pos, field in enumerate(fields):
-            if null_bitmap[int((pos+2)/8)] & (1 << (pos + 2) % 8):
+        for i, field in enumerate(fields):
+            if null_bitmap[(i + 2) // 8] & (1 << (i + 2) % 8):
                 values.append(None)
                 continue
             elif field[1] in (FieldType.TINY, FieldType.SHORT,
                               FieldType.INT24,
                               FieldType.LONG, FieldType.LONGLONG):
-                (packet, value) = self._parse_binary_integer(packet, field)
+                (pos, value) = self._read_binary_integer(packet, pos, field)
                 values.append(value)
             elif field[1] in (FieldType.DOUBLE, FieldType.FLOAT):
-                (packet, value) = self._parse_binary_float(packet, field)
+                (pos, value) = self._read_binary_float(packet, pos, field)
                 values.append(value)
             elif field[1] in (FieldType.DATETIME, FieldType.DATE,
                               FieldType.TIMESTAMP):
-                (packet, value) = self._parse_binary_timestamp(packet, field)
+                (pos, value) = self._read_binary_timestamp(packet, pos, field)
                 values.append(value)
             elif field[1] == FieldType.TIME:
-                (packet, value) = self._parse_binary_time(packet, field)
+                (pos, value) = self._read_binary_time(packet, pos, field)
                 values.append(value)
             else:
-                (packet, value) = utils.read_lc_string(packet)
+                (pos, value) = utils.read_lc_string_at(packet, pos)
                 values.append(value)
 
         return tuple(values)
@@ -466,7 +551,7 @@ class MySQLProtocol(object):
                 values = None
             elif packet[4] == 0:
                 eof = None
-                values = self._parse_binary_values(columns, packet[5:])
+                values = self._parse_binary_values(columns, packet, 5)
             if eof is None and values is not None:
                 rows.append(values)
             elif eof is None and values is None:
@@ -615,8 +700,15 @@ class MySQLProtocol(object):
         return packet
 
     def make_stmt_execute(self, statement_id, data=(), parameters=(),
-                          flags=0, long_data_used=None, charset='utf8'):
-        """Make a MySQL packet with the Statement Execute command"""
+                          flags=0, long_data_used=None, charset='utf8',
+                          bound_types=None):
+        """Make a MySQL packet with the Statement Execute command
+
+        When bound_types is a list, it holds the parameter types sent with
+        the previous execution of the statement. If the types did not
+        change, they are not sent again and the new-params-bound flag is
+        not set; otherwise the list is updated with the new types.
+        """
         iteration_count = 1
         null_bitmap = [0] * ((len(data) + 7) // 8)
         values = []
@@ -631,11 +723,11 @@ class MySQLProtocol(object):
                     " match number of parameters")
             for pos, _ in enumerate(parameters):
                 value = data[pos]
-                flags = 0
+                field_flags = 0
                 if value is None:
                     null_bitmap[(pos // 8)] |= 1 << (pos % 8)
                     types.append(utils.int1store(FieldType.NULL) +
-                                 utils.int1store(flags))
+                                 utils.int1store(field_flags))
                     continue
                 elif pos in long_data_used:
                     if long_data_used[pos][0]:
@@ -646,7 +738,7 @@ class MySQLProtocol(object):
                         field_type = FieldType.STRING
                 elif isinstance(value, int):
                     (packed, field_type,
-                     flags) = self._prepare_binary_integer(value)
+                     field_flags) = self._prepare_binary_integer(value)
                     values.append(packed)
                 elif isinstance(value, str):
                     if PY2:
@@ -686,23 +778,29 @@ class MySQLProtocol(object):
                         "'{classname}' objects".format(
                             classname=value.__class__.__name__))
                 types.append(utils.int1store(field_type) +
-                             utils.int1store(flags))
+                             utils.int1store(field_flags))
+
+        new_params_bound = 1
+        if bound_types is not None:
+            if types and types == bound_types:
+                new_params_bound = 0
+                types = []
+            else:
+                bound_types[:] = types
 
         packet = (
             utils.int4store(statement_id) +
             utils.int1store(flags) +
             utils.int4store(iteration_count) +
             b''.join([struct.pack('B', bit) for bit in null_bitmap]) +
-            utils.int1store(1)
+            utils.int1store(new_params_bound)
         )
 
-        for a_type in types:
-            packet += a_type
+        return packet + b''.join(types) + b''.join(values)
 
-        for a_value in values:
-            packet += a_value
-
-        return packet
+    def make_stmt_fetch(self, statement_id, rows=1):
+        """Make a MySQL packet with the Statement Fetch command"""
+        return utils.int4store(statement_id) + utils.int4store(rows)
 
     def parse_auth_switch_request(self, packet):
         """Parse a MySQL AuthSwitchRequest-packet"""
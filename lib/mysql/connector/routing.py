@@ -0,0 +1,580 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Implementing read/write splitting over a primary and its replicas
+"""
+
+import logging
+import re
+import threading
+from time import time
+
+from . import errors
+from .constants import CNX_POOL_ARGS
+from .cursor import (
+    CursorBase, MySQLCursorBuffered, MySQLCursorBufferedRaw,
+    MySQLCursorBufferedDict, MySQLCursorBufferedNamedTuple)
+from .fabric.balancing import WeightedRoundRobin
+from .pooling import MySQLConnectionPool, generate_pool_name
+
+_LOGGER = logging.getLogger('myconnpy-routing')
+
+REPLICA_ARGS = ('user', 'password', 'host', 'port', 'unix_socket',
+                'database', 'weight')
+
+# SELECT statements, optionally preceded by comments or a parenthesis
+_SELECT_STATEMENT = re.compile(r'^\s*(?:/\*.*?\*/\s*)*\(?\s*SELECT\b',
+                               re.I | re.S)
+# Reads which lock rows or write, and reads of the session state
+_PRIMARY_SELECT = re.compile(
+    r'\bFOR\s+(?:UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bINTO\b|@|'
+    r'\b(?:LAST_INSERT_ID|FOUND_ROWS|ROW_COUNT|CONNECTION_ID|GET_LOCK|'
+    r'RELEASE_LOCK|RELEASE_ALL_LOCKS|IS_FREE_LOCK|IS_USED_LOCK)\s*\(',
+    re.I)
+# Statements changing the session which can be repeated on replicas
+_SESSION_STATEMENT = re.compile(
+    r'^\s*(?:/\*.*?\*/\s*)*(?:USE\b|SET\s+'
+    r'(?!(?:GLOBAL|PERSIST|PERSIST_ONLY|TRANSACTION|PASSWORD|DEFAULT)\b)'
+    r'(?!@@(?:GLOBAL|PERSIST|PERSIST_ONLY)\.)(?!@[^@]))', re.I | re.S)
+# Statements creating session state which only exists on the primary
+_PRIMARY_SESSION_STATEMENT = re.compile(
+    r'^\s*(?:/\*.*?\*/\s*)*(?:(?:CREATE|DROP)\s+TEMPORARY\s+TABLES?|'
+    r'LOCK\s+TABLES?)\b', re.I | re.S)
+# Statements about the previous statement of the session
+_WARNINGS_STATEMENT = re.compile(
+    r'^\s*SHOW\s+(?:COUNT\s*\(\s*\*\s*\)\s+)?(?:WARNINGS|ERRORS)\b', re.I)
+
+
+def _statement_str(statement):
+    """Return the statement as string"""
+    if isinstance(statement, (bytes, bytearray)):
+        return statement.decode('utf-8', 'replace')
+    return statement
+
+
+def is_replica_statement(statement):
+    """Return whether a statement can be sent to a replica
+
+    SELECT statements can, unless they lock rows, write into variables or
+    files, or use user variables or functions returning session state,
+    like LAST_INSERT_ID().
+
+    Returns True or False.
+    """
+    statement = _statement_str(statement)
+    return bool(_SELECT_STATEMENT.match(statement)
+                and not _PRIMARY_SELECT.search(statement))
+
+
+class MySQLConnectionRouter(object):
+    """Class routing connections to a primary and its replica MySQL servers
+
+    The keyword arguments, kwargs, configure the connections to the
+    primary. Each replica is a dictionary of connection arguments
+    overriding those, like with the failover argument of connect(), and
+    an optional weight, which defaults to 1. Connection pooling arguments
+    apply to the pool of every server, except that replica pools only
+    open connections when needed.
+
+    Replicas are chosen using weighted round robin. With max_replica_lag
+    set, replicas are skipped when their Seconds_Behind_Master exceeds
+    that many seconds, or when replication is not running. The lag of a
+    replica is checked at most once every replica_lag_interval seconds.
+    When no replica is available, reads are sent to the primary.
+    """
+    def __init__(self, replicas=None, max_replica_lag=None,
+                 replica_lag_interval=1, **kwargs):
+        """Initialize
+
+        Raises ValueError when a replica has an unsupported connection
+        argument or when a weight is not valid.
+        """
+        config = kwargs.copy()
+        config.pop('use_pure', None)
+        pool_config = {}
+        for key in CNX_POOL_ARGS:
+            if key in config:
+                pool_config[key] = config.pop(key)
+        name = pool_config.pop('pool_name', None) or generate_pool_name(
+            **config)
+
+        self._max_replica_lag = max_replica_lag
+        self._replica_lag_interval = replica_lag_interval
+        self._lock = threading.RLock()
+        self._lag_checks = {}
+
+        pool_config.update(config)
+        self._primary = MySQLConnectionPool(
+            pool_name='{0}:primary'.format(name[:48]), **pool_config)
+
+        self._replicas = []
+        members = []
+        for i, replica in enumerate(replicas or []):
+            diff = set(replica.keys()) - set(REPLICA_ARGS)
+            if diff:
+                raise ValueError(
+                    "Unsupported connection argument{0} in replicas: "
+                    "{1}".format('s' if len(diff) > 1 else '',
+                                 ', '.join(diff)))
+            replica_config = pool_config.copy()
+            replica_config.update(replica)
+            # Connect lazily so an unreachable replica is only skipped
+            replica_config['pool_min_size'] = 0
+            weight = replica_config.pop('weight', 1)
+            try:
+                valid = float(weight) > 0
+            except (TypeError, ValueError):
+                valid = False
+            if not valid:
+                raise ValueError(
+                    "Weight of replica {0} should be a number higher "
+                    "than 0".format(i))
+            members.append((i, weight))
+            self._replicas.append(MySQLConnectionPool(
+                pool_name='{0}:replica{1}'.format(name[:48], i),
+                **replica_config))
+        self._balancer = WeightedRoundRobin(*members)
+
+    @property
+    def primary(self):
+        """Return the pool of the primary"""
+        return self._primary
+
+    @property
+    def replicas(self):
+        """Return the pools of the replicas"""
+        return self._replicas
+
+    def get_connection(self):
+        """Get a connection splitting reads and writes
+
+        Returns a RoutedMySQLConnection instance.
+        """
+        return RoutedMySQLConnection(self)
+
+    def _replica_lag(self, cnx):
+        """Return the number of seconds a replica is behind its primary
+
+        Returns an integer, or None when replication is not running.
+        """
+        cur = cnx.cursor(buffered=True, dictionary=True)
+        try:
+            cur.execute("SHOW SLAVE STATUS")
+            row = cur.fetchone()
+        finally:
+            cur.close()
+        if not row:
+            return None
+        return row['Seconds_Behind_Master']
+
+    def _is_lagging(self, index, cnx):
+        """Return whether a replica is too far behind its primary
+
+        The result is cached for replica_lag_interval seconds.
+        """
+        if self._max_replica_lag is None:
+            return False
+
+        with self._lock:
+            try:
+                checked, lagging = self._lag_checks[index]
+                if time() - checked < self._replica_lag_interval:
+                    return lagging
+            except KeyError:
+                pass
+
+        try:
+            lag = self._replica_lag(cnx)
+        except errors.Error:
+            # Do not check again, nor log the error, until the next interval
+            with self._lock:
+                self._lag_checks[index] = (time(), True)
+            raise
+        lagging = lag is None or lag > self._max_replica_lag
+        with self._lock:
+            self._lag_checks[index] = (time(), lagging)
+        return lagging
+
+    def get_replica_connection(self):
+        """Get a connection to a replica
+
+        Replicas are tried in the order given by weighted round robin.
+        Replicas which are lagging, can not be connected to or have no
+        connection available are skipped. Errors connecting to a replica
+        or checking its lag are logged as warnings by the logger
+        'myconnpy-routing'.
+
+        Returns a PooledMySQLConnection instance, or None when no replica
+        is available.
+        """
+        tried = set()
+        while len(tried) < len(self._replicas):
+            with self._lock:
+                index = self._balancer.get_next()[0]
+            if index in tried:
+                continue
+            tried.add(index)
+
+            try:
+                cnx = self._replicas[index].get_connection(timeout=0)
+            except errors.PoolError:
+                continue
+            except errors.Error as err:
+                _LOGGER.warning("Skipping replica %d: %s", index, err)
+                continue
+            try:
+                if not self._is_lagging(index, cnx):
+                    return cnx
+            except errors.Error as err:
+                _LOGGER.warning("Skipping replica %d, failed checking its "
+                                "lag: %s", index, err)
+            cnx.close()
+        return None
+
+
+class RoutedMySQLConnection(object):
+    """Connection splitting reads and writes over MySQL servers
+
+    RoutedMySQLConnection is returned by MySQLConnectionRouter. It works
+    like a MySQLConnection, sending each statement to a connection taken
+    from the pool of the primary or of a replica:
+
+      - SELECT statements are sent to a replica while the connection to
+        the primary is not in a transaction;
+      - after start_transaction(readonly=True), statements are sent to a
+        replica until commit() or rollback(); after start_transaction()
+        they are sent to the primary;
+      - all other statements are sent to the primary.
+
+    USE and SET statements, and setting the database, time_zone and
+    sql_mode properties or the character set, change the session of all
+    connections, including a connection to a replica taken later. After
+    creating or dropping a temporary table or locking tables, which only
+    affect the primary, all statements are sent to the primary.
+
+    Cursors are always buffered. A replica is chosen the first time one
+    is needed. The close()-method adds the connections back to their
+    pools.
+    """
+    def __init__(self, router):
+        """Initialize
+
+        The router argument must be an instance of MySQLConnectionRouter.
+        """
+        if not isinstance(router, MySQLConnectionRouter):
+            raise AttributeError(
+                "router should be a MySQLConnectionRouter")
+        self._router = router
+        self._primary_cnx = None
+        self._replica_cnx = None
+        self._active_cnx = None
+        self._transaction_cnx = None
+        self._autocommit = None
+        self._session_changes = []
+        self._pinned = False
+
+    def __getattr__(self, attr):
+        """Calls attributes of the connection used last"""
+        if attr.startswith('cmd_'):
+            raise errors.NotSupportedError(
+                "Calling {0} is not supported for routed "
+                "connections.".format(attr))
+        return getattr(self._get_active(), attr)
+
+    def _connections(self):
+        """Return the connections taken from the pools"""
+        return [cnx for cnx in (self._primary_cnx, self._replica_cnx)
+                if cnx is not None]
+
+    def _get_primary(self):
+        """Return the connection to the primary, taking it from its pool"""
+        if self._primary_cnx is None:
+            self._primary_cnx = self._router.primary.get_connection()
+            if self._autocommit is not None:
+                # Pooled connections do not pass on setting attributes
+                self._primary_cnx._cnx.autocommit = self._autocommit
+        return self._primary_cnx
+
+    def _get_replica(self):
+        """Return the connection to a replica
+
+        The connection to the primary is returned when no replica is
+        available.
+        """
+        if self._replica_cnx is None:
+            cnx = self._router.get_replica_connection()
+            if cnx is None:
+                return self._get_primary()
+            try:
+                if self._autocommit is not None:
+                    cnx._cnx.autocommit = self._autocommit
+                for change in self._session_changes:
+                    change(cnx._cnx)
+            except:
+                cnx.close()
+                raise
+            self._replica_cnx = cnx
+        return self._replica_cnx
+
+    def _get_active(self):
+        """Return the connection used last, or any connection"""
+        if self._active_cnx is not None:
+            return self._active_cnx
+        connections = self._connections()
+        return connections[0] if connections else self._get_primary()
+
+    def _change_session(self, change):
+        """Change the session of all connections
+
+        The change argument is a callable taking a MySQLConnection, not
+        the pooled connection, so properties can be set. It is applied to
+        the primary, to the replica used, and to a replica taken later.
+
+        Returns what the change returns for the primary.
+        """
+        cnx = self._get_primary()
+        result = change(cnx._cnx)
+        if self._replica_cnx is not None:
+            change(self._replica_cnx._cnx)
+        self._session_changes.append(change)
+        self._active_cnx = cnx
+        return result
+
+    def _route(self, statement):
+        """Return the connection a statement is sent to"""
+        if self._transaction_cnx is not None:
+            cnx = self._transaction_cnx
+        elif (self._active_cnx is not None and
+              _WARNINGS_STATEMENT.match(_statement_str(statement))):
+            cnx = self._active_cnx
+        elif self._pinned:
+            cnx = self._get_primary()
+        elif is_replica_statement(statement) and not (
+                self._primary_cnx is not None and
+                self._primary_cnx.in_transaction):
+            cnx = self._get_replica()
+        else:
+            cnx = self._get_primary()
+        self._active_cnx = cnx
+        return cnx
+
+    def is_connected(self):
+        """Return whether the connection can be used
+
+        Connections are taken from the pools when needed.
+        """
+        return self._router is not None
+
+    @property
+    def in_transaction(self):
+        """Return whether a transaction is active"""
+        return any(cnx.in_transaction for cnx in self._connections())
+
+    @property
+    def autocommit(self):
+        """Get whether autocommit is on or off"""
+        return self._get_active().autocommit
+
+    @autocommit.setter
+    def autocommit(self, value):
+        """Toggle autocommit on the connections used"""
+        self._autocommit = value
+        for cnx in self._connections():
+            cnx._cnx.autocommit = value
+
+    @property
+    def database(self):
+        """Get the current database"""
+        return self._get_active().database
+
+    @database.setter
+    def database(self, value):
+        """Set the current database of all connections"""
+        def change(cnx):
+            cnx.database = value
+        self._change_session(change)
+
+    @property
+    def time_zone(self):
+        """Get the current time zone"""
+        return self._get_active().time_zone
+
+    @time_zone.setter
+    def time_zone(self, value):
+        """Set the time zone of all connections"""
+        def change(cnx):
+            cnx.time_zone = value
+        self._change_session(change)
+
+    @property
+    def sql_mode(self):
+        """Get the SQL mode"""
+        return self._get_active().sql_mode
+
+    @sql_mode.setter
+    def sql_mode(self, value):
+        """Set the SQL mode of all connections"""
+        def change(cnx):
+            cnx.sql_mode = value
+        self._change_session(change)
+
+    def set_charset_collation(self, charset=None, collation=None):
+        """Sets the character set and collation of all connections
+
+        See MySQLConnection.set_charset_collation().
+        """
+        def change(cnx):
+            cnx.set_charset_collation(charset, collation)
+        self._change_session(change)
+
+    def cursor(self, buffered=None, raw=None, prepared=None,
+               cursor_class=None, dictionary=None, named_tuple=None):
+        """Instantiates and returns a buffered cursor
+
+        This method is similar to MySQLConnection.cursor() except that
+        cursors are always buffered: statements of other cursors might be
+        sent to another server, so rows are read right after executing.
+        Unbuffered cursors and prepared statements are not supported and
+        will raise a NotSupportedError exception.
+
+        Returns a MySQLCursorBuffered or subclass.
+        """
+        if prepared:
+            raise errors.NotSupportedError(
+                "Prepared Statements are not supported with routed "
+                "connections")
+        if buffered is False:
+            raise errors.NotSupportedError(
+                "Unbuffered cursors are not supported with routed "
+                "connections")
+        if cursor_class is not None:
+            if not issubclass(cursor_class, CursorBase):
+                raise errors.ProgrammingError(
+                    "Cursor class needs be to subclass of cursor.CursorBase")
+            if not issubclass(cursor_class, MySQLCursorBuffered):
+                raise errors.NotSupportedError(
+                    "Cursor class needs to be a subclass of "
+                    "cursor.MySQLCursorBuffered with routed connections")
+            return (cursor_class)(self)
+
+        raw = raw if raw is not None else self._get_active()._raw
+
+        cursor_type = 0
+        if raw is True:
+            cursor_type |= 2
+        if dictionary is True:
+            cursor_type |= 4
+        if named_tuple is True:
+            cursor_type |= 8
+
+        types = {
+            0: MySQLCursorBuffered,
+            2: MySQLCursorBufferedRaw,
+            4: MySQLCursorBufferedDict,
+            8: MySQLCursorBufferedNamedTuple,
+        }
+        try:
+            return (types[cursor_type])(self)
+        except KeyError:
+            args = ('buffered', 'raw', 'dictionary', 'named_tuple')
+            raise ValueError('Cursor not available with given criteria: ' +
+                             ', '.join([args[i] for i in range(4)
+                                        if cursor_type & (1 << i) != 0]))
+
+    def cmd_query(self, query, *args, **kwargs):
+        """Send a statement to the primary or a replica
+
+        Statements changing the session are sent to all connections.
+
+        Returns a dictionary.
+        """
+        statement = _statement_str(query)
+        if _SESSION_STATEMENT.match(statement):
+            def change(cnx):
+                return cnx.cmd_query(query, *args, **kwargs)
+            return self._change_session(change)
+        if _PRIMARY_SESSION_STATEMENT.match(statement):
+            self._pinned = True
+        return self._route(query).cmd_query(query, *args, **kwargs)
+
+    def cmd_query_iter(self, statements):
+        """Send one or more statements to the primary
+
+        Statements are sent to a replica within a read-only transaction.
+        When one of the statements changes the session, all statements
+        are sent to the primary from then on.
+
+        Returns a generator.
+        """
+        for statement in _statement_str(statements).split(';'):
+            if (_SESSION_STATEMENT.match(statement) or
+                    _PRIMARY_SESSION_STATEMENT.match(statement)):
+                self._pinned = True
+        cnx = self._transaction_cnx or self._get_primary()
+        self._active_cnx = cnx
+        return cnx.cmd_query_iter(statements)
+
+    def start_transaction(self, consistent_snapshot=False,
+                          isolation_level=None, readonly=None):
+        """Start a transaction
+
+        Read-only transactions are started on a replica, other
+        transactions on the primary. Statements are sent to the same
+        server until commit() or rollback().
+        """
+        if self.in_transaction:
+            raise errors.ProgrammingError("Transaction already in progress")
+        if readonly and not self._pinned:
+            cnx = self._get_replica()
+        else:
+            cnx = self._get_primary()
+        cnx.start_transaction(consistent_snapshot=consistent_snapshot,
+                              isolation_level=isolation_level,
+                              readonly=readonly)
+        self._transaction_cnx = cnx
+        self._active_cnx = cnx
+
+    def commit(self):
+        """Commit the current transaction on the servers used"""
+        for cnx in self._connections():
+            cnx.commit()
+        self._transaction_cnx = None
+
+    def rollback(self):
+        """Rollback the current transaction on the servers used"""
+        for cnx in self._connections():
+            cnx.rollback()
+        self._transaction_cnx = None
+
+    def close(self):
+        """Do not close, but add the connections back to their pools"""
+        cnxs = self._connections()
+        self._primary_cnx = None
+        self._replica_cnx = None
+        self._active_cnx = None
+        self._transaction_cnx = None
+        self._session_changes = []
+        self._pinned = False
+        for cnx in cnxs:
+            cnx.close()
+    disconnect = close
@@ -30,7 +30,7 @@ __MYSQL_DEBUG__ = False
 
 import struct
 
-from .catch23 import struct_unpack
+from .catch23 import struct_unpack, struct_unpack_from
 
 def intread(buf):
     """Unpacks the given buffer to an integer"""
@@ -217,17 +217,18 @@ def read_lc_string(buf):
     return (buf[lsize + length + 1:], buf[lsize + 1:length + lsize + 1])
 
 
-def read_lc_string_list(buf):
+def read_lc_string_list(buf, offset=0):
     """Reads all length encoded strings from the given buffer
 
+    Reading starts at position offset of the buffer, so callers do not
+    need to slice off, for example, the packet header.
+
     Returns a list of bytes
     """
     byteslst = []
 
-    sizes = {252: 2, 253: 3, 254: 8}
-
     buf_len = len(buf)
-    pos = 0
+    pos = offset
 
     while pos < buf_len:
         first = buf[pos]
@@ -241,19 +242,24 @@ def read_lc_string_list(buf):
             pos += 1
         else:
             if first <= 250:
-                length = first
-                byteslst.append(buf[(pos + 1):length + (pos + 1)])
-                pos += 1 + length
+                pos += 1
+                byteslst.append(buf[pos:pos + first])
+                pos += first
             else:
-                lsize = 0
-                try:
-                    lsize = sizes[first]
-                except KeyError:
+                if first == 252:
+                    length = buf[pos + 1] | buf[pos + 2] << 8
+                    pos += 3
+                elif first == 253:
+                    length = (buf[pos + 1] | buf[pos + 2] << 8
+                              | buf[pos + 3] << 16)
+                    pos += 4
+                elif first == 254:
+                    length = struct_unpack_from('<Q', buf, pos + 1)[0]
+                    pos += 9
+                else:
                     return None
-                length = intread(buf[(pos + 1):lsize + (pos + 1)])
-                byteslst.append(
-                    buf[pos + 1 + lsize:length + lsize + (pos + 1)])
-                pos += 1 + lsize + length
+                byteslst.append(buf[pos:pos + length])
+                pos += length
 
     return tuple(byteslst)
 
@@ -317,6 +323,74 @@ def read_lc_int(buf):
         raise ValueError("Failed reading length encoded integer")
 
 
+def read_int_at(buf, pos, size):
+    """Read an integer from buffer starting at position pos
+
+    Unlike read_int(), the buffer is not truncated.
+
+    Returns a tuple (position after the integer, int)
+    """
+    if size == 1:
+        return (pos + 1, buf[pos])
+    elif size == 2:
+        return (pos + 2, buf[pos] | buf[pos + 1] << 8)
+    elif size == 3:
+        return (pos + 3, buf[pos] | buf[pos + 1] << 8 | buf[pos + 2] << 16)
+    elif size == 4:
+        return (pos + 4, struct_unpack_from('<I', buf, pos)[0])
+    elif size == 8:
+        return (pos + 8, struct_unpack_from('<Q', buf, pos)[0])
+    return (pos + size, intread(buf[pos:pos + size]))
+
+
+def read_lc_int_at(buf, pos):
+    """Read a length encoded integer from buffer starting at position pos
+
+    Unlike read_lc_int(), the buffer is not truncated.
+
+    Returns a tuple (position after the integer, int or None)
+    """
+    try:
+        lcbyte = buf[pos]
+    except IndexError:
+        raise ValueError("Empty buffer.")
+
+    if lcbyte < 251:
+        return (pos + 1, lcbyte)
+    elif lcbyte == 251:
+        return (pos + 1, None)
+    elif lcbyte == 252:
+        return read_int_at(buf, pos + 1, 2)
+    elif lcbyte == 253:
+        return read_int_at(buf, pos + 1, 3)
+    elif lcbyte == 254:
+        return read_int_at(buf, pos + 1, 8)
+    raise ValueError("Failed reading length encoded integer")
+
+
+def read_lc_string_at(buf, pos):
+    """Read a length coded string from buffer starting at position pos
+
+    Unlike read_lc_string(), the buffer is not truncated; only the
+    string itself is copied. NULL is returned as None.
+
+    Returns a tuple (position after the string, bytes or None)
+    """
+    (pos, length) = read_lc_int_at(buf, pos)
+    if length is None:
+        return (pos, None)
+    return (pos + length, buf[pos:pos + length])
+
+
+def skip_lc_string_at(buf, pos):
+    """Skip a length coded string in buffer starting at position pos
+
+    Returns the position after the string.
+    """
+    (pos, length) = read_lc_int_at(buf, pos)
+    return pos + (length or 0)
+
+
 #
 # For debugging
 #
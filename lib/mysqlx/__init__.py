@@ -24,6 +24,7 @@
 """MySQL X DevAPI Python implementation"""
 
 import re
+import sys
 from . import constants
 
 from .compat import STRING_TYPES, urlparse, unquote, parse_qsl
@@ -213,9 +214,38 @@ def get_node_session(*args, **kwargs):
     return NodeSession(settings)
 
 
+def get_session_async(*args, **kwargs):
+    """Creates a NodeSession instance using asyncio with the provided
+    connection data.
+
+    Statements executed through the session return awaitables and their
+    results are read using ``async for``. Requires Python 3.6 or later.
+
+    Args:
+        *args: Variable length argument list with the connection data used
+               to connect to the database. It can be a dictionary or a
+               connection string.
+        **kwargs: Arbitrary keyword arguments with connection data used to
+                  connect to the database.
+
+    Returns:
+        coroutine: Awaiting it returns a mysqlx.aio.NodeSession object.
+    """
+    if sys.version_info < (3, 6):
+        raise NotSupportedError("Asyncio sessions require Python 3.6 or "
+                                "later")
+    settings = _get_connection_settings(*args, **kwargs)
+    if "routers" in settings:
+        raise InterfaceError("NodeSession expects only one pair of host and port")
+
+    from .aio import get_session as get_session_aio
+    return get_session_aio(settings)
+
+
 __all__ = [
     # mysqlx.connection
     "XSession", "NodeSession", "get_session", "get_node_session",
+    "get_session_async",
 
     # mysqlx.constants
     "constants",
@@ -0,0 +1,64 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""MySQL X DevAPI sessions using asyncio.
+
+This package requires Python 3.6 or later. Messages are encoded and
+decoded by mysqlx.protocol.Protocol, reading and writing through asyncio
+streams.
+
+Methods of schemas, collections and tables which query the server and
+return the answer directly, such as exists_in_database(), count() and
+create_collection(), raise NotSupportedError. Use session.sql() instead.
+
+Example:
+  session = await mysqlx.get_session_async(user="scott", password="tiger")
+  collection = session.get_schema("test").get_collection("docs")
+  result = await collection.find("age > 18").execute()
+  async for doc in result:
+      print(doc)
+  await session.close()
+"""
+
+from .connection import NodeSession, SqlStatement
+from .result import BufferingResult, RowResult, SqlResult, DocResult
+
+
+async def get_session(settings):
+    """Creates a connected NodeSession instance using asyncio.
+
+    Args:
+        settings (dict): Connection data used to connect to the database.
+
+    Returns:
+        mysqlx.aio.NodeSession: NodeSession object.
+    """
+    session = NodeSession(settings)
+    await session.connect()
+    return session
+
+
+__all__ = [
+    "get_session", "NodeSession", "SqlStatement", "BufferingResult",
+    "RowResult", "SqlResult", "DocResult",
+]
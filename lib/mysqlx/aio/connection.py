@@ -0,0 +1,411 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Implementation of communication for MySQL X servers using asyncio."""
+
+import asyncio
+import socket
+import struct
+import sys
+
+from collections import deque
+from functools import wraps
+
+from .. import connection, protocol, statement
+from ..authentication import MySQL41AuthPlugin
+from ..crud import Schema
+from ..errors import InterfaceError, OperationalError
+from ..protobuf import SERVER_MESSAGES, Message, mysqlxpb_enum
+from ..result import Result
+from ..statement import AddStatement
+from .result import RowResult, SqlResult, DocResult
+
+
+# Messages Protocol reads past while reading a result
+_SKIPPED_MESSAGES = ("Mysqlx.Notice.Frame", "Mysqlx.Resultset.FetchDone",
+                         "Mysqlx.Resultset.FetchDoneMoreResultsets",)
+# Messages Protocol reads while reading the columns of a result
+_COLUMN_SKIPPED_MESSAGES = _SKIPPED_MESSAGES + (
+    "Mysqlx.Resultset.ColumnMetaData",)
+
+
+class SocketStream(connection.SocketStream):
+    """Reads and writes X Protocol messages using asyncio streams.
+
+    Complete messages are read ahead into a buffer by awaiting
+    read_message(), from which read() returns data without blocking.
+    """
+    def __init__(self):
+        super(SocketStream, self).__init__()
+        self._reader = None
+        self._writer = None
+        self._buffer = bytearray()
+
+    async def connect(self, params):
+        if isinstance(params, tuple):
+            self._reader, self._writer = await asyncio.open_connection(
+                *params)
+        else:
+            self._reader, self._writer = await asyncio.open_unix_connection(
+                params)
+        self._socket = self._writer.get_extra_info("socket")
+
+    async def read_message(self):
+        """Read a message into the buffer.
+
+        Returns:
+            int: The message type.
+        """
+        if self._reader is None:
+            raise OperationalError("MySQLx Connection not available")
+        try:
+            hdr = await self._reader.readexactly(5)
+            msg_len, msg_type = struct.unpack("<LB", hdr)
+            # A server without the X Plugin sends a classic handshake,
+            # which MessageReaderWriter refuses using the header only
+            payload = b"" if msg_type == 10 else \
+                await self._reader.readexactly(msg_len - 1)
+        except asyncio.IncompleteReadError:
+            raise RuntimeError("Unexpected connection close")
+        self._buffer.extend(hdr)
+        self._buffer.extend(payload)
+        return msg_type
+
+    def read(self, count):
+        if len(self._buffer) < count:
+            raise InterfaceError("MySQLx message was not received")
+        data = bytes(self._buffer[:count])
+        del self._buffer[:count]
+        return data
+
+    def sendall(self, data):
+        if self._writer is None:
+            raise OperationalError("MySQLx Connection not available")
+        self._writer.write(data)
+
+    async def drain(self):
+        """Wait until the written messages are sent."""
+        if self._writer is None:
+            raise OperationalError("MySQLx Connection not available")
+        await self._writer.drain()
+
+    def close(self):
+        if not self._writer:
+            return
+
+        self._writer.close()
+        self._reader = None
+        self._writer = None
+        self._socket = None
+        self._buffer = bytearray()
+
+    async def set_ssl(self, ssl_opts=None):
+        context = self._ssl_context(ssl_opts or {})
+        await self._writer.start_tls(context)
+        self._socket = self._writer.get_extra_info("socket")
+        self._is_ssl = True
+
+
+class MessageReaderWriter(protocol.MessageReaderWriter):
+    """Reads the messages received by awaiting prefetch().
+
+    Protocol reads messages synchronously, so the messages it is going to
+    read are received before calling it.
+    """
+    def __init__(self, socket_stream):
+        super(MessageReaderWriter, self).__init__(socket_stream)
+        self._received = deque()
+
+    def _read_message(self):
+        if not self._received:
+            raise InterfaceError("MySQLx message was not received")
+        self._received.popleft()
+        return super(MessageReaderWriter, self)._read_message()
+
+    async def prefetch(self, skipped=()):
+        """Receive messages until one of a type not in skipped is available.
+
+        Args:
+            skipped (tuple): Message type names read past by the caller.
+        """
+        available = list(self._received)
+        if self._msg is not None:
+            available.insert(0, self._msg.type)
+        if any(msg_type not in skipped for msg_type in available):
+            return
+        while True:
+            msg_type = SERVER_MESSAGES.get(await self._stream.read_message())
+            self._received.append(msg_type)
+            if msg_type not in skipped:
+                return
+
+
+def catch_network_exception(func):
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await func(self, *args, **kwargs)
+        except (socket.error, RuntimeError):
+            self.disconnect()
+            raise InterfaceError("Cannot connect to host.")
+    return wrapper
+
+
+class Connection(connection.Connection):
+    """Connection to a MySQL X server using asyncio.
+
+    Commands are coroutines which send the request and receive the reply
+    before Protocol reads it.
+    """
+    is_async = True
+
+    def __init__(self, settings):
+        super(Connection, self).__init__(settings)
+        self.stream = SocketStream()
+
+    async def connect(self):
+        try:
+            await self.stream.connect(self._connection_params())
+        except socket.error as err:
+            raise InterfaceError("Cannot connect to host: {0}".format(err))
+        self.reader_writer = MessageReaderWriter(self.stream)
+        self.protocol = protocol.Protocol(self.reader_writer)
+        await self._handle_capabilities()
+        await self._authenticate()
+
+    async def _receive(self, skipped=()):
+        await self.stream.drain()
+        await self.reader_writer.prefetch(skipped)
+
+    async def _handle_capabilities(self):
+        self.reader_writer.write_message(
+            mysqlxpb_enum("Mysqlx.ClientMessages.Type.CON_CAPABILITIES_GET"),
+            Message("Mysqlx.Connection.CapabilitiesGet"))
+        await self._receive()
+        data = self.reader_writer.read_message().capabilities
+        if not (data[0]["name"].lower() == "tls" if data else False):
+            if self.settings.get("ssl-enable", False):
+                self.disconnect()
+                raise OperationalError("SSL not enabled at server.")
+            return
+
+        if sys.version_info < (3, 11):
+            if self.settings.get("ssl-enable", False):
+                self.disconnect()
+                raise RuntimeError("The support for SSL is not available for "
+                    "this Python version.")
+            return
+
+        capability = Message("Mysqlx.Connection.Capability", name="tls",
+                             value=self.protocol._create_any(True))
+        capabilities = Message("Mysqlx.Connection.Capabilities")
+        capabilities["capabilities"].append(capability.get_message())
+        self.reader_writer.write_message(
+            mysqlxpb_enum("Mysqlx.ClientMessages.Type.CON_CAPABILITIES_SET"),
+            Message("Mysqlx.Connection.CapabilitiesSet",
+                    capabilities=capabilities))
+        await self._receive()
+        self.protocol.read_ok()
+        await self.stream.set_ssl(self.settings)
+
+    async def _authenticate(self):
+        plugin = MySQL41AuthPlugin(self._user, self._password)
+        self.protocol.send_auth_start(plugin.auth_name())
+        await self._receive()
+        extra_data = self.protocol.read_auth_continue()
+        self.protocol.send_auth_continue(
+            plugin.build_authentication_response(extra_data))
+        await self._receive(("Mysqlx.Notice.Frame",))
+        self.protocol.read_auth_ok()
+
+    async def _close_active_result(self):
+        if self._active_result is not None:
+            await self._active_result.fetch_all()
+            self._active_result = None
+
+    @catch_network_exception
+    async def receive_row(self):
+        """Receive the next row of the active result."""
+        await self._receive(_SKIPPED_MESSAGES)
+
+    @catch_network_exception
+    async def receive_column_metadata(self):
+        """Receive the columns of the next result."""
+        await self._receive(_COLUMN_SKIPPED_MESSAGES)
+
+    @catch_network_exception
+    async def send_sql(self, sql, *args):
+        await self._close_active_result()
+        self.protocol.send_execute_statement("sql", sql, args)
+        await self._receive(_COLUMN_SKIPPED_MESSAGES)
+
+    @catch_network_exception
+    async def send_insert(self, statement):
+        await self._close_active_result()
+        self.protocol.send_insert(statement)
+        ids = None
+        if isinstance(statement, AddStatement):
+            ids = statement._ids
+        await self._receive(_SKIPPED_MESSAGES)
+        return Result(self, ids)
+
+    @catch_network_exception
+    async def find(self, statement):
+        await self._close_active_result()
+        self.protocol.send_find(statement)
+        await self._receive(_COLUMN_SKIPPED_MESSAGES)
+        return DocResult(self) if statement._doc_based else RowResult(self)
+
+    @catch_network_exception
+    async def delete(self, statement):
+        await self._close_active_result()
+        self.protocol.send_delete(statement)
+        await self._receive(_SKIPPED_MESSAGES)
+        return Result(self)
+
+    @catch_network_exception
+    async def update(self, statement):
+        await self._close_active_result()
+        self.protocol.send_update(statement)
+        await self._receive(_SKIPPED_MESSAGES)
+        return Result(self)
+
+    @catch_network_exception
+    async def execute_nonquery(self, namespace, cmd, raise_on_fail=True,
+                               *args):
+        await self._close_active_result()
+        self.protocol.send_execute_statement(namespace, cmd, args)
+        await self._receive(_SKIPPED_MESSAGES)
+        return Result(self)
+
+    @catch_network_exception
+    async def execute_sql_scalar(self, sql, *args):
+        await self.send_sql(sql, *args)
+        result = RowResult(self)
+        await result.fetch_all()
+        if result.count == 0:
+            raise InterfaceError("No data found")
+        return result[0][0]
+
+    @catch_network_exception
+    async def get_row_result(self, cmd, *args):
+        await self._close_active_result()
+        self.protocol.send_execute_statement("xplugin", cmd, args)
+        await self._receive(_COLUMN_SKIPPED_MESSAGES)
+        return RowResult(self)
+
+    async def close(self):
+        if not self.is_open():
+            return
+        await self._close_active_result()
+        self.protocol.send_close()
+        await self._receive()
+        self.protocol.read_ok()
+        self.stream.close()
+
+
+class SqlStatement(statement.SqlStatement):
+    """A statement for SQL execution using asyncio.
+
+    Args:
+        connection (mysqlx.aio.connection.Connection): Connection object.
+        sql (string): The sql statement to be executed.
+    """
+    async def execute(self):
+        """Execute the statement.
+
+        Returns:
+            mysqlx.aio.SqlResult: SqlResult object.
+        """
+        await self._connection.send_sql(self._sql)
+        return SqlResult(self._connection)
+
+
+class NodeSession(connection.BaseSession):
+    """Enables interaction with a X Protocol enabled MySQL Server using
+    asyncio.
+
+    Statements created from this session, its schemas, collections and
+    tables return awaitables when executed. Their results are read by
+    awaiting fetch_one() and fetch_all(), or using ``async for``.
+
+    A session runs one statement at a time; concurrent work uses one
+    session for each task.
+
+    Args:
+        settings (dict): Connection data used to connect to the database.
+    """
+    def __init__(self, settings):
+        super(NodeSession, self).__init__(settings)
+        self._connection = Connection(self._settings)
+
+    async def connect(self):
+        """Connects to the MySQL Server."""
+        await self._connection.connect()
+
+    async def drop_schema(self, name):
+        """Drops the schema with the specified name.
+
+        Args:
+            name (string): The name of the Schema object to be retrieved.
+        """
+        await self._connection.execute_nonquery(
+            "sql", connection._DROP_DATABASE_QUERY.format(name), True)
+
+    async def create_schema(self, name):
+        """Creates a schema on the database and returns the corresponding
+        object.
+
+        Args:
+            name (string): A string value indicating the schema name.
+        """
+        await self._connection.execute_nonquery(
+            "sql", connection._CREATE_DATABASE_QUERY.format(name), True)
+        return Schema(self, name)
+
+    async def start_transaction(self):
+        """Starts a transaction context on the server.
+        """
+        await self._connection.execute_nonquery(
+            "sql", "START TRANSACTION", True)
+
+    async def commit(self):
+        """Commits all the operations executed after a call to
+        startTransaction().
+        """
+        await self._connection.execute_nonquery("sql", "COMMIT", True)
+
+    async def rollback(self):
+        """Discards all the operations executed after a call to
+        startTransaction().
+        """
+        await self._connection.execute_nonquery("sql", "ROLLBACK", True)
+
+    async def close(self):
+        await self._connection.close()
+
+    def sql(self, sql):
+        """Creates a :class:`mysqlx.aio.SqlStatement` object to allow running
+        the SQL statement on the target MySQL Server.
+        """
+        return SqlStatement(self._connection, sql)
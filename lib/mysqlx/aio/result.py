@@ -0,0 +1,99 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Implementation of the result objects of asyncio sessions."""
+
+from .. import result
+
+
+class BufferingResult(result.BufferingResult):
+    """Provides awaitable fetching of result items.
+
+    Items can also be read using ``async for``.
+
+    Args:
+        connection (mysqlx.aio.connection.Connection): The Connection object.
+    """
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.fetch_one()
+        if item is None:
+            raise StopAsyncIteration
+        return item
+
+    async def fetch_one(self):
+        """Fetch one item.
+
+        Returns:
+            Row/DbDoc: one result item.
+        """
+        if self._closed or not self._has_more_data:
+            return None
+
+        await self._connection.receive_row()
+        return self._read_item(False)
+
+    async def fetch_all(self):
+        """Fetch all items.
+
+        Returns:
+            list: The list of items.
+        """
+        while True:
+            item = await self.fetch_one()
+            if item is None:
+                break
+            self._items.append(item)
+        return self._items
+
+
+class RowResult(BufferingResult, result.RowResult):
+    """Allows traversing the Row objects returned by a Table.select operation.
+
+    Args:
+        connection (mysqlx.aio.connection.Connection): The Connection object.
+    """
+
+
+class SqlResult(RowResult, result.SqlResult):
+    """Represents a result from a SQL statement.
+
+    Args:
+        connection (mysqlx.aio.connection.Connection): The Connection object.
+    """
+    async def next_result(self):
+        if self._closed:
+            return False
+        await self._connection.receive_column_metadata()
+        return super(SqlResult, self).next_result()
+
+
+class DocResult(BufferingResult, result.DocResult):
+    """Allows traversing the DbDoc objects returned by a Collection.find
+    operation.
+
+    Args:
+        connection (mysqlx.aio.connection.Connection): The Connection object.
+    """
@@ -84,6 +84,11 @@ class SocketStream(object):
         self._socket = None
 
     def set_ssl(self, ssl_opts={}):
+        context = self._ssl_context(ssl_opts)
+        self._socket = context.wrap_socket(self._socket)
+        self._is_ssl = True
+
+    def _ssl_context(self, ssl_opts):
         if not SSL_AVAILABLE:
             self.close()
             raise RuntimeError("Python installation has no SSL support.")
@@ -115,8 +120,7 @@ class SocketStream(object):
             self.close()
             raise InterfaceError("Client Certificate not provided.")
 
-        self._socket = context.wrap_socket(self._socket)
-        self._is_ssl = True
+        return context
 
 
 def catch_network_exception(func):
@@ -131,6 +135,8 @@ def catch_network_exception(func):
 
 
 class Connection(object):
+    is_async = False
+
     def __init__(self, settings):
         self._user = settings.get("user")
         self._password = settings.get("password")
@@ -29,7 +29,8 @@ from .statement import (FindStatement, AddStatement, RemoveStatement,
                         DeleteStatement, UpdateStatement,
                         CreateCollectionIndexStatement,
                         DropCollectionIndexStatement, CreateViewStatement,
-                        AlterViewStatement, CreateTableStatement)
+                        AlterViewStatement, CreateTableStatement,
+                        blocking_only)
 
 
 _COUNT_VIEWS_QUERY = ("SELECT COUNT(*) FROM information_schema.views "
@@ -113,6 +114,7 @@ class Schema(DatabaseObject):
         self._session = session
         super(Schema, self).__init__(self, name)
 
+    @blocking_only
     def exists_in_database(self):
         """Verifies if this object exists in the database.
 
@@ -130,6 +132,7 @@ class Schema(DatabaseObject):
         """
         return self._session
 
+    @blocking_only
     def get_collections(self):
         """Returns a list of collections for this schema.
 
@@ -158,6 +161,7 @@ class Schema(DatabaseObject):
         """
         return self.get_table(name, check_existence)
 
+    @blocking_only
     def get_tables(self):
         """Returns a list of tables for this schema.
 
@@ -213,6 +217,7 @@ class Schema(DatabaseObject):
                 raise ProgrammingError("Collection does not exist")
         return collection
 
+    @blocking_only
     def drop_collection(self, name):
         """Drops a collection.
 
@@ -222,6 +227,7 @@ class Schema(DatabaseObject):
         self._connection.execute_nonquery(
             "sql", _DROP_TABLE_QUERY.format(self._name, name), False)
 
+    @blocking_only
     def drop_table(self, name):
         """Drops a table.
 
@@ -235,6 +241,7 @@ class Schema(DatabaseObject):
             self._connection.execute_nonquery(
                 "sql", _DROP_TABLE_QUERY.format(self._name, name), False)
 
+    @blocking_only
     def drop_view(self, name):
         """Drops a view.
 
@@ -244,6 +251,7 @@ class Schema(DatabaseObject):
         self._connection.execute_nonquery(
             "sql", _DROP_VIEW_QUERY.format(self._name, name), False)
 
+    @blocking_only
     def create_collection(self, name, reuse=False):
         """Creates in the current schema a new collection with the specified
         name and retrieves an object representing the new collection created.
@@ -295,6 +303,7 @@ class Schema(DatabaseObject):
         view = View(self, name)
         return view.get_alter_statement()
 
+    @blocking_only
     def create_table(self, name, reuse=False):
         if not name:
             raise ProgrammingError("Table name is invalid")
@@ -316,6 +325,7 @@ class Collection(DatabaseObject):
     def __init__(self, schema, name):
         super(Collection, self).__init__(schema, name)
 
+    @blocking_only
     def exists_in_database(self):
         """Verifies if this object exists in the database.
 
@@ -383,6 +393,7 @@ class Collection(DatabaseObject):
         """
         return ModifyStatement(self, condition)
 
+    @blocking_only
     def count(self):
         """Counts the documents in the collection.
 
@@ -423,6 +434,7 @@ class Table(DatabaseObject):
     def __init__(self, schema, name):
         super(Table, self).__init__(schema, name)
 
+    @blocking_only
     def exists_in_database(self):
         """Verifies if this object exists in the database.
 
@@ -477,6 +489,7 @@ class Table(DatabaseObject):
         """
         return DeleteStatement(self, condition)
 
+    @blocking_only
     def count(self):
         """Counts the rows in the table.
 
@@ -486,6 +499,7 @@ class Table(DatabaseObject):
         sql = _COUNT_QUERY.format(self._schema.name, self._name)
         return self._connection.execute_sql_scalar(sql)
 
+    @blocking_only
     def is_view(self):
         """Determine if the underlying object is a view or not.
 
@@ -509,6 +523,7 @@ class View(Table):
     def __init__(self, schema, name):
         super(View, self).__init__(schema, name)
 
+    @blocking_only
     def exists_in_database(self):
         """Verifies if this object exists in the database.
 
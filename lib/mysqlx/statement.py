@@ -27,7 +27,9 @@ import copy
 import json
 import re
 
-from .errors import ProgrammingError
+from functools import wraps
+
+from .errors import NotSupportedError, ProgrammingError
 from .expr import ExprParser
 from .compat import STRING_TYPES
 from .constants import Algorithms, Securities
@@ -47,6 +49,23 @@ def flexible_params(*values):
     return values
 
 
+def blocking_only(func):
+    """Decorator for methods which can not be used with asyncio sessions.
+
+    These methods send commands and read their results without awaiting
+    them, so they raise NotSupportedError when the connection is
+    asynchronous.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self._connection is not None and self._connection.is_async:
+            raise NotSupportedError(
+                "{0}.{1}() is not supported by asyncio sessions"
+                "".format(type(self).__name__, func.__name__))
+        return func(self, *args, **kwargs)
+    return wrapper
+
+
 def is_quoted_identifier(identifier, sql_mode=""):
     """Check if the given identifier is quoted.
 
@@ -883,6 +902,7 @@ class CreateViewStatement(Statement):
         self._check_option = check_option
         return self
 
+    @blocking_only
     def execute(self):
         """Execute the statement to create a view.
 
@@ -921,6 +941,7 @@ class AlterViewStatement(CreateViewStatement):
     def __init__(self, view):
         super(AlterViewStatement, self).__init__(view)
 
+    @blocking_only
     def execute(self):
         """Execute the statement to alter a view.
 
@@ -1164,6 +1185,7 @@ class CreateTableStatement(Statement):
         self._temp = True
         return self
 
+    @blocking_only
     def execute(self):
         """Execute the statement.
 
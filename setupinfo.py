@@ -98,6 +98,8 @@ packages = [
     'mysqlx.locales',
     'mysqlx.locales.eng',
 ]
+if sys.version_info >= (3, 6):
+    packages.extend(['mysql.connector.aio', 'mysqlx.aio'])
 description = "MySQL driver written in Python"
 long_description = """
 MySQL driver written in Python which does not depend on MySQL C client
@@ -28,6 +28,8 @@ import os
 import sys
 import re
 import socket
+import struct
+import threading
 import datetime
 import inspect
 import platform
@@ -122,6 +124,7 @@ __all__ = [
     'get_test_names', 'printmsg',
     'LOGGER_NAME',
     'DummySocket',
+    'FakeMySQLServer',
     'SSL_DIR',
     'get_test_modules',
     'MESSAGES',
@@ -163,14 +166,13 @@ class DummySocket(object):
             raise socket.error(self._raise_socket_error)
         if nbytes == 0:
             nbytes = len(buffer_)
+        data = self._server_replies[0:nbytes]
         try:
-            buffer_[0:nbytes] = self._server_replies[0:nbytes]
+            buffer_[0:len(data)] = data
         except (IndexError, TypeError) as err:
             return 0
-        except ValueError:
-            pass
-        self._server_replies = self._server_replies[nbytes:]
-        return len(buffer_)
+        self._server_replies = self._server_replies[len(data):]
+        return len(data)
 
     def send(self, string, flags=0):
         if self._raise_socket_error:
@@ -198,6 +200,121 @@ class DummySocket(object):
         return 'dummy'
 
 
+class FakeMySQLServer(object):
+
+    """MySQL server answering queries from a dictionary
+
+    Each accepted connection is served by its own thread. Queries not
+    found in the replies get an OK packet, as do all other commands except
+    COM_QUIT. The command byte of every packet received is recorded in the
+    commands list and the queries in the queries list.
+    """
+
+    handshake = (
+        b'\x0a\x35\x2e\x37\x2e\x31\x30\x2d\x6c\x6f\x67\x00\x09\x01\x00\x00'
+        b'\x68\x34\x69\x36\x6f\x50\x21\x4f\x00\x2c\xa2\x08\x02'
+        b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+        b'\x00\x00\x4c\x6e\x67\x39\x26\x50\x44\x40\x57\x72'
+        b'\x59\x48\x00'
+    )
+    ok = b'\x00\x00\x00\x02\x00\x00\x00'
+    eof = b'\xfe\x00\x00\x02\x00'
+
+    def __init__(self, replies=None):
+        self.replies = replies or {}
+        self.queries = []
+        self.commands = []
+        self.connections = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(5)
+        self.port = self.sock.getsockname()[1]
+        thread = threading.Thread(target=self._accept)
+        thread.daemon = True
+        thread.start()
+
+    def close(self):
+        self.sock.close()
+
+    @classmethod
+    def result(cls, columns, rows):
+        """Packets of a text result set
+
+        The columns are tuples holding a name and a field type; rows are
+        tuples of bytes or None.
+        """
+        def lc_str(value):
+            """Length coded string of less than 251 bytes"""
+            return struct.pack('<B', len(value)) + value
+
+        packets = [struct.pack('<B', len(columns))]
+        for name, field_type in columns:
+            packets.append(
+                lc_str(b'def') + lc_str(b'') + lc_str(b't') + lc_str(b't') +
+                lc_str(name.encode('utf8')) * 2 + b'\x0c\x21\x00' +
+                struct.pack('<IBHB', 60, field_type, 0, 0) + b'\x00\x00')
+        packets.append(cls.eof)
+        for row in rows:
+            packets.append(b''.join([b'\xfb' if value is None
+                                     else lc_str(value) for value in row]))
+        packets.append(cls.eof)
+        return packets
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self.sock.accept()[0]
+            except (IOError, OSError):
+                return
+            self.connections += 1
+            thread = threading.Thread(target=self._serve, args=(conn,))
+            thread.daemon = True
+            thread.start()
+
+    @staticmethod
+    def _recv(conn):
+        header = b''
+        while len(header) < 4:
+            chunk = conn.recv(4 - len(header))
+            if not chunk:
+                return None
+            header += chunk
+        size = struct.unpack('<I', header[0:3] + b'\x00')[0]
+        payload = b''
+        while len(payload) < size:
+            payload += conn.recv(size - len(payload))
+        return payload
+
+    @staticmethod
+    def _send(conn, packets, pktnr=1):
+        data = b''
+        for packet in packets:
+            data += (struct.pack('<I', len(packet))[0:3] +
+                     struct.pack('<B', pktnr) + packet)
+            pktnr += 1
+        conn.sendall(data)
+
+    def _serve(self, conn):
+        self._send(conn, [self.handshake], 0)
+        self._recv(conn)
+        self._send(conn, [self.ok], 2)
+        while True:
+            try:
+                payload = self._recv(conn)
+            except (IOError, OSError):
+                payload = None
+            if not payload or payload[0:1] == b'\x01':
+                conn.close()
+                return
+            self.commands.append(payload[0:1])
+            if payload[0:1] == b'\x03':
+                query = payload[1:].decode('utf8')
+                self.queries.append(query)
+                self._send(conn, self.replies.get(query, [self.ok]))
+            else:
+                self._send(conn, [self.ok])
+
+
 def get_test_modules():
     """Get list of Python modules containing tests
 
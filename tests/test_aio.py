@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2016, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Unittests for mysql.connector.aio
+"""
+
+import socket
+import sys
+import unittest
+
+import tests
+from mysql.connector import errors
+from mysql.connector.constants import FieldType
+
+if sys.version_info >= (3, 6):
+    import asyncio
+    from mysql.connector import aio
+
+_result = tests.FakeMySQLServer.result
+
+
+@unittest.skipIf(sys.version_info < (3, 6), "asyncio requires Python 3.6")
+class AioTestCase(tests.MySQLConnectorTests):
+
+    replies = {}
+
+    def setUp(self):
+        self.server = tests.FakeMySQLServer(self.replies)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.config = {'host': '127.0.0.1', 'port': self.server.port,
+                       'user': 'ham'}
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+        self.server.close()
+
+    def run_coro(self, coro):
+        return self.loop.run_until_complete(coro)
+
+
+class MySQLConnectionTests(AioTestCase):
+
+    replies = {
+        "SELECT 1, 'ham', NULL": _result(
+            [('1', FieldType.LONGLONG), ('ham', FieldType.VAR_STRING),
+             ('NULL', FieldType.NULL)],
+            [(b'1', b'ham', None)]),
+        "SELECT id FROM t": _result(
+            [('id', FieldType.LONG)], [(b'1',), (b'2',), (b'3',)]),
+        "SELECT @@session.max_allowed_packet": _result(
+            [('max', FieldType.LONGLONG)], [(b'65536',)]),
+        "SELECT @@session.autocommit": _result(
+            [('autocommit', FieldType.LONGLONG)], [(b'1',)]),
+        "DROP TABLE t": [b'\xff\x51\x04#42S02Unknown table'],
+    }
+
+    def test_connect(self):
+        """Connect and send commands using asyncio"""
+        cnx = self.run_coro(aio.connect(**self.config))
+        self.assertTrue(isinstance(cnx, aio.MySQLConnection))
+        self.assertEqual((5, 7, 10), cnx.get_server_version())
+        self.assertEqual(265, cnx.connection_id)
+        self.assertEqual(["SET NAMES 'utf8' COLLATE 'utf8_general_ci'",
+                          "SET @@session.autocommit = OFF"],
+                         self.server.queries)
+        self.assertTrue(self.run_coro(cnx.is_connected()))
+        self.assertTrue(self.run_coro(cnx.get_autocommit()))
+        self.assertRaises(errors.NotSupportedError, getattr, cnx,
+                          'autocommit')
+        self.assertRaises(errors.ProgrammingError, self.run_coro,
+                          cnx.cmd_query("DROP TABLE t"))
+        self.run_coro(cnx.close())
+        self.assertFalse(self.run_coro(cnx.is_connected()))
+
+    def test_cursor(self):
+        """Execute statements and fetch rows using an asyncio cursor"""
+        cnx = self.run_coro(aio.connect(**self.config))
+        cur = cnx.cursor()
+        self.run_coro(cur.execute("SELECT %s, %s, NULL", (1, 'ham')))
+        self.assertEqual(('1', 'ham', 'NULL'), cur.column_names)
+        self.assertEqual((1, 'ham', None), self.run_coro(cur.fetchone()))
+        self.assertEqual(None, self.run_coro(cur.fetchone()))
+
+        self.run_coro(cur.execute("SELECT id FROM t"))
+        self.assertEqual([(1,)], self.run_coro(cur.fetchmany(1)))
+        self.assertEqual([(2,), (3,)], self.run_coro(cur.fetchall()))
+        self.assertEqual(3, cur.rowcount)
+
+        self.run_coro(cur.execute("SELECT id FROM t"))
+        self.assertRaises(errors.InternalError, self.run_coro,
+                          cur.execute("SELECT id FROM t"))
+        self.assertEqual([(1,), (2,), (3,)], self.run_coro(cur.fetchall()))
+        self.assertRaises(TypeError, iter, cur)
+
+        cur = cnx.cursor(buffered=True, dictionary=True)
+        self.run_coro(cur.execute("SELECT id FROM t"))
+        self.assertEqual({'id': 1}, self.run_coro(cur.fetchone()))
+        self.assertEqual([{'id': 2}, {'id': 3}], self.run_coro(cur.fetchall()))
+
+        cur = cnx.cursor(raw=True)
+        self.run_coro(cur.execute("SELECT id FROM t"))
+        self.assertEqual([(bytearray(b'1'),), (bytearray(b'2'),),
+                          (bytearray(b'3'),)], self.run_coro(cur.fetchall()))
+        self.assertRaises(ValueError, cnx.cursor, prepared=True)
+        self.run_coro(cnx.close())
+
+    def test_executemany(self):
+        """Batch INSERT statements using an asyncio cursor"""
+        cnx = self.run_coro(aio.connect(**self.config))
+        cur = cnx.cursor()
+        self.run_coro(cur.executemany(
+            "INSERT INTO t (id) VALUES (%s)", [(i,) for i in range(3)]))
+        self.assertEqual(65536, cnx.max_allowed_packet)
+        self.assertEqual("INSERT INTO t (id) VALUES (0),(1),(2)",
+                         self.server.queries[-1])
+        self.run_coro(cnx.close())
+
+    def test_concurrent_queries(self):
+        """Run queries on several connections concurrently"""
+        cnxs = self.run_coro(asyncio.gather(
+            *[aio.connect(**self.config) for _ in range(5)]))
+        curs = [cnx.cursor() for cnx in cnxs]
+        self.run_coro(asyncio.gather(
+            *[cur.execute("SELECT id FROM t") for cur in curs]))
+        results = self.run_coro(asyncio.gather(
+            *[cur.fetchall() for cur in curs]))
+        self.assertEqual([[(1,), (2,), (3,)]] * 5, results)
+        self.run_coro(asyncio.gather(*[cnx.close() for cnx in cnxs]))
+
+
+class MySQLConnectionPoolTests(AioTestCase):
+
+    def test_get_connection(self):
+        """Get connections from an asyncio pool"""
+        pool = aio.MySQLConnectionPool(pool_size=2, pool_name='aio_test',
+                                       pool_reset_session=False,
+                                       **self.config)
+        self.assertEqual(0, self.server.connections)
+
+        cnx1 = self.run_coro(pool.get_connection())
+        cnx2 = self.run_coro(pool.get_connection())
+        self.assertTrue(isinstance(cnx1, aio.PooledMySQLConnection))
+        self.assertEqual(2, self.server.connections)
+        self.assertRaises(errors.PoolError, self.run_coro,
+                          pool.get_connection(timeout=0))
+        self.assertRaises(errors.PoolError, self.run_coro,
+                          pool.get_connection(timeout=0.01))
+        self.assertEqual(0, len(pool._cnx_waiters))
+
+        waiting = self.loop.create_task(pool.get_connection())
+        self.run_coro(asyncio.sleep(0))
+        self.assertFalse(waiting.done())
+        cnx = cnx1._cnx
+        self.run_coro(cnx1.close())
+        cnx3 = self.run_coro(waiting)
+        self.assertTrue(cnx3._cnx is cnx)
+        self.assertEqual(2, self.server.connections)
+
+        self.assertRaises(errors.PoolError, cnx3.config, user='spam')
+        self.run_coro(cnx2.close())
+        self.run_coro(cnx3.close())
+        self.assertEqual(2, self.run_coro(pool._remove_connections()))
+
+    def test_failed_connection(self):
+        """Open a connection for a waiter when opening another one fails"""
+        # Accepts connections but never sends a handshake
+        down = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        down.bind(('127.0.0.1', 0))
+        down.listen(1)
+        self.addCleanup(down.close)
+        config = self.config.copy()
+        config['port'] = down.getsockname()[1]
+        pool = aio.MySQLConnectionPool(pool_size=1, pool_name='aio_test',
+                                       pool_reset_session=False, **config)
+
+        opening = self.loop.create_task(pool.get_connection())
+        self.run_coro(asyncio.sleep(0.05))
+        waiting = self.loop.create_task(pool.get_connection())
+        self.run_coro(asyncio.sleep(0))
+        self.assertEqual(1, len(pool._cnx_waiters))
+
+        pool.set_config(**self.config)
+        down.accept()[0].close()
+        self.assertRaises(errors.Error, self.run_coro, opening)
+        cnx = self.run_coro(asyncio.wait_for(waiting, 5))
+        self.assertTrue(isinstance(cnx, aio.PooledMySQLConnection))
+        self.assertEqual(1, self.server.connections)
+        self.assertEqual(1, pool._cnx_count)
+        self.run_coro(cnx.close())
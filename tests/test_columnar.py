@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2016, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Unittests for mysql.connector.columnar
+"""
+
+import datetime
+from decimal import Decimal
+import unittest
+
+import tests
+from mysql.connector import columnar, conversion, errors
+from mysql.connector.constants import FieldFlag, FieldType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ERR_NO_NUMPY = "NumPy is not available"
+
+
+def _field(name, field_type, flags=0):
+    """Returns a column description"""
+    return (name, field_type, None, None, None, None, 1, flags)
+
+
+class ColumnarTests(tests.MySQLConnectorTests):
+
+    def setUp(self):
+        self.description = [
+            _field('id', FieldType.LONGLONG, FieldFlag.UNSIGNED),
+            _field('price', FieldType.NEWDECIMAL),
+            _field('created', FieldType.DATETIME),
+            _field('name', FieldType.VAR_STRING),
+        ]
+        self.rows = [
+            [bytearray(b'1'), bytearray(b'3.14'),
+             bytearray(b'2016-05-07 22:34:10'), bytearray(b'ham')],
+            [bytearray(b'2'), None, None, bytearray(b'spam')],
+            [bytearray(b'3'), bytearray(b'0.50'),
+             bytearray(b'0000-00-00 00:00:00'), None],
+        ]
+        self.converter = conversion.MySQLConverter()
+
+    def test_numpy_dtype(self):
+        """Get the NumPy data type of columns"""
+        cases = [
+            (_field('c', FieldType.TINY), 'int64'),
+            (_field('c', FieldType.LONGLONG), 'int64'),
+            (_field('c', FieldType.LONGLONG, FieldFlag.UNSIGNED), 'uint64'),
+            (_field('c', FieldType.DOUBLE), 'float64'),
+            (_field('c', FieldType.TIMESTAMP), 'datetime64[us]'),
+            (_field('c', FieldType.DATE), 'datetime64[D]'),
+            (_field('c', FieldType.TIME), 'timedelta64[us]'),
+            (_field('c', FieldType.NEWDECIMAL), 'object'),
+            (_field('c', FieldType.BLOB), 'object'),
+        ]
+        for field, exp in cases:
+            self.assertEqual(exp, columnar.numpy_dtype(field))
+
+    def test_column_decoders(self):
+        """Get functions converting columns"""
+        decoders = columnar.column_decoders(self.converter, self.description)
+        self.assertEqual([1, 2], decoders[0]([bytearray(b'1'),
+                                              bytearray(b'2')]))
+
+        class Converter(conversion.MySQLConverterBase):
+            """Converter without column_decoder()"""
+            pass
+
+        decoders = columnar.column_decoders(Converter(), self.description)
+        self.assertEqual([None, bytearray(b'1')],
+                         decoders[0]([None, bytearray(b'1')]))
+
+    def test_column_collector(self):
+        """Collect rows as columns"""
+        collector = columnar.ColumnCollector(
+            self.description,
+            columnar.column_decoders(self.converter, self.description))
+        collector.add_rows(self.rows[:2])
+        collector.add_rows([])
+        collector.add_rows(self.rows[2:])
+        exp = [
+            [1, 2, 3],
+            [Decimal('3.14'), None, Decimal('0.50')],
+            [datetime.datetime(2016, 5, 7, 22, 34, 10), None, None],
+            [u'ham', u'spam', None],
+        ]
+        self.assertEqual(exp, collector.columns())
+
+        collector = columnar.ColumnCollector(self.description)
+        collector.add_rows(self.rows)
+        self.assertEqual([bytearray(b'1'), bytearray(b'2'), bytearray(b'3')],
+                         collector.columns()[0])
+
+    @unittest.skipIf(not numpy, ERR_NO_NUMPY)
+    def test_numpy_column_collector(self):
+        """Collect rows as NumPy arrays"""
+        collector = columnar.NumPyColumnCollector(
+            self.description,
+            columnar.column_decoders(self.converter, self.description))
+        collector.add_rows(self.rows[:2])
+        collector.add_rows(self.rows[2:])
+        (ids, prices, created, names) = collector.columns()
+
+        self.assertEqual(numpy.dtype('uint64'), ids.dtype)
+        self.assertEqual([1, 2, 3], ids.tolist())
+        self.assertEqual(numpy.dtype(object), prices.dtype)
+        self.assertEqual([Decimal('3.14'), None, Decimal('0.50')],
+                         prices.tolist())
+        self.assertEqual(numpy.dtype('datetime64[us]'), created.dtype)
+        self.assertEqual([False, True, True], created.mask.tolist())
+        self.assertEqual(numpy.datetime64('2016-05-07T22:34:10'), created[0])
+        self.assertEqual([u'ham', u'spam', None], names.tolist())
+
+        # Values converted while reading, like the binary protocol does
+        collector = columnar.NumPyColumnCollector(self.description[:3])
+        collector.add_rows([
+            (1, Decimal('1.5'), datetime.datetime(2016, 5, 7)),
+            (2, None, None),
+        ])
+        (ids, prices, created) = collector.columns()
+        self.assertEqual([1, 2], ids.tolist())
+        self.assertEqual([False, True], prices.mask.tolist())
+        self.assertEqual([False, True], created.mask.tolist())
+
+        collector = columnar.NumPyColumnCollector(self.description)
+        self.assertEqual([0] * 4, [len(arr) for arr in collector.columns()])
+
+    @unittest.skipIf(numpy, "NumPy is available")
+    def test_numpy_missing(self):
+        """Collecting NumPy arrays requires NumPy"""
+        self.assertRaises(errors.InterfaceError,
+                          columnar.NumPyColumnCollector, self.description)
@@ -31,13 +31,17 @@ import unittest
 from decimal import Decimal
 import io
 import socket
+import struct
+import sys
+import traceback
 
 import tests
 from . import PY2
 
 from mysql.connector.conversion import (MySQLConverterBase, MySQLConverter)
 from mysql.connector import (connection, network, errors,
-                             constants, cursor, abstracts, catch23)
+                             constants, cursor, abstracts, catch23,
+                             protocol)
 from mysql.connector.optionfiles import read_option_files
 
 LOGGER = logging.getLogger(tests.LOGGER_NAME)
@@ -1581,6 +1585,67 @@ class MySQLConnectionTests(tests.MySQLConnectorTests):
         self.assertRaises(errors.ProgrammingError, self.cnx.cmd_stmt_execute,
                           *params)
 
+    def test_cmd_stmt_execute_many(self):
+        """Execute a prepared statement pipelining the executions"""
+        self.cnx.cmd_query("DROP TABLE IF EXISTS myconnpy_pipeline")
+        self.cnx.cmd_query("CREATE TABLE myconnpy_pipeline "
+                           "(id INT PRIMARY KEY, c1 VARCHAR(20))")
+        stmt_info = self.cnx.cmd_stmt_prepare(
+            b"INSERT INTO myconnpy_pipeline VALUES (?, ?)")
+        bound_types = []
+        results = self.cnx.cmd_stmt_execute_many(
+            stmt_info['statement_id'],
+            [(1, 'ham'), (2, 'spam'), (1, 'duplicate'), (3, None)],
+            stmt_info['parameters'], bound_types=bound_types)
+
+        self.assertEqual(4, len(results))
+        self.assertEqual([1, 1], [res['affected_rows']
+                                  for res in results[0:2]])
+        self.assertTrue(isinstance(results[2], errors.IntegrityError))
+        self.assertEqual(1, results[3]['affected_rows'])
+
+        self.cnx.cmd_query("SELECT id, c1 FROM myconnpy_pipeline ORDER BY id")
+        rows = self.cnx.get_rows()[0]
+        self.assertEqual(3, len(rows))
+        self.cnx.cmd_stmt_close(stmt_info['statement_id'])
+        self.cnx.cmd_query("DROP TABLE IF EXISTS myconnpy_pipeline")
+
+    def test_get_prepared_statement(self):
+        """Get prepared statements cached by the connection"""
+        config = tests.get_mysql_config()
+        config['prepared_cache_size'] = 1
+        cnx = connection.MySQLConnection(**config)
+
+        stmt = b"SELECT ? as c1"
+        prepared = cnx.get_prepared_statement(stmt)
+        # In use, so preparing the statement again
+        prepared2 = cnx.get_prepared_statement(stmt + b" ")
+        self.assertNotEqual(prepared['statement_id'],
+                            prepared2['statement_id'])
+
+        cnx.release_prepared_statement(prepared)
+        cnx.release_prepared_statement(prepared2)  # already cached, closed
+        self.assertEqual(1, len(cnx._prepared_statements))
+        self.assertRaises(errors.ProgrammingError, cnx.cmd_stmt_execute,
+                          prepared2['statement_id'], ('ham',),
+                          prepared2['parameters'])
+        self.assertTrue(prepared is cnx.get_prepared_statement(stmt))
+        cnx.release_prepared_statement(prepared)
+
+        # Least recently used statement is closed
+        other = cnx.get_prepared_statement(b"SELECT ? as c2")
+        cnx.release_prepared_statement(other)
+        self.assertRaises(errors.ProgrammingError, cnx.cmd_stmt_execute,
+                          prepared['statement_id'], ('ham',),
+                          prepared['parameters'])
+
+        # Reconnecting empties the cache
+        cnx.reconnect()
+        self.assertEqual(0, len(cnx._prepared_statements))
+        cnx.release_prepared_statement(other)
+        self.assertEqual(0, len(cnx._prepared_statements))
+        cnx.close()
+
     def test_cmd_reset_connection(self):
         """Resets session without re-authenticating"""
         if tests.MYSQL_VERSION < (5, 7, 3):
@@ -1687,3 +1752,260 @@ class WL7937(tests.MySQLConnectorTests):
         sql = "LOAD DATA LOCAL INFILE %s INTO TABLE local_data"
         self.assertRaises(errors.ProgrammingError, self.cur.execute, sql,
                           (self.data_file, ))
+
+
+class PreparedStatementCacheTests(tests.MySQLConnectorTests):
+
+    def test_get_release(self):
+        """Take prepared statements from the cache and put them back"""
+        cache = connection.PreparedStatementCache(2)
+        stmts = [{'statement_id': i} for i in range(4)]
+
+        self.assertEqual(None, cache.get(b'SELECT 1'))
+        cache.add(b'SELECT 1', stmts[0])
+        cache.add(b'SELECT 1', stmts[1])
+        self.assertEqual([], cache.release(stmts[0]))
+        self.assertEqual([stmts[1]], cache.release(stmts[1]))
+        self.assertEqual(1, len(cache))
+
+        self.assertTrue(cache.get(b'SELECT 1') is stmts[0])
+        self.assertEqual(0, len(cache))
+        self.assertEqual(None, cache.get(b'SELECT 1'))
+        self.assertEqual([], cache.release(stmts[0]))
+
+        # Least recently used statements are evicted
+        cache.add(b'SELECT 2', stmts[2])
+        cache.add(b'SELECT 3', stmts[3])
+        self.assertEqual([], cache.release(stmts[2]))
+        self.assertEqual([stmts[0]], cache.release(stmts[3]))
+        self.assertEqual(None, cache.get(b'SELECT 1'))
+
+        # Statements not taken from this cache are ignored
+        self.assertEqual([], cache.release(stmts[0]))
+        self.assertEqual(2, len(cache))
+
+    def test_disabled(self):
+        """Statements are not cached when the size is 0"""
+        cache = connection.PreparedStatementCache()
+        stmt = {'statement_id': 1}
+        cache.add(b'SELECT 1', stmt)
+        self.assertEqual([stmt], cache.release(stmt))
+        self.assertEqual(None, cache.get(b'SELECT 1'))
+
+
+class CompressionNegotiationTests(tests.MySQLConnectorTests):
+
+    """Tests for choosing the compression algorithm"""
+
+    def _negotiate(self, capabilities, **config):
+        cnx = connection.MySQLConnection()
+        cnx.config(**config)
+        cnx._negotiate_compression(capabilities)
+        return cnx
+
+    def test_negotiate_compression(self):
+        """Negotiate the compression algorithm with the server"""
+        zlib_flag = constants.ClientFlag.COMPRESS
+        zstd_flag = constants.ClientFlag.ZSTD_COMPRESSION_ALGORITHM
+
+        cnx = self._negotiate(zlib_flag | zstd_flag, compress=True)
+        self.assertEqual('zlib', cnx._compression_algorithm)
+        self.assertTrue(cnx.isset_client_flag(zlib_flag))
+
+        cnx = self._negotiate(zlib_flag | zstd_flag,
+                              compression_algorithms='zstd,zlib')
+        if network.HAVE_ZSTD:
+            self.assertEqual('zstd', cnx._compression_algorithm)
+            self.assertTrue(cnx.isset_client_flag(zstd_flag))
+            self.assertFalse(cnx.isset_client_flag(zlib_flag))
+        else:
+            self.assertEqual('zlib', cnx._compression_algorithm)
+
+        # Server without zstd support
+        cnx = self._negotiate(zlib_flag, compression_algorithms=['zstd'])
+        self.assertEqual('zlib', cnx._compression_algorithm)
+        self.assertTrue(cnx.isset_client_flag(zlib_flag))
+        self.assertFalse(cnx.isset_client_flag(zstd_flag))
+
+        cnx = self._negotiate(0, compression_algorithms='zlib,uncompressed')
+        self.assertEqual('uncompressed', cnx._compression_algorithm)
+        self.assertFalse(cnx.isset_client_flag(zlib_flag))
+
+    def test_config(self):
+        """Compression options are checked"""
+        cnx = connection.MySQLConnection()
+        self.assertRaises(errors.InterfaceError, cnx.config,
+                          compression_algorithms='lz4')
+        self.assertRaises(errors.InterfaceError, cnx.config,
+                          zstd_compression_level=23)
+        self.assertRaises(errors.InterfaceError, cnx.config,
+                          compress_level=10)
+        cnx.config(compression_algorithms='uncompressed')
+        self.assertFalse(cnx._compress)
+        cnx.config(compression_algorithms=' ZSTD, zlib',
+                   zstd_compression_level=1)
+        self.assertEqual(['zstd', 'zlib'], cnx._compression_algorithms)
+        self.assertTrue(cnx._compress)
+
+
+class LocalInfileTests(tests.MySQLConnectorTests):
+
+    """Tests for LOAD DATA LOCAL INFILE requests"""
+
+    def setUp(self):
+        self.cnx = connection.MySQLConnection()
+        self.cnx._socket = network.MySQLTCPSocket()
+        self.cnx._socket.sock = tests.DummySocket()
+        self.cnx._protocol = protocol.MySQLProtocol()
+        self.cnx._max_allowed_packet = 64
+        self.ok_packet = bytearray(
+            b'\x07\x00\x00\x03\x00\x01\x00\x00\x00\x00\x00')
+
+    def _request(self, filename):
+        payload = b'\xfb' + filename.encode('utf8')
+        self.cnx._socket.sock.reset()
+        self.cnx._socket.sock.add_packets([
+            bytearray(struct.pack('<I', len(payload))[0:3] + b'\x01' + payload),
+            self.ok_packet])
+
+    def test__handle_load_data_infile(self):
+        """Send a registered stream of rows in packets"""
+        self._request('rows')
+        self.cnx._local_infile_streams['rows'] = (
+            row for row in [b'1\tham\n', b'2\t' + b'x' * 60 + b'\n'])
+        self.cnx._handle_result(self.cnx._socket.recv())
+        exp = [
+            bytearray(b'\x30\x00\x00\x021\tham\n2\t' + b'x' * 40),
+            bytearray(b'\x15\x00\x00\x03' + b'x' * 20 + b'\n'),
+            bytearray(b'\x00\x00\x00\x04'),
+        ]
+        self.assertEqual(exp, self.cnx._socket.sock._client_sends)
+
+    def test__handle_load_data_infile_error(self):
+        """Raise errors of a stream once the MySQL server replied"""
+        def rows():
+            """Rows failing after the first one"""
+            yield b'1\tham\n'
+            raise ValueError("spam")
+
+        self._request('rows')
+        self.cnx._local_infile_streams['rows'] = rows()
+        try:
+            self.cnx._handle_result(self.cnx._socket.recv())
+        except ValueError:
+            frames = traceback.extract_tb(sys.exc_info()[2])
+            self.assertEqual('rows', frames[-1][2])
+        else:
+            self.fail("ValueError not raised")
+        self.assertEqual([bytearray(b'\x00\x00\x00\x02')],
+                         self.cnx._socket.sock._client_sends)
+        self.assertFalse(self.cnx._socket.sock._server_replies)
+
+    def test_allow_local_infile_in_path(self):
+        """Refuse files outside the allowed paths"""
+        self.cnx.config(allow_local_infile_in_path=os.path.dirname(__file__))
+        self.assertTrue(self.cnx.isset_client_flag(
+            constants.ClientFlag.LOCAL_FILES))
+
+        self._request('/etc/passwd')
+        self.assertRaises(errors.InterfaceError, self.cnx._handle_result,
+                          self.cnx._socket.recv())
+        self.assertEqual([bytearray(b'\x00\x00\x00\x02')],
+                         self.cnx._socket.sock._client_sends)
+        self.assertFalse(self.cnx._socket.sock._server_replies)
+
+        filename = os.path.join(os.path.dirname(__file__), 'data',
+                                '..', '__init__.py')
+        self._request(filename)
+        self.cnx.set_local_infile_handler(
+            lambda filename: [b'ham', b'spam'])
+        self.cnx._handle_result(self.cnx._socket.recv())
+        exp = [
+            bytearray(b'\x07\x00\x00\x02hamspam'),
+            bytearray(b'\x00\x00\x00\x03'),
+        ]
+        self.assertEqual(exp, self.cnx._socket.sock._client_sends)
+
+
+class SessionStateTests(tests.MySQLConnectorTests):
+
+    """Tests for session state changes tracked by the MySQL server"""
+
+    def test__handle_session_state(self):
+        """Update the values kept by the connection"""
+        cnx = connection.MySQLConnection()
+        cnx._protocol = protocol.MySQLProtocol()
+        state = (b'\x00\x0e\x09time_zone\x03+01'
+                 b'\x00\x0f\x0aautocommit\x03OFF'
+                 b'\x00\x0e\x08sql_mode\x04ANSI'
+                 b'\x01\x05\x04test')
+        okpkt = bytearray(b'\x00\x00\x00\x01\x00\x00\x00\x02\x40\x00\x00'
+                          b'\x00') + bytearray([len(state)]) + state
+        cnx._autocommit = True
+        cnx._handle_ok(okpkt)
+        self.assertEqual('test', cnx._database)
+        self.assertEqual('+01', cnx._time_zone)
+        self.assertEqual('ANSI', cnx._sql_mode)
+        self.assertFalse(cnx._autocommit)
+
+    def test_session_cache(self):
+        """Cache the values of session variables"""
+        cnx = connection.MySQLConnection()
+        cnx._protocol = protocol.MySQLProtocol()
+        cnx._socket = network.MySQLTCPSocket()
+        cnx._socket.sock = tests.DummySocket()
+        ok_packet = bytearray(b'\x07\x00\x00\x01\x00\x00\x00\x02\x00\x00\x00')
+        queries = []
+
+        def info_query(query):
+            queries.append(query)
+            return ('SYSTEM',)
+        cnx.info_query = info_query
+
+        self.assertEqual('SYSTEM', cnx.time_zone)
+        self.assertEqual('SYSTEM', cnx.time_zone)
+        self.assertEqual(1, len(queries))
+
+        # Without session state tracking, any query could change it
+        cnx._socket.sock.add_packet(ok_packet)
+        cnx.cmd_query("SET @@session.time_zone = '+02:00'")
+        self.assertEqual('SYSTEM', cnx.time_zone)
+        self.assertEqual(2, len(queries))
+
+        cnx._socket.sock.add_packet(ok_packet)
+        cnx.time_zone = '+01:00'
+        self.assertEqual('+01:00', cnx.time_zone)
+        self.assertEqual(2, len(queries))
+
+        # With session state tracking, changes are reported
+        cnx._handshake = {'capabilities': constants.ClientFlag.SESSION_TRACK}
+        cnx._server_version = (5, 7, 10)
+        cnx._socket.sock.add_packets([ok_packet] * 4)
+        cnx._post_connection()
+        self.assertTrue(b"session_track_system_variables = 'time_zone,"
+                        b"autocommit," in cnx._socket.sock._client_sends[-1])
+        self.assertEqual('SYSTEM', cnx.sql_mode)
+        state = b'\x00\x0e\x09time_zone\x03+03'
+        payload = (b'\x00\x00\x00\x02\x40\x00\x00\x00' +
+                   struct.pack('<B', len(state)) + state)
+        cnx._socket.sock.add_packet(bytearray(
+            struct.pack('<I', len(payload))[0:3] + b'\x01' + payload))
+        cnx.cmd_query("SET @@session.time_zone = '+03'")
+        self.assertEqual('+03', cnx.time_zone)
+        self.assertEqual(3, len(queries))
+        self.assertEqual('SYSTEM', cnx.sql_mode)
+        self.assertEqual(4, len(queries))
+
+        cnx._socket.sock.add_packet(ok_packet)
+        cnx.cmd_query("DO 1")
+        self.assertEqual('+03', cnx.time_zone)
+        self.assertEqual(4, len(queries))
+
+        # Tracking is set up again after resetting the session
+        cnx._socket.sock.add_packets([ok_packet] * 5)
+        cnx.cmd_reset_connection()
+        self.assertTrue(b"session_track_schema = ON"
+                        in cnx._socket.sock._client_sends[-1])
+        self.assertEqual('SYSTEM', cnx.time_zone)
+        self.assertEqual(5, len(queries))
+        self.assertFalse(cnx._socket.sock._server_replies)
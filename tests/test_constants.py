@@ -302,6 +302,7 @@ class ClientFlagTests(tests.MySQLConnectorTests):
             constants.ClientFlag.MULTI_STATEMENTS,
             constants.ClientFlag.MULTI_RESULTS,
             constants.ClientFlag.LOCAL_FILES,
+            constants.ClientFlag.SESSION_TRACK,
         ]
         exp = 0
         for option in data:
@@ -483,3 +484,27 @@ class ShutdownTypeTests(tests.MySQLConnectorTests):
             exp = value[1]
             res = constants.ShutdownType.get_desc(key)
             self.assertEqual(exp, res)
+
+
+class CursorTypeTests(tests.MySQLConnectorTests):
+
+    """Test cursor types of COM_STMT_EXECUTE"""
+    desc = {
+        'CURSOR_TYPE_NO_CURSOR': (0, 'No cursor is opened'),
+        'CURSOR_TYPE_READ_ONLY': (1, 'Read-only cursor'),
+        'CURSOR_TYPE_FOR_UPDATE': (2, 'Cursor for update'),
+        'CURSOR_TYPE_SCROLLABLE': (4, 'Scrollable cursor'),
+    }
+
+    def test_attributes(self):
+        """Check attributes for CursorType"""
+        for key, value in self.desc.items():
+            name = key.replace('CURSOR_TYPE_', '')
+            self.assertEqual(
+                value[0], getattr(constants.CursorType, name),
+                '{0} attribute of CursorType has wrong value'.format(name))
+
+    def test_get_desc(self):
+        """Get cursor type description by name"""
+        for key, value in self.desc.items():
+            self.assertEqual(value[1], constants.CursorType.get_desc(key))
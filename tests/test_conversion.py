@@ -335,6 +335,56 @@ class MySQLConverterTests(tests.MySQLConnectorTests):
         res = self.cnv.row_to_python(data, description)
         self.assertEqual(res, self._to_python_exp)
 
+    def test_row_decoder(self):
+        """Convert rows using a decoder built for the result set"""
+        data = [v[0] for v in self._to_python_data]
+        description = [v[1] for v in self._to_python_data]
+
+        decode = self.cnv.row_decoder(description)
+        self.assertEqual(self._to_python_exp, decode(data))
+        self.assertEqual((None,) * len(data), decode([None] * len(data)))
+
+        # Result sets with only integers, decimals or strings
+        cases = [
+            ([('c1', constants.FieldType.LONG, None, None, None, None, 1, 0),
+              ('c2', constants.FieldType.TINY, None, None, None, None, 1, 0)],
+             [bytearray(b'-12'), None], (-12, None)),
+            ([('c1', constants.FieldType.NEWDECIMAL,
+               None, None, None, None, 1, 0)],
+             [bytearray(b'3.14')], (Decimal('3.14'),)),
+            ([('c1', constants.FieldType.VAR_STRING,
+               None, None, None, None, 1, 0),
+              ('c2', constants.FieldType.STRING,
+               None, None, None, None, 1, 0)],
+             [bytearray(b'ham'), bytearray(b'\xc3\xa4')],
+             (u'ham', b'\xc3\xa4'.decode('utf8'))),
+            ([('c1', constants.FieldType.STRING,
+               None, None, None, None, 1, constants.FieldFlag.BINARY)],
+             [bytearray(b'ham')], (bytearray(b'ham'),)),
+        ]
+        for fields, row, exp in cases:
+            self.assertEqual(exp, self.cnv.row_decoder(fields)(row))
+            self.assertEqual(exp, self.cnv.row_to_python(row, fields))
+
+        # Subclasses overriding row_to_python() keep working
+        class Converter(conversion.MySQLConverter):
+            def row_to_python(self, row, fields):
+                return tuple(reversed(row))
+
+        decode = Converter().row_decoder(cases[0][0])
+        self.assertEqual((None, bytearray(b'-12')), decode(cases[0][1]))
+
+    def test_column_decoder(self):
+        """Convert columns using a decoder built for each column"""
+        for value, field in self._to_python_data:
+            decode = self.cnv.column_decoder(field)
+            self.assertEqual([self.cnv.to_python(field, value), None],
+                             decode([value, None]))
+
+        field = ('c1', constants.FieldType.LONG, None, None, None, None, 1, 0)
+        self.assertEqual([-12, None, 3], self.cnv.column_decoder(field)(
+            [bytearray(b'-12'), None, bytearray(b'3')]))
+
     def test__FLOAT_to_python(self):
         """Convert a MySQL FLOAT/DOUBLE to a Python float type"""
         data = b'3.14'
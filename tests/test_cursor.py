@@ -88,6 +88,72 @@ class CursorModule(tests.MySQLConnectorTests):
         for exp, stmt in cases:
             self.assertEqual(exp, re.search(regex, stmt).group(1))
 
+    def test__first_keyword(self):
+        cases = [
+            ('CALL', "call p1(%s)"),
+            ('CALL', b"/* c */ -- c\n CALL p1()"),
+            ('INSERT', "\n# c\nINSERT INTO t1 VALUES (%s)"),
+            (None, "(SELECT 1)"),
+            (None, " "),
+        ]
+
+        for exp, stmt in cases:
+            self.assertEqual(exp, cursor._first_keyword(stmt))
+
+    def test__split_batch_insert(self):
+        cases = [
+            (("INSERT INTO t1 VALUES ", "(%s, %s)", ""),
+             "INSERT INTO t1 VALUES (%s, %s)"),
+            (("REPLACE LOW_PRIORITY INTO db.t1 VALUES ", "(%s), (%s)", ""),
+             "REPLACE LOW_PRIORITY INTO db.t1 VALUES (%s), (%s)"),
+            (("INSERT IGNORE INTO `values` (`a)`, b) VALUE ",
+              "(%(a)s, ')(')", " ;"),
+             "INSERT IGNORE INTO `values` (`a)`, b) VALUE (%(a)s, ')(') ;"),
+            (("/*c*/INSERT/*c*/INTO/*c*/t1(c1,c2)VALUES/*c*/",
+              "(%s,%s/*c*/)", "/*c()*/ON DUPLICATE KEY UPDATE c1=VALUES(c1)"),
+             "/*c*/INSERT/*c*/INTO/*c*/t1(c1,c2)VALUES/*c*/(%s,%s/*c*/)"
+             "/*c()*/ON DUPLICATE KEY UPDATE c1=VALUES(c1)"),
+            (("# c\nINSERT INTO t1 PARTITION (p1) (c1) VALUES ",
+              "(%s, 'it''s -- (')", " -- c"),
+             "# c\nINSERT INTO t1 PARTITION (p1) (c1) VALUES "
+             "(%s, 'it''s -- (') -- c"),
+            (("INSERT INTO t1 VALUES ", "(%s)",
+              " AS new ON DUPLICATE KEY UPDATE c1 = new.c1"),
+             "INSERT INTO t1 VALUES (%s) "
+             "AS new ON DUPLICATE KEY UPDATE c1 = new.c1"),
+            (None, "INSERT INTO t1 VALUES (%s) "
+                   "ON DUPLICATE KEY UPDATE c1 = c1 + %s"),
+            (None, "INSERT INTO t1 SELECT c1 FROM t2 "
+                   "ON DUPLICATE KEY UPDATE c1 = VALUES(c1)"),
+            (None, "INSERT INTO t1 SET c1 = %s"),
+            (None, "INSERT INTO t1 1 %s"),
+            (None, "INSERT INTO t1 VALUES (%s"),
+            (None, "INSERT INTO t1 VALUES (%s); SELECT 1"),
+            (None, "SELECT %s"),
+        ]
+
+        for exp, stmt in cases:
+            self.assertEqual(exp, cursor._split_batch_insert(stmt))
+
+    def test__batch_insert_chunks(self):
+        rows = [b'(1)', b'(22)', b'(333)', b'(4)']
+        exp = [b'INSERT INTO t1 VALUES (1),(22);',
+               b'INSERT INTO t1 VALUES (333);',
+               b'INSERT INTO t1 VALUES (4);']
+        res = list(cursor._batch_insert_chunks(
+            b'INSERT INTO t1 VALUES ', iter(rows), b';', 32))
+        self.assertEqual(exp, res)
+
+        # A row larger than the limit is sent on its own
+        res = list(cursor._batch_insert_chunks(b'V ', rows, b'', 4))
+        self.assertEqual([b'V ' + row for row in rows], res)
+
+        res = list(cursor._batch_insert_chunks(b'V ', rows, b'', 1024))
+        self.assertEqual([b'V ' + b','.join(rows)], res)
+
+        self.assertEqual(
+            [], list(cursor._batch_insert_chunks(b'V ', [], b'', 1024)))
+
 
 class CursorBaseTests(tests.MySQLConnectorTests):
 
@@ -683,6 +749,23 @@ class MySQLCursorTests(tests.TestsCursor):
         self.cur.execute(stmt_select)
         self.assertEqual([(4, '/*100*/'), (5, '/*100*/')],
                          self.cur.fetchall(), "Multi insert test failed")
+
+        stmt = "REPLACE INTO {0} (col1,col2) VALUES (%s,%s)".format(tbl)
+        self.cur.executemany(stmt, [(4, 'a'), (7, 'b')])
+        self.assertEqual(3, self.cur.rowcount)
+        self.assertEqual("REPLACE INTO {0} (col1,col2) VALUES "
+                         "(4,'a'),(7,'b')".format(tbl), self.cur.statement)
+
+        self.cur.execute("TRUNCATE TABLE {0}".format(tbl))
+        self.cnx._max_batch_size = 64
+        data = ((i, str(i * 100)) for i in range(1, 21))
+        self.cur.executemany(stmt_insert, data)
+        self.assertEqual(20, self.cur.rowcount)
+        self.cur.execute("SELECT COUNT(*) FROM {0}".format(tbl))
+        self.assertEqual([(20,)], self.cur.fetchall())
+        self.cnx._max_batch_size = 0
+        self.assertTrue(self.cnx.max_batch_size > 64)
+
         self._test_execute_cleanup(self.cnx, tbl)
         self.cur.close()
 
@@ -898,6 +981,49 @@ class MySQLCursorTests(tests.TestsCursor):
         self._test_execute_cleanup(self.cnx, tbl)
         self.cur.close()
 
+    def test_fetch_columns(self):
+        """MySQLCursor object fetch_columns()-method"""
+        self.check_method(self.cur, 'fetch_columns')
+
+        self.assertRaises(errors.InterfaceError, self.cur.fetch_columns)
+
+        self.cnx = connection.MySQLConnection(**tests.get_mysql_config())
+        tbl = 'myconnpy_fetch'
+        self._test_execute_setup(self.cnx, tbl)
+        stmt_insert = (
+            "INSERT INTO {table} (col1,col2) "
+            "VALUES (%s,%s)".format(table=tbl))
+        stmt_select = (
+            "SELECT col1,col2 FROM {table} "
+            "ORDER BY col1 ASC".format(table=tbl))
+
+        self.cur = self.cnx.cursor()
+        self.cur.execute(stmt_select)
+        self.assertEqual([[], []], self.cur.fetch_columns())
+
+        data = [(i, str(i * 100)) for i in range(0, 10)]
+        self.cur.executemany(stmt_insert, data)
+        self.cur.execute(stmt_select)
+        self.assertEqual(data[0], self.cur.fetchone())
+        self.assertEqual([[i for i, _ in data[1:]], [v for _, v in data[1:]]],
+                         self.cur.fetch_columns())
+        self.assertEqual(10, self.cur.rowcount)
+        self.assertEqual(None, self.cur.fetchone())
+
+        try:
+            import numpy  # pylint: disable=W0612
+        except ImportError:
+            pass
+        else:
+            self.cur.execute(stmt_select)
+            (col1, col2) = self.cur.fetchall_numpy()
+            self.assertEqual('int64', str(col1.dtype))
+            self.assertEqual([i for i, _ in data], col1.tolist())
+            self.assertEqual([v for _, v in data], col2.tolist())
+
+        self._test_execute_cleanup(self.cnx, tbl)
+        self.cur.close()
+
     def test_raise_on_warning(self):
         self.cnx = connection.MySQLConnection(**tests.get_mysql_config())
         self.cnx.raise_on_warnings = True
@@ -954,6 +1080,41 @@ class MySQLCursorTests(tests.TestsCursor):
         self.cur._description = ('ham', 'spam')
         self.assertTrue(self.cur.with_rows)
 
+    def test_load_data(self):
+        """MySQLCursor object load_data()-method"""
+        config = tests.get_mysql_config()
+        config['allow_local_infile'] = True
+        self.cnx = connection.MySQLConnection(**config)
+        self.cur = self.cnx.cursor()
+        self.check_method(self.cur, 'load_data')
+        self.cur.execute("DROP TABLE IF EXISTS test_load_data")
+        self.cur.execute(
+            "CREATE TABLE test_load_data (id INT, c1 VARCHAR(20), "
+            "c2 DATE, PRIMARY KEY (id))")
+
+        rows = [(1, 'ham\tspam', datetime.date(2016, 1, 2)),
+                (2, "it's \\ \"quoted\"", None)]
+        for fmt in ('tsv', 'csv'):
+            self.cur.execute("TRUNCATE TABLE test_load_data")
+            self.assertEqual(2, self.cur.load_data(
+                'test_load_data', iter(rows), format=fmt))
+            self.cur.execute("SELECT * FROM test_load_data ORDER BY id")
+            self.assertEqual(rows, self.cur.fetchall())
+
+        self.cur.execute("TRUNCATE TABLE test_load_data")
+        self.assertEqual(1, self.cur.load_data(
+            'test_load_data', [(3, 'ham')], columns=('id', 'c1')))
+        self.assertEqual({}, self.cnx._local_infile_streams)
+
+        self.assertRaises(errors.ProgrammingError, self.cur.load_data,
+                          'test_load_data', [(4, object())])
+        self.assertRaises(errors.ProgrammingError, self.cur.load_data,
+                          'test_load_data', [], format='xml')
+        self.cur.execute("SELECT COUNT(*) FROM test_load_data")
+        self.assertEqual([(1,)], self.cur.fetchall())
+
+        self.cur.execute("DROP TABLE IF EXISTS test_load_data")
+
     def test_unicode(self):
         self.cnx = connection.MySQLConnection(**tests.get_mysql_config())
         self.cur = self.cnx.cursor()
@@ -1199,6 +1360,32 @@ class MySQLCursorPreparedTests(tests.TestsCursor):
         self.assertEqual(3, cur._prepared['statement_id'])
         self.assertEqual(exp, cur.fetchone())
 
+    def test_execute_reset(self):
+        """Reset prepared statements only when needed"""
+        cur = self.cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
+        info = self.cnx.cursor()
+
+        def stmt_resets():
+            """Returns the number of COM_STMT_RESET commands"""
+            info.execute("SHOW SESSION STATUS LIKE 'Com_stmt_reset'")
+            return int(info.fetchone()[1])
+
+        stmt = "SELECT (? * 2) AS c1"
+        resets = stmt_resets()
+        for i in range(3):
+            cur.execute(stmt, (i,))
+            self.assertEqual([(i * 2,)], cur.fetchall())
+        self.assertEqual(resets, stmt_resets())
+
+        # Failed execution might leave long data behind
+        cur._prepared['reset_needed'] = True
+        cur.execute(stmt, (5,))
+        self.assertEqual([(10,)], cur.fetchall())
+        self.assertEqual(resets + 1, stmt_resets())
+        self.assertFalse(cur._prepared['reset_needed'])
+        cur.close()
+        info.close()
+
     def test_executemany(self):
         cur = self.cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
 
@@ -1243,6 +1430,31 @@ class MySQLCursorPreparedTests(tests.TestsCursor):
         self._test_execute_cleanup(self.cnx, tbl)
         cur.close()
 
+    def test_executemany_pipelined(self):
+        """Pipeline executions of executemany()"""
+        tbl = 'myconnpy_pipeline'
+        self._test_execute_setup(self.cnx, tbl)
+        cur = self.cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
+        cur.pipeline_size = 3
+        stmt = "INSERT INTO {0} (col1, col2) VALUES (%s, %s)".format(tbl)
+
+        data = [(i, str(i)) for i in range(10)]
+        cur.executemany(stmt, data)
+        self.assertEqual(10, cur.rowcount)
+
+        data = [(i, str(i)) for i in range(10, 15)] + [(0, 'duplicate')]
+        try:
+            cur.executemany(stmt, data)
+        except errors.IntegrityError as err:
+            self.assertTrue('(parameters at index 5)' in str(err))
+        else:
+            self.fail("Duplicate entry not raised")
+
+        cur.execute("SELECT COUNT(*) FROM {0}".format(tbl))
+        self.assertEqual([(15,)], cur.fetchall())
+        cur.close()
+        self._test_execute_cleanup(self.cnx, tbl)
+
     def test_fetchone(self):
         cur = self.cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
 
@@ -1299,6 +1511,59 @@ class MySQLCursorPreparedTests(tests.TestsCursor):
         self.assertRaises(errors.InterfaceError, cur.fetchall)
 
 
+class MySQLCursorPreparedServerSideTests(tests.TestsCursor):
+
+    def setUp(self):
+        self.cnx = connection.MySQLConnection(**tests.get_mysql_config())
+        self.tbl = 'myconnpy_server_side'
+        self._test_execute_setup(self.cnx, self.tbl)
+        cur = self.cnx.cursor()
+        cur.executemany(
+            "INSERT INTO {0} (col1, col2) VALUES (%s, %s)".format(self.tbl),
+            [(i, str(i)) for i in range(10)])
+        cur.close()
+
+    def tearDown(self):
+        self._test_execute_cleanup(self.cnx, self.tbl)
+        self.cnx.close()
+
+    def test_fetchmany(self):
+        cur = self.cnx.cursor(
+            cursor_class=cursor.MySQLCursorPreparedServerSide)
+        cur.execute("SELECT col1 FROM {0} ORDER BY col1".format(self.tbl))
+        self.assertTrue(cur._cursor_exists)
+        self.assertFalse(self.cnx.unread_result)
+
+        self.assertEqual([(0,), (1,), (2,)], cur.fetchmany(3))
+        self.assertEqual((3,), cur.fetchone())
+
+        # Other statements can be executed while the cursor is open
+        cur2 = self.cnx.cursor()
+        cur2.execute("SELECT COUNT(*) FROM {0}".format(self.tbl))
+        self.assertEqual([(10,)], cur2.fetchall())
+
+        self.assertEqual([(i,) for i in range(4, 10)], cur.fetchall())
+        self.assertFalse(cur._cursor_exists)
+        self.assertEqual(10, cur.rowcount)
+        self.assertEqual([], cur.fetchmany(3))
+        self.assertEqual(None, cur.fetchone())
+
+        # Executing again closes the open cursor
+        cur.execute("SELECT col1 FROM {0} ORDER BY col1".format(self.tbl))
+        self.assertEqual([(0,)], cur.fetchmany(1))
+        cur.execute("SELECT col1 FROM {0} ORDER BY col1".format(self.tbl))
+        self.assertEqual([(0,), (1,)], cur.fetchmany(2))
+        cur.close()
+
+    def test_execute_without_result(self):
+        cur = self.cnx.cursor(
+            cursor_class=cursor.MySQLCursorPreparedServerSide)
+        cur.execute("UPDATE {0} SET col2 = %s".format(self.tbl), ('ham',))
+        self.assertFalse(cur._cursor_exists)
+        self.assertEqual(10, cur.rowcount)
+        cur.close()
+
+
 class MySQLCursorDictTests(tests.TestsCursor):
 
     def setUp(self):
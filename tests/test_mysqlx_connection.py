@@ -36,6 +36,9 @@ if mysqlx.compat.PY3:
 else:
     from urllib import quote_plus
 
+if sys.version_info >= (3, 6):
+    import asyncio
+
 LOGGER = logging.getLogger(tests.LOGGER_NAME)
 
 _URI_TEST_RESULTS = (  # (uri, result)
@@ -637,3 +640,87 @@ class MySQLxNodeSessionTests(tests.MySQLxTests):
         settings["port"] = res[0][1]  # Lets use the MySQL classic port
         self.assertRaises(mysqlx.errors.ProgrammingError,
                           mysqlx.get_node_session, settings)
+
+
+@unittest.skipIf(tests.MYSQL_VERSION < (5, 7, 12), "XPlugin not compatible")
+@unittest.skipIf(sys.version_info < (3, 6), "asyncio requires Python 3.6")
+class MySQLxAsyncNodeSessionTests(tests.MySQLxTests):
+
+    def setUp(self):
+        self.connect_kwargs = tests.get_mysqlx_config()
+        self.schema_name = self.connect_kwargs["schema"]
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.session = self.run_coro(
+                mysqlx.get_session_async(self.connect_kwargs))
+        except mysqlx.Error as err:
+            self.fail("{0}".format(err))
+
+    def tearDown(self):
+        self.run_coro(self.session.close())
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def run_coro(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_sql(self):
+        result = self.run_coro(
+            self.session.sql("SELECT 1 UNION SELECT 2").execute())
+        self.assertTrue(isinstance(result, mysqlx.aio.SqlResult))
+        self.assertEqual(1, self.run_coro(result.fetch_one())[0])
+        self.assertEqual(2, self.run_coro(result.__anext__())[0])
+        self.assertRaises(StopAsyncIteration, self.run_coro,
+                          result.__anext__())
+
+        # Unread rows are read before the next statement
+        result = self.run_coro(
+            self.session.sql("SELECT 1 UNION SELECT 2").execute())
+        self.run_coro(self.session.sql("DO 1").execute())
+        self.assertEqual(2, result.count)
+
+    def test_find(self):
+        self.run_coro(self.session.create_schema(self.schema_name))
+        schema = self.session.get_schema(self.schema_name)
+        self.run_coro(self.session.sql(
+            "CREATE TABLE {0}.docs (doc JSON, _id VARCHAR(32) GENERATED "
+            "ALWAYS AS (JSON_UNQUOTE(JSON_EXTRACT(doc, '$._id'))) STORED "
+            "PRIMARY KEY)".format(self.schema_name)).execute())
+        collection = schema.get_collection("docs")
+        self.run_coro(collection.add({"_id": "1", "age": 21},
+                                     {"_id": "2", "age": 12}).execute())
+
+        result = self.run_coro(collection.find("age > 18").execute())
+        docs = self.run_coro(result.fetch_all())
+        self.assertEqual(["1"], [doc["_id"] for doc in docs])
+
+        table = schema.get_table("docs")
+        result = self.run_coro(table.select("_id").sort("_id").execute())
+        self.assertEqual(["1", "2"], [row["_id"] for row in
+                                      self.run_coro(result.fetch_all())])
+
+        # Helpers reading results without awaiting them are not supported
+        for method in (schema.exists_in_database, schema.get_collections,
+                       collection.count, table.is_view,
+                       schema.create_view("v1").defined_as("DO 1").execute):
+            self.assertRaises(mysqlx.errors.NotSupportedError, method)
+        self.assertRaises(mysqlx.errors.NotSupportedError,
+                          schema.get_collection, "docs", True)
+        self.assertRaises(mysqlx.errors.NotSupportedError,
+                          schema.create_table, "t1")
+
+        self.run_coro(self.session.sql("DROP TABLE {0}.docs".format(
+            self.schema_name)).execute())
+
+    def test_concurrent_sessions(self):
+        sessions = self.run_coro(asyncio.gather(*[
+            mysqlx.get_session_async(self.connect_kwargs) for _ in range(3)]))
+        results = self.run_coro(asyncio.gather(*[
+            session.sql("SELECT CONNECTION_ID()").execute()
+            for session in sessions]))
+        rows = self.run_coro(asyncio.gather(*[
+            result.fetch_all() for result in results]))
+        self.assertEqual(3, len(set([row[0][0] for row in rows])))
+        self.run_coro(asyncio.gather(*[
+            session.close() for session in sessions]))
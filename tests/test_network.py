@@ -26,9 +26,12 @@
 
 import os
 import socket
+import struct
+import threading
 import logging
 from collections import deque
 import unittest
+import zlib
 
 import tests
 from mysql.connector import (network, errors, constants)
@@ -140,6 +143,43 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
             self.assertEqual(exp, self.cnx.sock._client_sends)
             self.cnx.sock.reset()
 
+    @unittest.skipIf(not hasattr(socket.socket, 'sendmsg'),
+                     "sendmsg() is not available")
+    def test_send_vectored(self):
+        """Send packets using sendmsg()"""
+        client, server = socket.socketpair()
+        received = []
+
+        def receive():
+            data = bytearray(b'')
+            chunk = server.recv(65536)
+            while chunk:
+                data += chunk
+                chunk = server.recv(65536)
+            received.append(data)
+
+        reader = threading.Thread(target=receive)
+        reader.start()
+        self.cnx.sock = client
+        self.cnx._vectored_send = True
+        try:
+            data = b'\x03' + b'a' * (constants.MAX_PACKET_LENGTH + 1000)
+            self.cnx.send_plain(data, 0)
+            self.cnx.send_plain(b'\x0e', 0)
+            self.cnx.set_compression(min_size=1000)
+            self.cnx.send_compressed(b'\x0e', 0, 0)
+        finally:
+            client.shutdown(socket.SHUT_WR)
+            reader.join()
+            client.close()
+            server.close()
+        self.cnx.sock = None
+
+        exp = network._prepare_packets(data, 0)
+        exp.append(b'\x01\x00\x00\x00\x0e')
+        exp.append(b'\x05\x00\x00\x00\x00\x00\x00\x01\x00\x00\x00\x0e')
+        self.assertEqual(b''.join(exp), received[0])
+
     def test_send_compressed(self):
         """Send compressed data through the socket"""
         data = b'asddfasdfasdf'
@@ -187,6 +227,55 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
         self.assertEqual(exp, received)
         self.cnx.sock.reset()
 
+    def test_send_compressed_options(self):
+        """Send compressed data using compression options"""
+        self.cnx.sock = tests.DummySocket()
+        data = b'\x03SELECT "' + b'a' * 100 + b'"'
+
+        self.cnx.set_compression(level=0, min_size=1000)
+        self.cnx.send_compressed(data, 0, 0)
+        self.assertEqual(b'\x00\x00\x00',
+                         self.cnx.sock._client_sends[0][4:7])
+        self.cnx.sock.reset()
+
+        for level in (0, 9):
+            self.cnx.set_compression(level=level, min_size=0)
+            self.cnx.send_compressed(data, 0, 0)
+            zbuf = zlib.compress(b'\x6e\x00\x00\x00' + data, level)
+            self.assertEqual(zbuf, self.cnx.sock._client_sends[0][7:])
+            self.cnx.sock.reset()
+
+        self.cnx.set_compression()
+        self.assertEqual(zlib.Z_DEFAULT_COMPRESSION, self.cnx._compress_level)
+        self.assertEqual(50, self.cnx._compress_min_size)
+
+        # Big packet is received back as it was sent
+        data = b'\x03' + b'a' * (constants.MAX_PACKET_LENGTH + 1000)
+        self.cnx.send_compressed(data, 0, 0)
+        self.assertEqual(1, self.cnx._compressed_packet_number)
+        self.cnx.sock.add_packets(self.cnx.sock._client_sends)
+        self.assertEqual(network._prepare_packets(data, 0),
+                         [self.cnx.recv_compressed(),
+                          self.cnx.recv_compressed()])
+
+    @unittest.skipIf(not network.HAVE_ZSTD, "zstandard is not available")
+    def test_compressed_zstd(self):
+        """Send and receive zstd compressed packets"""
+        self.cnx.sock = tests.DummySocket()
+        self.cnx.set_compression_algorithm('zstd', 5)
+
+        data = b'\x03SELECT "' + b'a' * 100 + b'"'
+        self.cnx.send_compressed(data, 0, 0)
+        zbuf = self.cnx._zstd_compressor.compress(b'\x6e\x00\x00\x00' + data)
+        self.assertEqual(zbuf, self.cnx.sock._client_sends[0][7:])
+
+        self.cnx.sock.add_packets(self.cnx.sock._client_sends)
+        self.assertEqual(b'\x6e\x00\x00\x00' + data,
+                         self.cnx.recv_compressed())
+
+        self.cnx.set_compression_algorithm('zlib')
+        self.assertEqual(None, self.cnx._zstd_compressor)
+
     def test_recv_plain(self):
         """Receive data from the socket"""
         self.cnx.sock = tests.DummySocket()
@@ -224,6 +313,47 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
             packet = self.cnx.recv_plain()
         self.assertEqual(exp, result)
 
+    def test_recv_buffered(self):
+        """Receive data from the socket using the read-ahead buffer"""
+        self.cnx.sock = tests.DummySocket()
+        self.cnx.set_recv_buffer_size(32)
+        self.assertEqual(self.cnx.recv_buffered, self.cnx.recv)
+
+        def get_address():
+            return 'dummy'
+        self.cnx.get_address = get_address
+
+        # Receive a packet which is not 4 bytes long
+        self.cnx.sock.add_packet(b'\01\01\01')
+        self.assertRaises(errors.InterfaceError, self.cnx.recv_buffered)
+
+        # Socket fails to receive and produces an error
+        self.cnx.set_recv_buffer_size(32)
+        self.cnx.sock.raise_socket_error()
+        self.assertRaises(errors.OperationalError, self.cnx.recv_buffered)
+
+        # Receive packets after a query, SELECT "Ham"; the second packet is
+        # bigger than the buffer and is read directly from the socket
+        exp = [
+            b'\x01\x00\x00\x01\x01',
+            b'\x19\x00\x00\x02\x03\x64\x65\x66\x00\x00\x00\x03\x48\x61\x6d\x00'
+            b'\x0c\x21\x00\x09\x00\x00\x00\xfd\x01\x00\x1f\x00\x00',
+            b'\x05\x00\x00\x03\xfe\x00\x00\x02\x00',
+            b'\x04\x00\x00\x04\x03\x48\x61\x6d',
+            b'\x05\x00\x00\x05\xfe\x00\x00\x02\x00',
+        ]
+        self.cnx.sock.reset()
+        self.cnx.sock.add_packets(exp)
+        result = [self.cnx.recv_buffered() for _ in range(len(exp))]
+        self.assertEqual(exp, result)
+        self.assertEqual(5, self.cnx._packet_number)
+        self.assertEqual(self.cnx._recv_start, self.cnx._recv_end)
+
+        # Disable the read-ahead buffer
+        self.cnx.set_recv_buffer_size(0)
+        self.assertEqual(None, self.cnx._recv_buffer)
+        self.assertEqual(self.cnx.recv_plain, self.cnx.recv)
+
     def test_recv_compressed(self):
         """Receive compressed data from the socket"""
         self.cnx.sock = tests.DummySocket()
@@ -244,12 +374,62 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
         self.cnx.sock.raise_socket_error()
         self.assertRaises(errors.OperationalError, self.cnx.recv_compressed)
 
+    def test_recv_compressed_stream(self):
+        """Receive MySQL packets spanning compressed packets"""
+        self.cnx.sock = tests.DummySocket()
+        packets = [b'\x03\x00\x00\x01abc', b'\x01\x00\x00\x02d',
+                   b'\x10\x00\x00\x03' + b'e' * 16, b'\x00\x00\x00\x04']
+        payload = b''.join(packets)
+
+        def zipped(pktnr, data, compress=True):
+            zdata = zlib.compress(data) if compress else data
+            return (struct.pack('<I', len(zdata))[0:3] +
+                    struct.pack('<B', pktnr) +
+                    struct.pack('<I', len(data) if compress else 0)[0:3] +
+                    zdata)
+
+        # First MySQL packet complete, third split over two compressed
+        self.cnx.sock.add_packets([
+            zipped(0, payload[0:20]),
+            zipped(1, payload[20:26], False),
+            zipped(2, payload[26:])
+        ])
+        for i, exp in enumerate(packets):
+            self.assertEqual(bytearray(exp), self.cnx.recv_compressed())
+            self.assertEqual(i + 1, self.cnx._packet_number)
+        self.assertEqual(2, self.cnx._compressed_packet_number)
+        self.assertEqual(bytearray(b''), self.cnx._uncompressed)
+
+        # Corrupted compressed data
+        self.cnx.sock.add_packet(b'\x02\x00\x00\x03\x05\x00\x00ab')
+        self.assertRaises(errors.InterfaceError, self.cnx.recv_compressed)
+
     def test_set_connection_timeout(self):
         """Set the connection timeout"""
         exp = 5
         self.cnx.set_connection_timeout(exp)
         self.assertEqual(exp, self.cnx._connection_timeout)
 
+    def test_is_alive(self):
+        """Check the socket of an idle connection"""
+        self.assertFalse(self.cnx.is_alive())
+
+        self.cnx.sock, peer = socket.socketpair()
+        self.cnx.sock.settimeout(5)
+        self.assertTrue(self.cnx.is_alive())
+        self.assertEqual(5, self.cnx.sock.gettimeout())
+
+        # Unexpected data, for example an error sent before disconnecting
+        peer.sendall(b'\x01\x00\x00\x00\xff')
+        self.assertFalse(self.cnx.is_alive())
+        self.assertEqual(b'\x01\x00\x00\x00\xff', self.cnx.sock.recv(5))
+        self.assertTrue(self.cnx.is_alive())
+
+        peer.close()
+        self.assertFalse(self.cnx.is_alive())
+        self.cnx.close_connection()
+        self.assertFalse(self.cnx.is_alive())
+
 
 @unittest.skipIf(os.name == 'nt', "Skip UNIX Socket tests on Windows")
 class MySQLUnixSocketTests(tests.MySQLConnectorTests):
@@ -24,6 +24,9 @@
 """Unittests for mysql.connector.pooling
 """
 
+import socket
+import threading
+import time
 import uuid
 try:
     from Queue import Queue
@@ -36,6 +39,7 @@ import mysql.connector
 from mysql.connector import errors
 from mysql.connector.connection import MySQLConnection
 from mysql.connector import pooling
+from mysql.connector.constants import FieldType
 
 
 class PoolingTests(tests.MySQLConnectorTests):
@@ -306,6 +310,289 @@ class MySQLConnectionPoolTests(tests.MySQLConnectorTests):
         self.assertEqual(1, pcnx.autocommit)
         pcnx.close()
 
+    def test_get_connection_timeout(self):
+        self.assertRaises(AttributeError, pooling.MySQLConnectionPool,
+                          pool_name='test', pool_timeout=-1)
+        self.assertRaises(AttributeError, pooling.MySQLConnectionPool,
+                          pool_name='test', pool_timeout='ham')
+
+        server = tests.FakeMySQLServer()
+        cnxpool = pooling.MySQLConnectionPool(
+            pool_size=1, pool_name='test', pool_reset_session=False,
+            pool_timeout=0.05, host='127.0.0.1', port=server.port,
+            user='ham')
+        self.assertEqual(0.05, cnxpool.pool_timeout)
+
+        pcnx = cnxpool.get_connection()
+        self.assertRaises(errors.PoolError, cnxpool.get_connection,
+                          timeout=0)
+        start = time.time()
+        self.assertRaises(errors.PoolError, cnxpool.get_connection)
+        self.assertTrue(time.time() - start >= 0.05)
+        self.assertEqual(0, len(cnxpool._cnx_waiters))
+
+        # Waiting threads get the connection in the order they asked
+        order = []
+
+        def get_connection(number):
+            cnx = cnxpool.get_connection(timeout=10)
+            order.append(number)
+            cnx.close()
+
+        threads = []
+        for number in range(3):
+            thread = threading.Thread(target=get_connection, args=(number,))
+            thread.start()
+            threads.append(thread)
+            while len(cnxpool._cnx_waiters) <= number:
+                time.sleep(0.01)
+
+        pcnx.close()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([0, 1, 2], order)
+        self.assertEqual(1, cnxpool._remove_connections())
+        server.close()
+
+    def test_lock(self):
+        server = tests.FakeMySQLServer()
+        config = {'host': '127.0.0.1', 'port': server.port, 'user': 'ham'}
+        cnxpool1 = pooling.MySQLConnectionPool(
+            pool_size=1, pool_name='test1', pool_reset_session=False,
+            **config)
+        cnxpool2 = pooling.MySQLConnectionPool(
+            pool_size=1, pool_name='test2', pool_reset_session=False,
+            **config)
+        self.assertFalse(cnxpool1._lock is cnxpool2._lock)
+
+        # Reconnecting is done without holding the lock of the pool
+        lock_free = []
+
+        def try_lock():
+            if cnxpool1._lock.acquire(False):
+                lock_free.append(True)
+                cnxpool1._lock.release()
+
+        def reconnect(*args, **kwargs):
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+
+        cnx = cnxpool1._cnx_queue.get(block=False)
+        cnx.disconnect()
+        cnx.reconnect = reconnect
+        cnxpool1.add_connection(cnx)
+
+        # The other pool is not blocked meanwhile
+        with cnxpool2._lock:
+            thread = threading.Thread(target=cnxpool1.get_connection)
+            thread.start()
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual([True], lock_free)
+
+        cnxpool2._remove_connections()
+        server.close()
+
+    def test_elastic_pool(self):
+        self.assertRaises(AttributeError, pooling.MySQLConnectionPool,
+                          pool_name='test', pool_size=2, pool_min_size=3)
+        self.assertRaises(AttributeError, pooling.MySQLConnectionPool,
+                          pool_name='test', pool_min_size=-1)
+        self.assertRaises(AttributeError, pooling.MySQLConnectionPool,
+                          pool_name='test', pool_idle_timeout='ham')
+        self.assertRaises(AttributeError, pooling.MySQLConnectionPool,
+                          pool_name='test', pool_max_lifetime=-1)
+
+        server = tests.FakeMySQLServer()
+        cnxpool = pooling.MySQLConnectionPool(
+            pool_min_size=1, pool_max_size=3, pool_name='test',
+            pool_reset_session=False, pool_idle_timeout=60,
+            host='127.0.0.1', port=server.port, user='ham')
+        self.assertEqual(3, cnxpool.pool_size)
+        self.assertEqual(1, cnxpool.pool_min_size)
+        self.assertEqual(1, server.connections)
+
+        # Connections are opened when needed, up to the maximum size
+        pcnxs = [cnxpool.get_connection() for _ in range(3)]
+        self.assertEqual(3, server.connections)
+        self.assertRaises(errors.PoolError, cnxpool.get_connection)
+        cnx = pcnxs[-1]._cnx
+        for pcnx in pcnxs:
+            pcnx.close()
+        self.assertEqual(3, cnxpool._cnx_queue.qsize())
+
+        # The most recently used connection is handed out first
+        pcnx = cnxpool.get_connection()
+        self.assertTrue(pcnx._cnx is cnx)
+        pcnx.close()
+
+        # Idle connections are closed, keeping the minimum size
+        for cnx in cnxpool._cnx_queue.queue:
+            cnx._pool_last_used -= 120
+        cnxpool._maintain_connections()
+        self.assertEqual(1, cnxpool._cnx_queue.qsize())
+        self.assertEqual(1, cnxpool._cnx_count)
+        server.close()
+
+    def test_max_lifetime(self):
+        server = tests.FakeMySQLServer()
+        cnxpool = pooling.MySQLConnectionPool(
+            pool_size=2, pool_name='test', pool_reset_session=False,
+            pool_max_lifetime=60, host='127.0.0.1', port=server.port,
+            user='ham')
+        self.assertEqual(2, server.connections)
+
+        # Old idle connections are reconnected in the background
+        cnx = cnxpool._cnx_queue.queue[0]
+        cnx._pool_connected -= 120
+        connection_id = cnx.connection_id
+        cnxpool._maintain_connections()
+        self.assertEqual(3, server.connections)
+        self.assertEqual(2, cnxpool._cnx_queue.qsize())
+        self.assertTrue(time.time() - cnx._pool_connected < 60)
+
+        # Old connections are reconnected when handed out
+        pcnx = cnxpool.get_connection()
+        pcnx._cnx._pool_connected -= 120
+        pcnx.close()
+        pcnx = cnxpool.get_connection()
+        self.assertEqual(4, server.connections)
+        pcnx.close()
+
+        # A background thread closes idle connections
+        cnxpool = pooling.MySQLConnectionPool(
+            pool_size=2, pool_min_size=0, pool_name='test',
+            pool_reset_session=False, pool_idle_timeout=0.05,
+            host='127.0.0.1', port=server.port, user='ham')
+        cnxpool.get_connection().close()
+        deadline = time.time() + 5
+        while cnxpool._cnx_count and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(0, cnxpool._cnx_count)
+        server.close()
+
+    def test_validation(self):
+        self.assertRaises(AttributeError, pooling.MySQLConnectionPool,
+                          pool_name='test', pool_validation='ham')
+        self.assertRaises(AttributeError, pooling.MySQLConnectionPool,
+                          pool_name='test', pool_validation_interval=-1)
+
+        ping = b'\x0e'
+        server = tests.FakeMySQLServer()
+        config = dict(pool_size=2, pool_name='test', pool_reset_session=False,
+                      host='127.0.0.1', port=server.port, user='ham')
+
+        # Connections are pinged by default
+        cnxpool = pooling.MySQLConnectionPool(**config)
+        cnxpool.get_connection().close()
+        self.assertEqual(1, server.commands.count(ping))
+
+        # Recently used connections are not pinged
+        cnxpool = pooling.MySQLConnectionPool(pool_validation_interval=60,
+                                              **config)
+        cnxpool.get_connection().close()
+        self.assertEqual(1, server.commands.count(ping))
+        cnxpool._cnx_queue.queue[-1]._pool_last_used -= 120
+        cnxpool.get_connection().close()
+        self.assertEqual(2, server.commands.count(ping))
+
+        cnxpool = pooling.MySQLConnectionPool(pool_validation='none',
+                                              **config)
+        cnxpool.get_connection().close()
+        self.assertEqual(2, server.commands.count(ping))
+
+        # Probing finds dead connections without pinging
+        cnxpool = pooling.MySQLConnectionPool(pool_validation='probe',
+                                              **config)
+        connections = server.connections
+        cnxpool.get_connection().close()
+        dead = cnxpool._cnx_queue.queue[-1]
+        dead._socket.sock.shutdown(socket.SHUT_RD)
+        pcnx = cnxpool.get_connection()
+        self.assertFalse(pcnx._cnx is dead)
+        self.assertEqual(2, server.commands.count(ping))
+
+        # The dead connection is reconnected in the background
+        deadline = time.time() + 5
+        while cnxpool._cnx_queue.empty() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(cnxpool._cnx_queue.queue[-1] is dead)
+        self.assertEqual(connections + 1, server.connections)
+        self.assertTrue(dead._socket.is_alive())
+        pcnx.close()
+        self.assertEqual(2, cnxpool._cnx_count)
+        server.close()
+
+    def test_lazy_reset_session(self):
+        reset = b'\x1f'
+        server = tests.FakeMySQLServer()
+        cnxpool = pooling.MySQLConnectionPool(
+            pool_size=1, pool_name='test', pool_reset_session='lazy',
+            host='127.0.0.1', port=server.port, user='ham')
+        self.assertEqual('lazy', cnxpool.reset_session)
+
+        # New connections are reset the first time they are added back
+        cnxpool.get_connection().close()
+        self.assertEqual(1, server.commands.count(reset))
+
+        pcnx = cnxpool.get_connection()
+        pcnx.ping()
+        pcnx.close()
+        self.assertEqual(1, server.commands.count(reset))
+
+        pcnx = cnxpool.get_connection()
+        pcnx.cmd_query("SET @ham = 1")
+        pcnx.close()
+        self.assertEqual(2, server.commands.count(reset))
+        server.close()
+
+        # With session state tracking, the server reports changes
+        server = tests.FakeMySQLServer()
+        server.handshake = server.handshake.replace(
+            b'\x08\x02\x00\x00\x00', b'\x08\x02\x00\x80\x00', 1)
+        cnxpool = pooling.MySQLConnectionPool(
+            pool_size=1, pool_name='test', pool_reset_session='lazy',
+            host='127.0.0.1', port=server.port, user='ham')
+        cnxpool.get_connection().close()
+        self.assertEqual(1, server.commands.count(reset))
+        self.assertEqual("SET SESSION session_track_state_change = ON",
+                         server.queries[-1])
+
+        pcnx = cnxpool.get_connection()
+        pcnx.cmd_query("SELECT 1")
+        pcnx.close()
+        self.assertEqual(1, server.commands.count(reset))
+
+        server.ok = b'\x00\x00\x00\x02\x40\x00\x00'
+        pcnx = cnxpool.get_connection()
+        pcnx.cmd_query("SET @ham = 1")
+        server.ok = tests.FakeMySQLServer.ok
+        pcnx.close()
+        self.assertEqual(2, server.commands.count(reset))
+
+        # Unread results, which could still change the session, are not
+        # skipped when resetting lazily
+        server.replies["SELECT @spam := 1"] = tests.FakeMySQLServer.result(
+            [('@spam := 1', FieldType.LONGLONG)], [(b'1',)])
+        pcnx = cnxpool.get_connection()
+        pcnx.cmd_query("SELECT @spam := 1")
+        self.assertRaises(errors.InternalError, pcnx.close)
+        pcnx._cnx.get_rows()
+        pcnx.close()
+        self.assertEqual(2, server.commands.count(reset))
+
+        # Variables are set using a single statement
+        pcnx = cnxpool.get_connection()
+        pcnx.reset_session(user_variables={'ham': 1},
+                           session_variables={'sql_mode': ''})
+        self.assertEqual("SET @`ham` = 1, SESSION `sql_mode` = '', "
+                         "SESSION session_track_state_change = ON",
+                         server.queries[-1])
+        pcnx.close()
+        self.assertEqual(3, server.commands.count(reset))
+        server.close()
+
     def test__remove_connections(self):
         dbconfig = tests.get_mysql_config()
         cnxpool = pooling.MySQLConnectionPool(
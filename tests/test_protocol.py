@@ -67,26 +67,26 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         """Make a MySQL authentication packet"""
         exp = {
             'allset': bytearray(
-                b'\x8d\xa2\x03\x00\x00\x00\x00\x40'
+                b'\x8d\xa2\x83\x00\x00\x00\x00\x40'
                 b'\x21\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
                 b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
                 b'\x68\x61\x6d\x00\x14\x3a\x07\x66\xba\xba\x01\xce'
                 b'\xbe\x55\xe6\x29\x88\xaa\xae\xdb\x00\xb3\x4d\x91'
                 b'\x5b\x74\x65\x73\x74\x00'),
             'nopass': bytearray(
-                b'\x8d\xa2\x03\x00\x00\x00\x00\x40'
+                b'\x8d\xa2\x83\x00\x00\x00\x00\x40'
                 b'\x21\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
                 b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
                 b'\x68\x61\x6d\x00\x00\x74\x65\x73\x74\x00'),
             'nouser': bytearray(
-                b'\x8d\xa2\x03\x00\x00\x00\x00\x40'
+                b'\x8d\xa2\x83\x00\x00\x00\x00\x40'
                 b'\x21\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
                 b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
                 b'\x00\x14\x3a\x07\x66\xba\xba\x01\xce'
                 b'\xbe\x55\xe6\x29\x88\xaa\xae\xdb\x00\xb3\x4d\x91'
                 b'\x5b\x74\x65\x73\x74\x00'),
             'nodb': bytearray(
-                b'\x8d\xa2\x03\x00\x00\x00\x00\x40'
+                b'\x8d\xa2\x83\x00\x00\x00\x00\x40'
                 b'\x21\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
                 b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
                 b'\x68\x61\x6d\x00\x14\x3a\x07\x66\xba\xba\x01\xce'
@@ -131,6 +131,12 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         res = self._protocol.make_auth(**kwargs)
         self.assertEqual(exp['nouser'], res)
 
+        # zstd compression level follows the authentication data
+        kwargs['client_flags'] = flags | ClientFlag.ZSTD_COMPRESSION_ALGORITHM
+        kwargs['zstd_level'] = 7
+        res = self._protocol.make_auth(**kwargs)
+        self.assertEqual(exp['nouser'][4:] + b'\x07', res[4:])
+
     def test_make_auth_ssl(self):
         """Make a SSL authentication packet"""
         cases = [
@@ -247,6 +253,41 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         res = self._protocol.parse_ok(okpkt)
         self.assertEqual(exp, res)
 
+    def test_parse_ok_session_state(self):
+        """Parse OK-packet with session state changes"""
+        state = (
+            b'\x00\x0e\x09time_zone\x03+01'
+            b'\x00\x0e\x0aautocommit\x02ON'
+            b'\x01\x05\x04test'
+            b'\x02\x02\x011'
+            b'\x03\x05\x00\x03a:1'
+            b'\x05\x09\x08T_______'
+            b'\x07\x01\x00'
+        )
+        okpkt = bytearray(b'\x00\x00\x00\x01\x00\x00\x00\x02\x40\x00\x00'
+                          b'\x00') + bytearray([len(state)]) + state
+        exp = {
+            'field_count': 0,
+            'affected_rows': 0,
+            'insert_id': 0,
+            'status_flag': 0x4002,
+            'warning_count': 0,
+            'info_msg': '',
+            'session_state': {
+                'system_variables': {'time_zone': '+01', 'autocommit': 'ON'},
+                'schema': 'test',
+                'state_change': True,
+                'gtids': 'a:1',
+                'transaction_state': 'T_______',
+            },
+        }
+        self.assertEqual(exp, self._protocol.parse_ok(okpkt))
+
+        # Without the session state changed flag, nothing is parsed
+        okpkt[7] = 0x02
+        okpkt[8] = 0x00
+        self.assertFalse('session_state' in self._protocol.parse_ok(okpkt))
+
     def test_parse_column_count(self):
         """Parse the number of columns"""
         packet = bytearray(b'\x01\x00\x00\x01\x03')
@@ -376,6 +417,7 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
             (datetime.timedelta(10, 58530, 230000),
              bytearray(b'\x0c\x00\x0a\x00\x00\x00'
                        b'\x10\x0f\x1e\x70\x82\x03\x00')),
+            (datetime.timedelta(0), bytearray(b'\x00')),
         ]
         for exp, data in cases:
             res = self._protocol._parse_binary_time(data + b'\x00\x00', None)
@@ -418,6 +460,11 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         res = self._protocol._parse_binary_values(fields, packet)
         self.assertEqual(exp, res)
 
+        # Values can be read from a packet still having its header
+        header = bytearray(b'\x2f\x00\x00\x01\x00')
+        res = self._protocol._parse_binary_values(fields, header + packet, 5)
+        self.assertEqual(exp, res)
+
     def test_read_binary_result(self):
         """Read MySQL binary protocol result"""
 
@@ -494,6 +541,13 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         self.assertRaises(ValueError,
                           self._protocol._prepare_binary_time, 'spam')
 
+    def test_make_stmt_fetch(self):
+        """Make a MySQL packet with the STMT_FETCH command"""
+        exp = bytearray(b'\x01\x00\x00\x00\x0a\x00\x00\x00')
+        self.assertEqual(exp, self._protocol.make_stmt_fetch(1, 10))
+        exp = bytearray(b'\x02\x00\x00\x00\x01\x00\x00\x00')
+        self.assertEqual(exp, self._protocol.make_stmt_fetch(2))
+
     def test_make_stmt_execute(self):
         """Make a MySQL packet with the STMT_EXECUTE command"""
         statement_id = 1
@@ -518,7 +572,7 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
              bytearray(b'\x01\x00\x00\x00\x00\x01\x00\x00\x00\x00'
                        b'\x01\x00\x00\x04\x33\x2e\x31\x34')),
             (255,
-             bytearray(b'\x01\x00\x00\x00\x80\x01\x00'
+             bytearray(b'\x01\x00\x00\x00\x00\x01\x00'
                        b'\x00\x00\x00\x01\x01\x80\xff')),
             (-128,
              bytearray(b'\x01\x00\x00\x00\x00\x01\x00'
@@ -538,6 +592,30 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
             self.assertEqual(
                 exp, res, "Failed preparing statement with '{0}'".format(data))
 
+        # Types are only sent when they changed
+        bound_types = []
+        exp = bytearray(b'\x01\x00\x00\x00\x00\x01\x00\x00\x00\x00'
+                        b'\x01\x0f\x00\x03\x68\x61\x6d')
+        self.assertEqual(exp, self._protocol.make_stmt_execute(
+            statement_id, ('ham',), (1,), bound_types=bound_types))
+        self.assertEqual([b'\x0f\x00'], bound_types)
+        exp = bytearray(b'\x01\x00\x00\x00\x00\x01\x00\x00\x00\x00'
+                        b'\x00\x04\x73\x70\x61\x6d')
+        self.assertEqual(exp, self._protocol.make_stmt_execute(
+            statement_id, ('spam',), (1,), bound_types=bound_types))
+        exp = bytearray(b'\x01\x00\x00\x00\x00\x01\x00\x00\x00\x00'
+                        b'\x01\x01\x80\xff')
+        self.assertEqual(exp, self._protocol.make_stmt_execute(
+            statement_id, (255,), (1,), bound_types=bound_types))
+        self.assertEqual([b'\x01\x80'], bound_types)
+
+        # Flags are not changed by the flags of parameters
+        exp = bytearray(b'\x01\x00\x00\x00\x01\x01\x00'
+                        b'\x00\x00\x00\x01\x01\x80\xff')
+        res = self._protocol.make_stmt_execute(statement_id, (255,), (1,),
+                                               flags=1)
+        self.assertEqual(exp, res)
+
         # Testing null bitmap
         data = (None, None)
         exp = bytearray(b'\x01\x00\x00\x00\x00\x01\x00\x00\x00\x03\x01\x06'
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Unittests for mysql.connector.routing
+"""
+
+import logging
+import socket
+
+import tests
+import mysql.connector
+from mysql.connector import cursor, errors, routing
+from mysql.connector.constants import FieldType
+
+
+def _slave_status(lag):
+    """Reply to SHOW SLAVE STATUS; no row when lag is None"""
+    rows = [] if lag is None else [(lag,)]
+    return tests.FakeMySQLServer.result(
+        [('Seconds_Behind_Master', FieldType.LONGLONG)], rows)
+
+
+class RoutingTests(tests.MySQLConnectorTests):
+
+    def test_is_replica_statement(self):
+        """Check which statements can be sent to replicas"""
+        for statement in ("SELECT 1", b"  select * FROM t",
+                          "/* ham */ (SELECT 1) UNION (SELECT 2)"):
+            self.assertTrue(routing.is_replica_statement(statement),
+                            statement)
+        for statement in ("INSERT INTO t VALUES (1)", "SHOW WARNINGS",
+                          "SELECT * FROM t FOR UPDATE",
+                          "SELECT * FROM t LOCK IN SHARE MODE",
+                          "SELECT 1 INTO @ham", "SELECT @ham",
+                          "SELECT LAST_INSERT_ID()", "CALL ham()"):
+            self.assertFalse(routing.is_replica_statement(statement),
+                             statement)
+
+
+class MySQLConnectionRouterTests(tests.MySQLConnectorTests):
+
+    def setUp(self):
+        self.primary = tests.FakeMySQLServer()
+        self.replicas = [
+            tests.FakeMySQLServer({"SHOW SLAVE STATUS": _slave_status(b'0')}),
+            tests.FakeMySQLServer({"SHOW SLAVE STATUS": _slave_status(b'0')}),
+        ]
+        self.config = {
+            'host': '127.0.0.1', 'port': self.primary.port, 'user': 'ham',
+            'pool_size': 2, 'pool_min_size': 0, 'pool_reset_session': False,
+            'replicas': [{'port': self.replicas[0].port},
+                         {'port': self.replicas[1].port, 'weight': 2}],
+        }
+
+    def tearDown(self):
+        self.primary.close()
+        for server in self.replicas:
+            server.close()
+
+    def test___init__(self):
+        self.config['replicas'].append({'port': 3306, 'ssl_ca': 'ham'})
+        self.assertRaises(ValueError, routing.MySQLConnectionRouter,
+                          **self.config)
+        for weight in ('ham', 0, -1):
+            self.config['replicas'][-1] = {'port': 3306, 'weight': weight}
+            self.assertRaises(ValueError, routing.MySQLConnectionRouter,
+                              **self.config)
+
+        del self.config['replicas'][-1]
+        router = routing.MySQLConnectionRouter(pool_name='routing_test',
+                                               **self.config)
+        self.assertEqual('routing_test:primary', router.primary.pool_name)
+        self.assertEqual(['routing_test:replica0', 'routing_test:replica1'],
+                         [pool.pool_name for pool in router.replicas])
+        self.assertEqual(0, self.primary.connections)
+
+    def test_unreachable_replica(self):
+        """Create a router while a replica is down"""
+        # Bound but not listening, so connecting is refused
+        down = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        down.bind(('127.0.0.1', 0))
+        self.addCleanup(down.close)
+        del self.config['pool_min_size']
+        self.config['replicas'].insert(
+            0, {'port': down.getsockname()[1], 'weight': 3})
+        router = routing.MySQLConnectionRouter(**self.config)
+        self.assertEqual(2, self.primary.connections)
+        self.assertEqual(0, self.replicas[1].connections)
+
+        cnx = router.get_connection()
+        cnx.cursor().execute("SELECT 1")
+        self.assertEqual(["SELECT 1"], [query for server in self.replicas
+                                        for query in server.queries
+                                        if query == "SELECT 1"])
+        cnx.close()
+
+    def test_connect(self):
+        """Split reads and writes using connect()"""
+        cnx = mysql.connector.connect(pool_name='routing_test', **self.config)
+        self.assertTrue(isinstance(cnx, routing.RoutedMySQLConnection))
+        self.assertTrue(mysql.connector._CONNECTION_ROUTERS['routing_test']
+                        is cnx._router)
+        self.assertRaises(errors.InterfaceError, mysql.connector.connect,
+                          failover=[], **self.config)
+
+        # The replica with the highest weight is used first
+        cur = cnx.cursor()
+        cur.execute("SELECT 1")
+        self.assertEqual("SELECT 1", self.replicas[1].queries[-1])
+        cur.execute("INSERT INTO t VALUES (1)")
+        self.assertEqual("INSERT INTO t VALUES (1)",
+                         self.primary.queries[-1])
+        cur.execute("SELECT 2")
+        self.assertEqual("SELECT 2", self.replicas[1].queries[-1])
+        cnx.close()
+        self.assertEqual(1, cnx._router.primary._cnx_queue.qsize())
+
+        cnx = mysql.connector.connect(pool_name='routing_test', **self.config)
+        cnx.cursor().execute("SELECT 3")
+        self.assertEqual("SELECT 3", self.replicas[0].queries[-1])
+        cnx.close()
+        del mysql.connector._CONNECTION_ROUTERS['routing_test']
+
+    def test_transactions(self):
+        """Send statements of transactions to a single server"""
+        router = routing.MySQLConnectionRouter(**self.config)
+        cnx = router.get_connection()
+        cur = cnx.cursor()
+
+        # Reads see the uncommitted changes of the primary
+        self.primary.ok = b'\x00\x00\x00\x03\x00\x00\x00'
+        cur.execute("UPDATE t SET c = 1")
+        self.assertTrue(cnx.in_transaction)
+        cur.execute("SELECT c FROM t")
+        self.assertEqual("SELECT c FROM t", self.primary.queries[-1])
+        self.primary.ok = tests.FakeMySQLServer.ok
+        cnx.commit()
+        self.assertEqual("COMMIT", self.primary.queries[-1])
+        self.assertFalse(cnx.in_transaction)
+
+        cnx.start_transaction(readonly=True)
+        self.assertEqual(["SET TRANSACTION READ ONLY", "START TRANSACTION"],
+                         self.replicas[1].queries[-2:])
+        cur.execute("DO 1")
+        self.assertEqual("DO 1", self.replicas[1].queries[-1])
+        cnx.rollback()
+        self.assertEqual("ROLLBACK", self.replicas[1].queries[-1])
+
+        cnx.start_transaction()
+        cur.execute("SELECT 1")
+        self.assertEqual("SELECT 1", self.primary.queries[-1])
+        cnx.commit()
+
+        self.assertRaises(errors.NotSupportedError, cnx.cursor,
+                          prepared=True)
+        self.assertRaises(errors.NotSupportedError, getattr, cnx,
+                          'cmd_stmt_prepare')
+        cnx.close()
+
+    def test_cursor(self):
+        """Read rows of a cursor after others used another server"""
+        for server in self.replicas:
+            server.replies["SELECT c FROM t"] = tests.FakeMySQLServer.result(
+                [('c', FieldType.LONGLONG)], [(b'1',), (b'2',)])
+        router = routing.MySQLConnectionRouter(**self.config)
+        cnx = router.get_connection()
+        cur = cnx.cursor()
+        self.assertTrue(isinstance(cur, cursor.MySQLCursorBuffered))
+        cur.execute("SELECT c FROM t")
+        cnx.cursor().execute("INSERT INTO t VALUES (3)")
+        self.assertEqual([(1,), (2,)], cur.fetchall())
+
+        self.assertTrue(isinstance(cnx.cursor(dictionary=True),
+                                   cursor.MySQLCursorBufferedDict))
+        self.assertRaises(errors.NotSupportedError, cnx.cursor,
+                          buffered=False)
+        self.assertRaises(errors.NotSupportedError, cnx.cursor,
+                          cursor_class=cursor.MySQLCursor)
+        cnx.close()
+
+    def test_session(self):
+        """Change the session of the primary and of replicas"""
+        router = routing.MySQLConnectionRouter(**self.config)
+        cnx = router.get_connection()
+        cur = cnx.cursor()
+
+        # Changes are repeated on a replica taken later
+        cur.execute("USE ham")
+        cur.execute("SET @spam = 1")
+        cur.execute("SET GLOBAL max_connections = 10")
+        cnx.time_zone = '+01:00'
+        cur.execute("SELECT * FROM t")
+        self.assertEqual(["USE ham", "SET @@session.time_zone = '+01:00'",
+                          "SELECT * FROM t"],
+                         self.replicas[1].queries[-3:])
+        self.assertEqual(["SET @spam = 1", "SET GLOBAL max_connections = 10"],
+                         self.primary.queries[-3:-1])
+
+        # Changes are sent to the primary and the replica used
+        cur.execute("SET NAMES utf8mb4")
+        cnx.database = 'eggs'
+        cur.execute("SELECT 1")
+        for server in (self.primary, self.replicas[1]):
+            self.assertEqual(["SET NAMES utf8mb4", "USE eggs"],
+                             [query for query in server.queries
+                              if query in ("SET NAMES utf8mb4", "USE eggs")])
+        self.assertEqual("SELECT 1", self.replicas[1].queries[-1])
+        cnx.autocommit = True
+        for server in (self.primary, self.replicas[1]):
+            self.assertEqual("SET @@session.autocommit = ON",
+                             server.queries[-1])
+        cnx.close()
+
+        # Temporary tables only exist on the primary
+        cnx = router.get_connection()
+        cur = cnx.cursor()
+        cur.execute("CREATE TEMPORARY TABLE t (c INT)")
+        cur.execute("SELECT c FROM t")
+        self.assertEqual("SELECT c FROM t", self.primary.queries[-1])
+        cnx.close()
+
+        cnx = router.get_connection()
+        cnx.cursor().execute("SELECT 2")
+        self.assertEqual("SELECT 2", self.replicas[0].queries[-1])
+        self.assertFalse("USE ham" in self.replicas[0].queries)
+        cnx.close()
+
+    def test_replica_lag(self):
+        """Skip replicas lagging behind the primary"""
+        self.replicas[1].replies["SHOW SLAVE STATUS"] = _slave_status(b'60')
+        router = routing.MySQLConnectionRouter(max_replica_lag=10,
+                                               replica_lag_interval=60,
+                                               **self.config)
+        cnx = router.get_connection()
+        cnx.cursor().execute("SELECT 1")
+        self.assertEqual("SELECT 1", self.replicas[0].queries[-1])
+        self.assertEqual("SHOW SLAVE STATUS", self.replicas[1].queries[-1])
+        cnx.close()
+
+        # Lag is checked once every replica_lag_interval seconds
+        cnx = router.get_connection()
+        cnx.cursor().execute("SELECT 2")
+        self.assertEqual("SELECT 2", self.replicas[0].queries[-1])
+        self.assertEqual(1, self.replicas[1].queries.count(
+            "SHOW SLAVE STATUS"))
+        cnx.close()
+
+        # Reads go to the primary when no replica is available
+        self.replicas[0].replies["SHOW SLAVE STATUS"] = _slave_status(None)
+        router._lag_checks.clear()
+        cnx = router.get_connection()
+        cnx.cursor().execute("SELECT 3")
+        self.assertEqual("SELECT 3", self.primary.queries[-1])
+        cnx.close()
+
+    def test_replica_lag_error(self):
+        """Skip and log replicas failing to report their lag"""
+        self.replicas[1].replies["SHOW SLAVE STATUS"] = [
+            b'\xff\xf2\x04#42000Access denied; you need the SUPER privilege']
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger = logging.getLogger('myconnpy-routing')
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+
+        router = routing.MySQLConnectionRouter(max_replica_lag=10,
+                                               replica_lag_interval=60,
+                                               **self.config)
+        for query in ("SELECT 1", "SELECT 2"):
+            cnx = router.get_connection()
+            cnx.cursor().execute(query)
+            self.assertEqual(query, self.replicas[0].queries[-1])
+            cnx.close()
+
+        # The failing check is not repeated within replica_lag_interval
+        self.assertEqual(1, self.replicas[1].queries.count(
+            "SHOW SLAVE STATUS"))
+        self.assertEqual(1, len(records))
+        self.assertEqual(logging.WARNING, records[0].levelno)
+        self.assertTrue("SUPER privilege" in records[0].getMessage())
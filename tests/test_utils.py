@@ -263,3 +263,55 @@ class UtilsTests(tests.MySQLConnectorTests):
         exprest = bytearray(b'\xdd\xdd')
         self.assertEqual((exprest, exp), utils.read_lc_int(lcs),
                          "Failed getting length coded long long")
+
+    def test_read_int_at(self):
+        """Read an integer from a buffer at a given position."""
+        buf = bytearray(b'xx34581adbkdasdf')
+
+        self.assertEqual((3, 51), utils.read_int_at(buf, 2, 1))
+        self.assertEqual((4, 13363), utils.read_int_at(buf, 2, 2))
+        self.assertEqual((5, 3486771), utils.read_int_at(buf, 2, 3))
+        self.assertEqual((6, 943010867), utils.read_int_at(buf, 2, 4))
+        self.assertEqual((10, 7089898577412305971),
+                         utils.read_int_at(buf, 2, 8))
+
+    def test_read_lc_int_at(self):
+        """Read a length encoded integer from a buffer at a given position."""
+        prefix = bytearray(b'ham')
+        cases = [
+            (2 ** (8 - 1), utils.intstore(2 ** (8 - 1)), 4),
+            (None, utils.intstore(251) + utils.intstore(128), 4),
+            (2 ** (16 - 1), utils.intstore(252) + utils.intstore(2 ** 15), 6),
+            (2 ** (24 - 1), utils.intstore(253) + utils.intstore(2 ** 23), 7),
+            (12321848580485677055,
+             bytearray(b'\xfe\xff\xff\xff\xff\xff\xff\xff\xaa\xdd\xdd'), 12),
+        ]
+        for exp, lcs, exp_pos in cases:
+            self.assertEqual((exp_pos, exp),
+                             utils.read_lc_int_at(prefix + lcs, 3))
+
+        self.assertRaises(ValueError, utils.read_lc_int_at, prefix, 3)
+
+    def test_read_lc_string_at(self):
+        """Read a length coded string from a buffer at a given position."""
+        exp = bytearray(b"a" * 300)
+        buf = (bytearray(b'\x03ham') + bytearray(b'\xfc')
+               + utils.int2store(len(exp)) + exp + bytearray(b'\xfb'))
+
+        self.assertEqual((4, bytearray(b'ham')),
+                         utils.read_lc_string_at(buf, 0))
+        self.assertEqual((307, exp), utils.read_lc_string_at(buf, 4))
+        self.assertEqual((308, None), utils.read_lc_string_at(buf, 307))
+        self.assertEqual(307, utils.skip_lc_string_at(buf, 4))
+
+    def test_read_lc_string_list(self):
+        """Read all length coded strings from a buffer."""
+        long_str = bytearray(b"b" * 300)
+        buf = (bytearray(b'\x01\x00\x00\x01\x03ham\xfb')
+               + bytearray(b'\xfc') + utils.int2store(len(long_str))
+               + long_str)
+        exp = (bytearray(b'ham'), None, long_str)
+
+        self.assertEqual(exp, utils.read_lc_string_list(buf[4:]))
+        self.assertEqual(exp, utils.read_lc_string_list(buf, 4))
+        self.assertEqual(None, utils.read_lc_string_list(b'\xff\x00'))